@@ -1,95 +1,526 @@
-from flask import Flask, render_template, request, jsonify
-from transpiler import transpile_python_to_js
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from cache import cache_from_env, make_key
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from jobs import QueueFull, queue_from_env
+from live import SessionLimit, sessions_from_env
+from optimizer import resolve_passes
+from profiling import TranspileProfile
+from werkzeug.exceptions import HTTPException
+from transpiler import transpile_iter, transpile_python_to_js
+import atexit
+import gzip
+import hashlib
+import json
 import os
+import signal
+import threading
+import time
+
+try:
+    import brotli
+except ImportError:  # compressão brotli é opcional
+    brotli = None
 
 app = Flask(__name__)
+transpile_cache = cache_from_env()
+
+# Instrumentação dos visitantes (TRANSPILER_PROFILE=1), exposta em /metrics
+if os.environ.get('TRANSPILER_PROFILE') == '1':
+    transpile_cache.profiler = TranspileProfile()
+
+# Limites por requisição (configuráveis por variáveis de ambiente)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('TRANSPILER_MAX_BODY', 2 * 1024 * 1024))
+CPU_TIME_LIMIT = float(os.environ.get('TRANSPILER_CPU_LIMIT', 5))
+BATCH_MAX_ITEMS = int(os.environ.get('TRANSPILER_BATCH_MAX_ITEMS', 256))
+BATCH_TIMEOUT = float(os.environ.get('TRANSPILER_BATCH_TIMEOUT', 30))
+POOL_WORKERS = int(os.environ.get('TRANSPILER_POOL_WORKERS', os.cpu_count() or 1))
+
+# Cache HTTP e compressão das respostas
+HTTP_MAX_AGE = int(os.environ.get('TRANSPILER_HTTP_MAX_AGE', 3600))
+COMPRESS_MIN_BYTES = int(os.environ.get('TRANSPILER_COMPRESS_MIN', 1024))
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/html', 'text/plain')
+
+# Pool de processos do endpoint em lote, criado sob demanda em cada worker
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+def discard_pool(pool):
+    """Descarta um pool quebrado (worker morto); o próximo get_pool cria outro"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+class CPUTimeExceeded(Exception):
+    """Tempo de CPU da requisição excedeu TRANSPILER_CPU_LIMIT"""
+
+@contextmanager
+def cpu_time_limit(seconds=None):
+    """
+    Interrompe o bloco com CPUTimeExceeded após ``seconds`` de CPU.
+    
+    Usa ITIMER_PROF, que só pode ser armado na thread principal (workers
+    síncronos do gunicorn); nas demais threads o limite fica a cargo do
+    timeout do gunicorn.
+    """
+    seconds = CPU_TIME_LIMIT if seconds is None else seconds
+    if (not seconds or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    
+    def on_timeout(signum, frame):
+        raise CPUTimeExceeded("Tempo de CPU da requisição excedido")
+    
+    previous = signal.signal(signal.SIGPROF, on_timeout)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+def transpile_bounded(python_code):
+    """
+    Transpila um item do lote no processo do pool, limitado a
+    TRANSPILER_CPU_LIMIT de CPU (ou BATCH_TIMEOUT, se o limite estiver
+    desligado): ``future.cancel()`` não interrompe um item já em execução.
+    """
+    try:
+        with cpu_time_limit(CPU_TIME_LIMIT or BATCH_TIMEOUT):
+            return transpile_python_to_js(python_code)
+    except CPUTimeExceeded as e:
+        raise TimeoutError(str(e)) from None
+
+# Fila de jobs assíncronos; resultados concluídos alimentam o cache
+job_queue = queue_from_env(on_result=transpile_cache.store)
+atexit.register(job_queue.shutdown)
+live_sessions = sessions_from_env()
+JOB_MAX_WAIT = 30
+
+@app.errorhandler(413)
+def request_too_large(error):
+    limit = app.config['MAX_CONTENT_LENGTH']
+    return jsonify({
+        'success': False,
+        'error': f'Requisição maior que o limite de {limit} bytes'
+    }), 413
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/transpile', methods=['POST'])
+def _request_options(data):
+    """Opções do transpilador enviadas no JSON ou na query string"""
+    # Passes de otimização e modo compacto opcionais; a forma canônica
+    # mantém estáveis a chave do cache e o ETag
+    options = {}
+    optimize = data.get('optimize')
+    if optimize in ('1', 'true'):
+        optimize = True
+    if optimize and optimize not in ('0', 'false'):
+        options['optimize'] = ','.join(resolve_passes(optimize))
+    if data.get('minify') not in (None, False, '', '0', 'false'):
+        options['minify'] = True
+    return options
+
+def _etag_matches(etag):
+    """
+    If-None-Match contém o ETag, em qualquer uma das codificações. Só vale
+    para GET e HEAD: nos demais métodos a condição é ignorada (RFC 9110).
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    condition = request.if_none_match
+    return any(condition.contains(candidate)
+               for candidate in (etag, f"{etag}-gzip", f"{etag}-br"))
+
+def _not_modified(etag, cache_control):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+@app.route('/transpile', methods=['GET', 'POST'])
 def transpile():
+    """
+    Transpila ``python_code`` (JSON no POST ou query string no GET).
+    
+    A resposta traz um ETag determinístico (hash da versão do transpilador,
+    das opções e do código); no GET com If-None-Match igual, responde 304
+    sem transpilar de novo.
+    """
     try:
-        data = request.get_json()
+        data = request.args if request.method in ('GET', 'HEAD') else request.get_json()
         python_code = data.get('python_code', '')
         
         if not python_code.strip():
             return jsonify({'error': 'Código Python não pode estar vazio'})
         
-        js_code = transpile_python_to_js(python_code)
+        try:
+            options = _request_options(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        return jsonify({
+        etag = make_key(python_code, options)
+        cache_control = f'public, max-age={HTTP_MAX_AGE}'
+        if _etag_matches(etag):
+            return _not_modified(etag, cache_control)
+        
+        with cpu_time_limit():
+            js_code = transpile_cache.transpile(python_code, **options)
+        
+        response = jsonify({
             'success': True,
             'js_code': js_code
         })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        return response
     
+    except HTTPException:
+        raise
+    except CPUTimeExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         })
 
-@app.route('/examples')
-def examples():
-    """Retorna exemplos de código Python e JavaScript"""
-    examples = [
-        {
-            'name': 'Função Simples',
-            'python': '''def saudacao(nome):
-    return f"Olá, {nome}!"
+@app.route('/transpile/stream', methods=['POST'])
+def transpile_stream():
+    """
+    Transpila em streaming (resposta chunked), statement a statement.
+    
+    Aceita JSON ({"python_code": ...}) ou o código Python puro no corpo.
+    """
+    if request.is_json:
+        python_code = request.get_json().get('python_code', '')
+    else:
+        python_code = request.get_data(as_text=True)
+    
+    if not python_code.strip():
+        return jsonify({'error': 'Código Python não pode estar vazio'}), 400
+    
+    mimetype = 'application/javascript; charset=utf-8'
+    cached = transpile_cache.lookup(python_code)
+    if cached is not None:
+        return Response(cached, mimetype=mimetype)
+    
+    def generate():
+        # O limite vale para a soma das partes, mas só fica armado enquanto
+        # uma parte é gerada (não durante a escrita no socket)
+        chunks = transpile_iter(python_code)
+        deadline = time.process_time() + CPU_TIME_LIMIT
+        while True:
+            try:
+                remaining = deadline - time.process_time()
+                if CPU_TIME_LIMIT and remaining <= 0:
+                    raise CPUTimeExceeded("Tempo de CPU da requisição excedido")
+                with cpu_time_limit(remaining if CPU_TIME_LIMIT else 0):
+                    chunk = next(chunks)
+            except StopIteration:
+                return
+            except CPUTimeExceeded as e:
+                yield f"\n// {e}"
+                return
+            yield chunk
+    
+    return Response(stream_with_context(generate()), mimetype=mimetype)
 
-print(saudacao("Maria"))''',
-            'javascript': '''function saudacao(nome) {
-    return `Olá, ${nome}!`;
-}
+def transpile_items(items):
+    """
+    Transpila os itens de um lote, gerando (posição, resultado) à medida que
+    cada um fica pronto.
+    
+    Itens em cache são devolvidos imediatamente; os demais são distribuídos
+    no pool de processos e armazenados no mesmo cache do /transpile.
+    """
+    pending = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            item = {}
+        item_id = item.get('id', index)
+        python_code = item.get('python_code')
+        
+        if not isinstance(python_code, str) or not python_code.strip():
+            yield index, {'id': item_id, 'success': False, 'error': 'Código Python não pode estar vazio'}
+            continue
+        
+        js_code = transpile_cache.lookup(python_code)
+        if js_code is not None:
+            yield index, {'id': item_id, 'success': True, 'js_code': js_code}
+        else:
+            pending.setdefault(python_code, []).append((index, item_id))
+    
+    if len(pending) == 1:
+        # Um único trecho novo: transpila aqui mesmo, sem passar pelo pool
+        python_code = next(iter(pending))
+        try:
+            with cpu_time_limit():
+                completed = [(python_code, transpile_python_to_js(python_code))]
+        except CPUTimeExceeded as e:
+            completed = [(python_code, e)]
+    elif pending:
+        pool = get_pool()
+        try:
+            futures = {pool.submit(transpile_bounded, code): code for code in pending}
+        except BrokenProcessPool:
+            discard_pool(pool)
+            pool = get_pool()
+            futures = {pool.submit(transpile_bounded, code): code for code in pending}
+        completed = _completed_results(pool, futures)
+    else:
+        completed = []
+    
+    for python_code, result in completed:
+        if not isinstance(result, Exception):
+            transpile_cache.store(python_code, result)
+        for index, item_id in pending[python_code]:
+            if isinstance(result, Exception):
+                yield index, {'id': item_id, 'success': False, 'error': str(result)}
+            else:
+                yield index, {'id': item_id, 'success': True, 'js_code': result}
 
-console.log(saudacao("Maria"));'''
-        },
-        {
-            'name': 'Estruturas de Controle',
-            'python': '''idade = 20
+def _completed_results(pool, futures):
+    """Gera (código, resultado ou exceção) na ordem de conclusão, até BATCH_TIMEOUT"""
+    done = set()
+    try:
+        for future in as_completed(futures, timeout=BATCH_TIMEOUT or None):
+            done.add(future)
+            try:
+                yield futures[future], future.result()
+            except BrokenProcessPool:
+                discard_pool(pool)
+                yield futures[future], RuntimeError("Processo do lote encerrado inesperadamente")
+            except Exception as e:
+                yield futures[future], e
+    except FuturesTimeout:
+        for future, python_code in futures.items():
+            if future not in done:
+                future.cancel()
+                yield python_code, TimeoutError("Tempo limite do lote excedido")
+
+@app.route('/transpile/batch', methods=['POST'])
+def transpile_batch():
+    """
+    Transpila vários trechos em uma requisição.
+    
+    Corpo: {"items": [{"id": ..., "python_code": ...}, ...], "stream": false}
+    ou apenas a lista de itens. Com "stream": true (ou ?stream=1) a resposta é
+    NDJSON, uma linha por item assim que ele fica pronto; caso contrário, um
+    JSON com os resultados na ordem dos itens.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, list):
+        data = {'items': data}
+    elif not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Envie um objeto JSON ou uma lista de itens'}), 400
+    items = data.get('items')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'Informe uma lista não vazia em "items"'}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({
+            'success': False,
+            'error': f'Máximo de {BATCH_MAX_ITEMS} itens por lote'
+        }), 413
+    
+    if data.get('stream') or request.args.get('stream') == '1':
+        def generate():
+            for _, result in transpile_items(items):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    results = [None] * len(items)
+    for index, result in transpile_items(items):
+        results[index] = result
+    
+    return jsonify({'success': True, 'results': results})
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Enfileira a transpilação de um código grande e devolve o id do job (202).
+    
+    Aceita JSON ({"python_code": ...}) ou o código Python puro no corpo.
+    Responde 429 quando a fila está cheia.
+    """
+    if request.is_json:
+        python_code = (request.get_json(silent=True) or {}).get('python_code', '')
+    else:
+        python_code = request.get_data(as_text=True)
+    
+    if not isinstance(python_code, str) or not python_code.strip():
+        return jsonify({'success': False, 'error': 'Código Python não pode estar vazio'}), 400
+    
+    js_code = transpile_cache.lookup(python_code)
+    try:
+        job = job_queue.submit(python_code) if js_code is None else job_queue.complete(js_code)
+    except QueueFull as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 429
+    
+    response = jsonify(_job_payload(job))
+    response.headers['Location'] = f"/jobs/{job['job_id']}"
+    return response, 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Estado do job; com ?wait=N aguarda até N segundos pela conclusão (long-poll)"""
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), JOB_MAX_WAIT)
+    except ValueError:
+        wait = 0
+    
+    job = job_queue.get(job_id, wait=wait)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado ou expirado'}), 404
+    return jsonify(_job_payload(job))
+
+def _job_payload(job):
+    payload = {'job_id': job['job_id'], 'status': job['status']}
+    if job['status'] == 'done':
+        payload['js_code'] = job['js_code']
+    elif job['status'] == 'failed':
+        payload['error'] = job['error']
+    return payload
+
+@app.route('/live', methods=['POST'])
+def create_live_session():
+    """
+    Abre uma sessão de transpilação ao vivo (201) com as opções do
+    transpilador (``optimize``, ``minify``). Responde 429 no limite de sessões
+    e 404 quando o modo ao vivo está desativado (serve.py sem --live).
+    """
+    if not live_sessions.enabled:
+        return jsonify({
+            'success': False,
+            'error': 'Modo ao vivo desativado neste servidor (use serve.py --live)'
+        }), 404
+    
+    try:
+        options = _request_options(request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        session = live_sessions.create(**options)
+    except SessionLimit as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '30'
+        return response, 429
+    
+    response = jsonify({'success': True, 'session_id': session.session_id})
+    response.headers['Location'] = f"/live/{session.session_id}"
+    return response, 201
+
+@app.route('/live/<session_id>/events')
+def live_events(session_id):
+    """Canal de server-sent events da sessão: snapshot inicial e patches das linhas alteradas"""
+    session = live_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Sessão não encontrada ou expirada'}), 404
+    
+    response = Response(stream_with_context(session.events(live_sessions.keepalive)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/live/<session_id>/edit', methods=['POST'])
+def live_edit(session_id):
+    """Recebe uma edição ({"version": n, "python_code": ...}); versões antigas são ignoradas"""
+    session = live_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Sessão não encontrada ou expirada'}), 404
+    
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    python_code = data.get('python_code')
+    if not isinstance(version, int) or not isinstance(python_code, str):
+        return jsonify({'success': False, 'error': 'Informe version (inteiro) e python_code'}), 400
+    
+    accepted = session.submit(version, python_code)
+    return jsonify({'success': True, 'accepted': accepted}), 202
+
+@app.route('/live/<session_id>', methods=['DELETE'])
+def close_live_session(session_id):
+    """Encerra a sessão e o seu canal de eventos"""
+    if not live_sessions.close(session_id):
+        return jsonify({'success': False, 'error': 'Sessão não encontrada ou expirada'}), 404
+    return jsonify({'success': True})
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Retorna os contadores do cache de transpilação"""
+    return jsonify(transpile_cache.stats())
+
+@app.route('/metrics')
+def metrics():
+    """Métricas no formato do Prometheus (cache, fila de jobs e, se ativa, instrumentação)"""
+    lines = []
+    cache = transpile_cache.stats()
+    for name, kind in (('hits', 'counter'), ('misses', 'counter'),
+                       ('evictions', 'counter'), ('size', 'gauge')):
+        metric = f"transpiler_cache_{name}" + ('_total' if kind == 'counter' else '')
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {cache[name]}")
+    
+    jobs = job_queue.stats()
+    lines.append("# TYPE transpiler_jobs_pending gauge")
+    lines.append(f"transpiler_jobs_pending {jobs['pending']}")
+    
+    live = live_sessions.stats()
+    lines.append("# TYPE transpiler_live_sessions gauge")
+    lines.append(f"transpiler_live_sessions {live['sessions']}")
+    
+    body = "\n".join(lines) + "\n"
+    if transpile_cache.profiler is not None:
+        body += transpile_cache.profiler.to_prometheus()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+# Exemplos da interface: o JavaScript é gerado pelo próprio transpilador na
+# inicialização, então não diverge da saída real
+EXAMPLE_SOURCES = [
+    ('Função Simples', '''def saudacao(nome):
+    return f"Olá, {nome}!"
+
+print(saudacao("Maria"))'''),
+    ('Estruturas de Controle', '''idade = 20
 if idade >= 18:
     print("Maior de idade")
 else:
     print("Menor de idade")
 
 for i in range(5):
-    print(f"Número: {i}")''',
-            'javascript': '''let idade = 20;
-if (idade >= 18) {
-    console.log("Maior de idade");
-} else {
-    console.log("Menor de idade");
-}
-
-for (let i = 0; i < 5; i++) {
-    console.log(`Número: ${i}`);
-}'''
-        },
-        {
-            'name': 'Lista e Operações',
-            'python': '''numeros = [1, 2, 3, 4, 5]
+    print(f"Número: {i}")'''),
+    ('Lista e Operações', '''numeros = [1, 2, 3, 4, 5]
 soma = 0
 
 for num in numeros:
     soma += num
 
 print(f"Soma total: {soma}")
-print(f"Quantidade: {len(numeros)}")''',
-            'javascript': '''let numeros = [1, 2, 3, 4, 5];
-let soma = 0;
-
-for (let num of numeros) {
-    soma += num;
-}
-
-console.log(`Soma total: ${soma}`);
-console.log(`Quantidade: ${numeros.length}`);'''
-        },
-        {
-            'name': 'Classe Simples',
-            'python': '''class Pessoa:
+print(f"Quantidade: {len(numeros)}")'''),
+    ('Classe Simples', '''class Pessoa:
     def __init__(self, nome, idade):
         self.nome = nome
         self.idade = idade
@@ -98,30 +529,80 @@ console.log(`Quantidade: ${numeros.length}`);'''
         return f"Eu sou {self.nome}, tenho {self.idade} anos"
 
 p = Pessoa("João", 25)
-print(p.apresentar())''',
-            'javascript': '''class Pessoa {
-    constructor(nome, idade) {
-        this.nome = nome;
-        this.idade = idade;
-    }
+print(p.apresentar())'''),
+]
+
+def _encoding_for(size):
+    """Codificação aceita pelo cliente para um corpo de ``size`` bytes, ou None"""
+    if size < COMPRESS_MIN_BYTES:
+        return None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def _compress(data, encoding, best=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+def build_examples():
+    """Corpo JSON dos exemplos, seu ETag e as versões já comprimidas"""
+    examples = [{'name': name, 'python': python_code, 'javascript': transpile_python_to_js(python_code)}
+                for name, python_code in EXAMPLE_SOURCES]
+    body = json.dumps(examples, ensure_ascii=False).encode('utf-8')
+    bodies = {None: body, 'gzip': _compress(body, 'gzip', best=True)}
+    if brotli is not None:
+        bodies['br'] = _compress(body, 'br', best=True)
+    return hashlib.sha256(body).hexdigest()[:32], bodies
+
+EXAMPLES_ETAG, EXAMPLES_BODIES = build_examples()
+
+@app.route('/examples')
+def examples():
+    """Retorna exemplos de código Python e JavaScript"""
+    cache_control = f'public, max-age={HTTP_MAX_AGE}'
+    if _etag_matches(EXAMPLES_ETAG):
+        return _not_modified(EXAMPLES_ETAG, cache_control)
     
-    apresentar() {
-        return `Eu sou ${this.nome}, tenho ${this.idade} anos`;
-    }
-}
+    encoding = _encoding_for(len(EXAMPLES_BODIES[None]))
+    response = Response(EXAMPLES_BODIES[encoding], mimetype='application/json')
+    response.set_etag(EXAMPLES_ETAG if encoding is None else f"{EXAMPLES_ETAG}-{encoding}")
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = cache_control
+    return response
 
-let p = new Pessoa("João", 25);
-console.log(p.apresentar());'''
-        }
-    ]
+@app.after_request
+def compress_response(response):
+    """Comprime com brotli ou gzip as respostas acima de COMPRESS_MIN_BYTES"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not response.mimetype.startswith(COMPRESSIBLE_TYPES)):
+        return response
     
-    return jsonify(examples)
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = _encoding_for(len(data))
+    if encoding is None:
+        return response
+    response.set_data(_compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # Cada codificação é uma representação diferente: o ETag forte muda junto
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
 
 if __name__ == '__main__':
     # Criar diretório de templates se não existir
     if not os.path.exists('templates'):
         os.makedirs('templates')
     
+    # Servidor de desenvolvimento; em produção use serve.py
     print("Servidor iniciado em http://localhost:5000")
     print("Pressione Ctrl+C para parar")
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Modo em lote do transpilador: converte diretórios, globs ou listas de
+arquivos .py, espelhando a árvore de diretórios na saída e distribuindo o
+trabalho entre os núcleos com ``ProcessPoolExecutor``.
+
+Um manifesto (``.transpile-manifest.json``) no diretório de saída guarda o
+hash de cada arquivo transpilado; na execução seguinte os arquivos cujo
+hash não mudou são pulados.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cache import make_key
+from transpiler import SYNTAX_ERROR_PREFIX, transpile_python_to_js
+
+MANIFEST_NAME = '.transpile-manifest.json'
+
+
+@dataclass
+class FileResult:
+    """Resultado da transpilação de um arquivo"""
+    source: str
+    output: str
+    seconds: float = 0.0
+    skipped: bool = False
+    error: Optional[str] = None
+    # Modo compacto: bytes economizados em relação à saída formatada
+    saved_bytes: Optional[int] = None
+
+
+def minify_savings(python_code: str, js_code: str, options: Dict[str, Any]) -> int:
+    """Bytes que a saída compacta ``js_code`` economiza em relação à formatada"""
+    pretty = transpile_python_to_js(python_code, **dict(options, minify=False))
+    return len(pretty.encode('utf-8')) - len(js_code.encode('utf-8'))
+
+
+def collect_sources(inputs: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Expande diretórios, globs e arquivos em pares (caminho, caminho relativo).
+
+    O caminho relativo define onde o .js é gravado dentro do diretório de
+    saída: relativo ao diretório informado, à parte fixa do glob ou, para
+    arquivos avulsos, ao diretório comum a todos eles (só o nome do arquivo
+    quando estão na mesma pasta). Duas entradas que gerariam o mesmo .js
+    são um erro (``ValueError``).
+    """
+    sources = {}
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            base = item
+            paths = glob.glob(os.path.join(item, '**', '*.py'), recursive=True)
+        elif glob.has_magic(item):
+            base = _glob_base(item)
+            paths = [p for p in glob.glob(item, recursive=True) if p.endswith('.py')]
+        else:
+            files.append(item)
+            continue
+
+        for path in sorted(paths):
+            if os.path.isfile(path):
+                sources.setdefault(os.path.normpath(path), os.path.relpath(path, base or '.'))
+
+    if files:
+        base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+        for path in files:
+            sources.setdefault(os.path.normpath(path), os.path.relpath(os.path.abspath(path), base))
+
+    outputs: Dict[str, str] = {}
+    for path, relpath in sorted(sources.items()):
+        output = os.path.normcase(os.path.splitext(relpath)[0])
+        if output in outputs:
+            raise ValueError(f"{outputs[output]} e {path} gerariam o mesmo arquivo "
+                             f"{os.path.splitext(relpath)[0]}.js")
+        outputs[output] = path
+    return sorted(sources.items())
+
+
+def _glob_base(pattern: str) -> str:
+    """Parte inicial do glob sem caracteres curinga"""
+    parts = []
+    for part in pattern.split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts)
+
+
+def source_hash(python_code: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Hash do código, das opções e da versão do transpilador usado no manifesto"""
+    return make_key(python_code, options)
+
+
+def transpile_file(source: str, output: str, options: Optional[Dict[str, Any]] = None) -> FileResult:
+    """Transpila um arquivo; executado nos processos do pool"""
+    start = time.perf_counter()
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            python_code = f.read()
+
+        js_code = transpile_python_to_js(python_code, **(options or {}))
+        if js_code.startswith(SYNTAX_ERROR_PREFIX):
+            return FileResult(source, output, time.perf_counter() - start, error=js_code[3:])
+
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(js_code)
+        seconds = time.perf_counter() - start
+        
+        saved_bytes = None
+        if options and options.get('minify'):
+            saved_bytes = minify_savings(python_code, js_code, options)
+    except Exception as e:
+        return FileResult(source, output, time.perf_counter() - start, error=str(e))
+    return FileResult(source, output, seconds, saved_bytes=saved_bytes)
+
+
+def load_manifest(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: Dict[str, str]) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def run_batch(inputs: Iterable[str], output_dir: str, jobs: Optional[int] = None,
+              force: bool = False, options: Optional[Dict[str, Any]] = None) -> List[FileResult]:
+    """
+    Transpila todos os arquivos de ``inputs`` para ``output_dir``.
+
+    ``jobs`` define o número de processos (padrão: número de núcleos);
+    ``force`` ignora o manifesto e transpila tudo novamente; ``options`` são
+    repassadas ao transpilador (por exemplo, ``{'optimize': True}``) e fazem
+    parte do hash do manifesto.
+    """
+    manifest = {} if force else load_manifest(output_dir)
+    new_manifest = {}
+    results = []
+    pending = []
+
+    for source, relpath in collect_sources(inputs):
+        output = os.path.join(output_dir, os.path.splitext(relpath)[0] + '.js')
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                digest = source_hash(f.read(), options)
+        except (OSError, UnicodeDecodeError) as e:
+            results.append(FileResult(source, output, error=str(e)))
+            continue
+
+        if manifest.get(relpath) == digest and os.path.exists(output):
+            new_manifest[relpath] = digest
+            results.append(FileResult(source, output, skipped=True))
+        else:
+            pending.append((source, output, relpath, digest))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pending) <= 1:
+        completed = [(item, transpile_file(item[0], item[1], options)) for item in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            futures = {pool.submit(transpile_file, item[0], item[1], options): item for item in pending}
+            completed = [(futures[future], future.result()) for future in as_completed(futures)]
+
+    for (_, _, relpath, digest), result in completed:
+        if result.error is None:
+            new_manifest[relpath] = digest
+        results.append(result)
+
+    save_manifest(output_dir, new_manifest)
+    return sorted(results, key=lambda r: r.source)
+
+
+def print_summary(results: List[FileResult], elapsed: float) -> None:
+    """Imprime o tempo de cada arquivo e o resumo final com as falhas"""
+    transpiled = [r for r in results if not r.skipped and r.error is None]
+    skipped = [r for r in results if r.skipped]
+    failed = [r for r in results if r.error is not None]
+
+    for result in sorted(transpiled, key=lambda r: r.seconds, reverse=True):
+        saved = f"  (-{result.saved_bytes} bytes)" if result.saved_bytes is not None else ""
+        print(f"  {result.seconds * 1000:8.1f} ms  {result.source} -> {result.output}{saved}")
+
+    print(f"\n{len(transpiled)} transpilado(s), {len(skipped)} sem alteração, "
+          f"{len(failed)} falha(s) em {elapsed:.2f}s")
+    saved = [r.saved_bytes for r in transpiled if r.saved_bytes is not None]
+    if saved:
+        print(f"Modo compacto: {sum(saved)} bytes economizados")
+
+    if failed:
+        print("\nFalhas:")
+        for result in failed:
+            print(f"  {result.source}: {result.error}")
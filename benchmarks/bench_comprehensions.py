@@ -0,0 +1,111 @@
+"""
+Benchmark do código gerado para comprehensions: o laço único do
+transpilador (sem arrays intermediários) versus a tradução ingênua com
+métodos encadeados (``.filter().map()``, ``.flatMap()`` e
+``Array.from({length})`` para range), ambos executados no ``node``.
+
+Uso:
+    python -m benchmarks.bench_comprehensions [--size 1000000] [--repeat 10]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from transpiler import PythonToJSTranspiler
+
+
+class ChainedTranspiler(PythonToJSTranspiler):
+    """Tradução ingênua: um array intermediário por cláusula for/if"""
+
+    def _chain(self, node, finish):
+        generators = node.generators
+        code = None
+        for index in reversed(range(len(generators))):
+            generator = generators[index]
+            target = self._target(generator.target)
+            range_args = self._range_args(generator.iter)
+            if range_args is not None:
+                bounds = [self.visit_node(arg) for arg in range_args]
+                start, stop = ("0", bounds[0]) if len(bounds) == 1 else bounds
+                source = f"Array.from({{length: Math.max(0, {stop} - {start})}}, (_, $k) => $k + {start})"
+            else:
+                source = self._iterable(generator.iter)
+            for condition in generator.ifs:
+                source += f".filter(({target}) => {self.visit_node(condition)})"
+            if code is None:
+                code = f"{source}.map(({target}) => {finish})"
+            else:
+                code = f"{source}.flatMap(({target}) => {code})"
+        return code
+
+    def visit_ListComp(self, node):
+        return self._chain(node, self.visit_node(node.elt))
+
+    def visit_SetComp(self, node):
+        return f"new Set({self._chain(node, self.visit_node(node.elt))})"
+
+    def visit_DictComp(self, node):
+        pair = f"[{self.visit_node(node.key)}, {self.visit_node(node.value)}]"
+        return f"Object.fromEntries({self._chain(node, pair)})"
+
+
+WORKLOADS = {
+    'map': "[x * 2 for x in dados]",
+    'filtro': "[x * 2 for x in dados if x % 3 == 0]",
+    'filtros': "[x for x in dados if x % 2 == 0 if x % 5 != 0]",
+    'range': "[i * i for i in range(tamanho)]",
+    'aninhada': "[i * j for i in range(raiz) for j in range(raiz) if j % 2 == 0]",
+    'conjunto': "{x % 1000 for x in dados}",
+    'dicionário': "{x: x * 2 for x in dados if x % 4 == 0}",
+}
+
+TEMPLATE = """
+def medir(tamanho, repeticoes):
+    dados = [i for i in range(tamanho)]
+    raiz = 1000
+    resultado = None
+    inicio = performance.now()
+    for r in range(repeticoes):
+        resultado = {expression}
+    duracao = performance.now() - inicio
+    print("tempo", duracao / repeticoes)
+
+medir({size}, {repeat})
+"""
+
+
+def run_node(js_code: str) -> float:
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False, encoding='utf-8') as f:
+        f.write(js_code)
+    try:
+        result = subprocess.run(['node', f.name], check=True, capture_output=True, text=True)
+        return float(re.search(r"tempo ([\d.e-]+)", result.stdout).group(1))
+    finally:
+        os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if not shutil.which('node'):
+        sys.exit("node não encontrado: o benchmark executa o JavaScript gerado")
+
+    fused = PythonToJSTranspiler()
+    chained = ChainedTranspiler()
+    for name, expression in WORKLOADS.items():
+        python_code = TEMPLATE.format(expression=expression, size=args.size, repeat=args.repeat)
+        fast = run_node(fused.transpile(python_code))
+        slow = run_node(chained.transpile(python_code))
+        print(f"{name:<11} laço único {fast:8.2f} ms   encadeada {slow:8.2f} ms   ({slow / fast:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
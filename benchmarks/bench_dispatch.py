@@ -0,0 +1,72 @@
+"""
+Micro-benchmark do despacho de visitantes: tabela por tipo de nó versus
+``getattr`` com nome formatado a cada nó.
+
+Uso:
+    python -m benchmarks.bench_dispatch [--copies 300]
+"""
+
+import argparse
+import ast
+import os
+import time
+
+from transpiler import PythonToJSTranspiler
+
+EXEMPLO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exemplo.py')
+
+EXPRESSOES = '''
+def calcular(a, b, c):
+    total = a * b + c - a / b % c
+    if total >= 10 and not a == b or c != 0:
+        total += len(str(a)) ** 2
+    while -total < 100:
+        total -= int(b) * float(c)
+    return total > a in lista
+'''
+
+
+class GetattrTranspiler(PythonToJSTranspiler):
+    """Despacho anterior: f-string com o nome do método + getattr a cada nó"""
+
+    def visit_node(self, node: ast.AST) -> str:
+        method_name = f"visit_{type(node).__name__}"
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+
+def build_corpus(copies: int) -> ast.Module:
+    with open(EXEMPLO, encoding='utf-8') as f:
+        source = f.read() + EXPRESSOES
+    return ast.parse(source * copies)
+
+
+def nodes_per_second(transpiler_cls, tree: ast.Module, total_nodes: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        transpiler = transpiler_cls()
+        start = time.perf_counter()
+        transpiler.visit_node(tree)
+        best = min(best, time.perf_counter() - start)
+    return total_nodes / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--copies', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tree = build_corpus(args.copies)
+    total_nodes = sum(1 for _ in ast.walk(tree))
+    print(f"Corpus: {total_nodes} nós")
+
+    before = nodes_per_second(GetattrTranspiler, tree, total_nodes, args.repeat)
+    after = nodes_per_second(PythonToJSTranspiler, tree, total_nodes, args.repeat)
+    print(f"   getattr: {before:12,.0f} nós/s")
+    print(f"    tabela: {after:12,.0f} nós/s")
+    print(f"     Ganho: {after / before:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
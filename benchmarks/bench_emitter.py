@@ -0,0 +1,116 @@
+"""
+Benchmark do emissor de código: buffer único (CodeWriter) versus
+concatenação recursiva de strings, em módulos grandes e profundamente
+aninhados.
+
+Uso:
+    python -m benchmarks.bench_emitter [--functions 400] [--depth 24]
+"""
+
+import argparse
+import ast
+import time
+import tracemalloc
+
+from transpiler import PythonToJSTranspiler
+
+
+class ConcatTranspiler(PythonToJSTranspiler):
+    """
+    Reprodução da estratégia anterior: cada bloco monta as strings dos
+    filhos, junta tudo e devolve ao pai, que junta de novo.
+    """
+
+    def emit(self, tree: ast.Module) -> str:
+        return self._block(tree.body, 0)
+
+    def _block(self, statements, level: int) -> str:
+        indent = " " * (level * self.indent_size)
+        return "\n".join(indent + self._stmt(stmt, level) for stmt in statements)
+
+    def _stmt(self, node, level: int) -> str:
+        if isinstance(node, ast.FunctionDef):
+            args = ", ".join(arg.arg for arg in node.args.args)
+            body = self._block(node.body, level + 1)
+            return f"function {node.name}({args}) {{\n{body}\n}}"
+        if isinstance(node, ast.If):
+            body = self._block(node.body, level + 1)
+            return f"if ({self.visit_node(node.test)}) {{\n{body}\n}}"
+        if isinstance(node, ast.While):
+            body = self._block(node.body, level + 1)
+            return f"while ({self.visit_node(node.test)}) {{\n{body}\n}}"
+        if isinstance(node, ast.For):
+            body = self._block(node.body, level + 1)
+            target = self.visit_node(node.target)
+            return f"for (let {target} of {self.visit_node(node.iter)}) {{\n{body}\n}}"
+        if isinstance(node, ast.Assign):
+            return f"let {self.visit_node(node.targets[0])} = {self.visit_node(node.value)};"
+        return f"{self.visit_node(node.value)};"
+
+
+def generate_source(functions: int, depth: int) -> str:
+    """Gera um módulo com funções aninhadas em if/for/while até ``depth`` níveis"""
+    lines = []
+    for f in range(functions):
+        lines.append(f"def funcao_{f}(a, b):")
+        for level in range(depth):
+            indent = "    " * (level + 1)
+            lines.append(f"{indent}x{level} = a + {level}")
+            kind = level % 3
+            if kind == 0:
+                lines.append(f"{indent}if x{level} > b:")
+            elif kind == 1:
+                lines.append(f"{indent}for item{level} in lista:")
+            else:
+                lines.append(f"{indent}while x{level} < b:")
+        lines.append("    " * (depth + 1) + "print(a, b)")
+    return "\n".join(lines) + "\n"
+
+
+def emit_with_writer(tree: ast.Module) -> str:
+    transpiler = PythonToJSTranspiler()
+    transpiler.visit_node(tree)
+    return transpiler.writer.getvalue()
+
+
+def emit_with_concat(tree: ast.Module) -> str:
+    return ConcatTranspiler().emit(tree)
+
+
+def measure(emit, tree: ast.Module, repeat: int):
+    """Mede apenas a emissão (a AST é gerada uma vez, fora da medição)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        emit(tree)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    emit(tree)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--functions', type=int, default=400)
+    parser.add_argument('--depth', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_source(args.functions, args.depth)
+    tree = ast.parse(source)
+    print(f"Entrada: {source.count(chr(10))} linhas, {args.depth} níveis de aninhamento")
+
+    results = {}
+    for label, emit in (("concatenação", emit_with_concat), ("CodeWriter", emit_with_writer)):
+        seconds, peak = measure(emit, tree, args.repeat)
+        results[label] = seconds
+        print(f"{label:>14}: {seconds * 1000:8.1f} ms   pico de memória {peak / 1024 / 1024:6.1f} MiB")
+
+    print(f"Ganho: {results['concatenação'] / results['CodeWriter']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark do caminho rápido de literais: listas e dicionários só de
+constantes com 10^5 a 10^6 elementos, emitidos em bloco (literals.py)
+versus um visitante por elemento.
+
+Mede o tempo de emissão (sem a análise, que é igual nos dois casos) e, se
+o ``node`` estiver instalado, o tempo que o motor JavaScript leva para
+carregar o literal e a versão ``JSON.parse('...')``.
+
+Uso:
+    python -m benchmarks.bench_literals [--sizes 100000 1000000]
+"""
+
+import argparse
+import ast
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from transpiler import PythonToJSTranspiler
+
+
+class PerNodeTranspiler(PythonToJSTranspiler):
+    """Sem o caminho rápido: cada elemento passa pelo seu visitante"""
+
+    def _bulk_literal(self, node):
+        return None
+
+
+def datasets(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    numbers = ", ".join(str(rng.randint(-10 ** 6, 10 ** 6)) for _ in range(size))
+    words = ", ".join(f'"palavra {rng.randint(0, 999)}\\t"' for _ in range(size))
+    records = ", ".join(
+        f'{{"id": {i}, "nome": "item {i}", "ativo": {rng.choice(("True", "False"))}, "peso": {rng.random():.3f}}}'
+        for i in range(size // 4)
+    )
+    return {
+        'números': f"dados = [{numbers}]\n",
+        'strings': f"dados = [{words}]\n",
+        'registros': f"dados = [{records}]\n",
+    }
+
+
+def emit_time(transpiler: PythonToJSTranspiler, tree: ast.Module, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transpiler.emit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def node_load_time(js_code: str) -> float:
+    """Segundos para o node compilar e executar o arquivo (mediana de 3)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False, encoding='utf-8') as f:
+        f.write(js_code + "\nconsole.log(dados.length);\n")
+    try:
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            subprocess.run(['node', f.name], check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        return sorted(times)[1]
+    finally:
+        os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    bulk = PythonToJSTranspiler()
+    per_node = PerNodeTranspiler()
+    json_parse = PythonToJSTranspiler(json_parse_min=10_000)
+    node = shutil.which('node')
+
+    for size in args.sizes:
+        for name, source in datasets(size).items():
+            tree = ast.parse(source)
+            fast = emit_time(bulk, tree, args.repeat)
+            slow = emit_time(per_node, tree, args.repeat)
+            line = (f"{size:>9} {name:<10} emissão: em bloco {fast * 1000:8.1f} ms   "
+                    f"por elemento {slow * 1000:8.1f} ms ({slow / fast:4.1f}x)")
+            if node:
+                literal = node_load_time(bulk.emit(tree))
+                parsed = node_load_time(json_parse.emit(tree))
+                line += f"   node: literal {literal * 1000:7.1f} ms  JSON.parse {parsed * 1000:7.1f} ms"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
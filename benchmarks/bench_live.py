@@ -0,0 +1,123 @@
+"""
+Benchmark do lado servidor das sessões ao vivo: N editores simulados
+digitando ao mesmo tempo, cada um com sua sessão e seu canal de eventos.
+
+Cada editor parte de um módulo com algumas dezenas de funções e, a cada
+``--interval`` ms (o debounce do cliente), altera uma linha de uma função.
+Mede a latência entre a edição e o patch correspondente (p50/p99), as
+edições substituídas ou canceladas e os bytes enviados em patches
+comparados com o envio da saída completa a cada versão.
+
+Uso:
+    python -m benchmarks.bench_live [--sessions 50] [--duration 5] [--interval 150]
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+
+from benchmarks.corpus import generate
+from benchmarks.load_test import percentile
+from live import LiveSessions, split_lines
+from transpiler import transpile_python_to_js
+
+# Atribuições simples dentro das funções: acrescentar " + n" mantém o código válido
+ASSIGNMENT = re.compile(r'^\s+\w+ = [^:]*$')
+
+
+def editor(sessions: LiveSessions, source: str, seed: int, deadline: float,
+           interval: float, results: dict, lock: threading.Lock) -> None:
+    """Um editor simulado: envia edições e consome os eventos da sessão"""
+    rng = random.Random(seed)
+    session = sessions.create()
+    sent = {}
+    latencies = []
+    received = {'patch_bytes': 0, 'full_bytes': 0}
+
+    def consume():
+        for message in session.events(keepalive=0.5):
+            if not message.startswith('event: patch'):
+                continue
+            now = time.perf_counter()
+            data = message.split('data: ', 1)[1]
+            version = int(data.split('"version": ', 1)[1].split(',', 1)[0])
+            latencies.append(now - sent[version])
+            received['patch_bytes'] += len(message.encode('utf-8'))
+            received['full_bytes'] += len('\n'.join(session.lines).encode('utf-8'))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    lines = source.splitlines(keepends=True)
+    editable = [i for i, line in enumerate(lines) if ASSIGNMENT.match(line)]
+    # A primeira versão é o módulo aberto no editor
+    version = 1
+    sent[version] = time.perf_counter()
+    session.submit(version, source)
+    while time.perf_counter() < deadline:
+        index = rng.choice(editable)
+        lines[index] = lines[index].rstrip('\n') + f" + {rng.randint(0, 9)}\n"
+        version += 1
+        sent[version] = time.perf_counter()
+        session.submit(version, "".join(lines))
+        time.sleep(interval * rng.uniform(0.5, 1.5))
+
+    # Espera o último patch antes de fechar a sessão
+    try:
+        while session.output_version < version and time.perf_counter() < deadline + 30:
+            time.sleep(0.01)
+        assert '\n'.join(session.lines) == transpile_python_to_js("".join(lines))
+    finally:
+        sessions.close(session.session_id)
+        consumer.join()
+
+    with lock:
+        results['latencies'].extend(latencies)
+        results['edits'] += version
+        for key in ('superseded', 'cancelled', 'transpiled'):
+            results[key] += session.stats[key]
+        results['patch_bytes'] += received['patch_bytes']
+        results['full_bytes'] += received['full_bytes']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0, help='segundos de edição')
+    parser.add_argument('--interval', type=float, default=150, help='ms entre edições (debounce)')
+    parser.add_argument('--scale', type=float, default=0.02, help='tamanho do módulo de cada editor')
+    args = parser.parse_args()
+
+    source = generate('wide_module', args.scale)[0]
+    sessions = LiveSessions(max_sessions=args.sessions)
+    results = {'latencies': [], 'edits': 0, 'superseded': 0, 'cancelled': 0, 'transpiled': 0,
+               'patch_bytes': 0, 'full_bytes': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    editors = [threading.Thread(target=editor,
+                                args=(sessions, source, seed, deadline, args.interval / 1000, results, lock))
+               for seed in range(args.sessions)]
+    start = time.perf_counter()
+    for thread in editors:
+        thread.start()
+    for thread in editors:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = results['latencies']
+    print(f"{args.sessions} sessões, módulo de {len(split_lines(source))} linhas, {elapsed:.1f}s")
+    print(f"edições: {results['edits']}  transpiladas: {results['transpiled']}  "
+          f"substituídas: {results['superseded']}  canceladas: {results['cancelled']}")
+    if latencies:
+        print(f"latência edição -> patch: p50 {percentile(latencies, 0.5) * 1000:.1f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    if results['full_bytes']:
+        print(f"bytes em patches: {results['patch_bytes']}  saída completa: {results['full_bytes']} "
+              f"({results['patch_bytes'] / results['full_bytes']:.1%})")
+
+
+if __name__ == '__main__':
+    main()
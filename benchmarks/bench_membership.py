@@ -0,0 +1,88 @@
+"""
+Benchmark do código gerado para testes de pertinência em coleções grandes:
+a mesma função Python com a coleção construída como lista, conjunto e
+dicionário, transpilada e executada no ``node``.
+
+Com conjuntos e dicionários locais o ``in`` vira ``Set.has`` e
+``Object.hasOwn`` (tempo constante, ver shapes.py); listas continuam com
+``.includes`` (busca linear).
+
+Uso:
+    python -m benchmarks.bench_membership [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from transpiler import transpile_python_to_js
+
+CONSTRUCTIONS = {
+    'lista': "[]",
+    'conjunto': "set()",
+    'dicionário': "{}",
+}
+
+# append ainda não é convertido; push é chamado direto no array
+ADDITIONS = {
+    'lista': "colecao.push(i * 2)",
+    'conjunto': "colecao.add(i * 2)",
+    'dicionário': "colecao[i * 2] = True",
+}
+
+TEMPLATE = """
+def contar(tamanho, consultas):
+    colecao = {construction}
+    for i in range(tamanho):
+        {addition}
+    inicio = Date.now()
+    achados = 0
+    for i in range(consultas):
+        if i in colecao:
+            achados += 1
+    print("tempo", Date.now() - inicio, "achados", achados)
+
+contar({size}, {queries})
+"""
+
+
+def run_node(js_code: str) -> str:
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False, encoding='utf-8') as f:
+        f.write(js_code)
+    try:
+        result = subprocess.run(['node', f.name], check=True, capture_output=True, text=True)
+        return result.stdout
+    finally:
+        os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=100_000)
+    args = parser.parse_args()
+
+    if not shutil.which('node'):
+        sys.exit("node não encontrado: o benchmark executa o JavaScript gerado")
+
+    for size in args.sizes:
+        line = f"{size:>7} elementos, {args.queries} consultas:"
+        found = set()
+        for name, construction in CONSTRUCTIONS.items():
+            python_code = TEMPLATE.format(construction=construction, addition=ADDITIONS[name],
+                                          size=size, queries=args.queries)
+            output = run_node(transpile_python_to_js(python_code))
+            elapsed, hits = re.search(r"tempo (\d+) achados (\d+)", output).groups()
+            found.add(hits)
+            line += f"   {name} {int(elapsed):6d} ms"
+        # As três versões precisam encontrar os mesmos elementos
+        assert len(found) == 1, found
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark da transpilação paralela de um único módulo grande: tempo e
+aceleração de 1 a N processos, conferindo que a saída é idêntica à
+sequencial.
+
+Uso:
+    python -m benchmarks.bench_parallel [--scale 2.0] [--jobs 8] [--repeat 3]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import generate
+from parallel import transpile_parallel
+from transpiler import transpile_python_to_js
+
+
+def best_of(repeat: int, run) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=float, default=2.0,
+                        help='tamanho do módulo (wide_module do corpus; 1.0 ≈ 29 mil linhas)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate('wide_module', args.scale)[0]
+    expected = transpile_python_to_js(source)
+    print(f"Entrada: {source.count(chr(10)) + 1} linhas, {len(source) / 1024 / 1024:.1f} MiB "
+          f"({os.cpu_count()} núcleo(s) disponível(is))")
+
+    sequential = best_of(args.repeat, lambda: transpile_python_to_js(source))
+    print(f"{'sequencial':>12}: {sequential * 1000:8.1f} ms")
+
+    for jobs in range(2, args.jobs + 1):
+        # O pool é criado fora da medição, como em um processo de longa duração
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            output = transpile_parallel(source, jobs=jobs, executor=pool)
+            assert output == expected, "saída paralela difere da sequencial"
+            elapsed = best_of(args.repeat, lambda: transpile_parallel(source, jobs=jobs, executor=pool))
+        print(f"{jobs:>3} processos: {elapsed * 1000:8.1f} ms   aceleração {sequential / elapsed:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
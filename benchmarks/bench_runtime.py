@@ -0,0 +1,127 @@
+"""
+Benchmark do custo do runtime com a semântica do Python (runtime.py): o
+código gerado com ``$py_mod``, ``$py_floordiv``, ``$py_len``, ``$py_in`` e
+``$py_range`` versus a tradução nativa anterior (``%``, ``Math.floor(a / b)``,
+``.length``, ``.includes`` e laço com contador mesmo com passo variável),
+ambos executados no ``node``.
+Também mostra quantos bytes as funções do runtime acrescentam à saída.
+
+Uso:
+    python -m benchmarks.bench_runtime [--size 10000000] [--repeat 5]
+"""
+
+import argparse
+import ast
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from runtime import with_runtime
+from transpiler import PythonToJSTranspiler
+
+
+class NativeTranspiler(PythonToJSTranspiler):
+    """Tradução sem runtime: operadores e propriedades nativos do JavaScript"""
+
+    def _binop(self, node, left, right):
+        kind = type(node.op)
+        if kind is ast.Mod:
+            return f"{self._operand(node.left, left, 13)} % {self._operand(node.right, right, 13, True)}"
+        if kind is ast.FloorDiv:
+            return f"Math.floor({self._operand(node.left, left, 13)} / {self._operand(node.right, right, 13, True)})"
+        return super()._binop(node, left, right)
+
+    def _membership(self, container, right, item):
+        return f"{right}.includes({item})"
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id == 'len':
+            return f"{self.visit_node(node.args[0])}.length"
+        return super().visit_Call(node)
+
+    def _loop_header(self, target, node, iterable=None):
+        # range com passo variável (suposto positivo) vira laço com contador
+        if iterable is None and isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                and node.func.id == 'range' and len(node.args) == 3:
+            start, stop, step = (self.visit_node(arg) for arg in node.args)
+            return f"for (let {target} = {start}; {target} < {stop}; {target} += {step})"
+        return super()._loop_header(target, node, iterable)
+
+
+# Carga de trabalho -> (laço, corpo)
+WORKLOADS = {
+    'resto': ("for i in range(tamanho):", "acumulado += i % 7 - (i - metade) % 5"),
+    'divisão inteira': ("for i in range(tamanho):", "acumulado += (i - metade) // divisor"),
+    'len': ("for i in range(tamanho):", "acumulado += len(dados)"),
+    'in': ("for i in range(tamanho):", "if i % 4 in dados:\n                acumulado += 1"),
+    'range com passo': ("for i in range(0, tamanho, passo):", "acumulado += i"),
+}
+
+TEMPLATE = """
+def lista_pequena():
+    return [1, 2, 3]
+
+def medir(tamanho, repeticoes):
+    dados = lista_pequena()
+    metade = tamanho // 2
+    divisor = 3
+    passo = 3
+    acumulado = 0
+    inicio = performance.now()
+    for r in range(repeticoes):
+        {loop}
+            {body}
+    duracao = performance.now() - inicio
+    print("tempo", duracao / repeticoes, acumulado)
+
+medir({size}, {repeat})
+"""
+
+
+def run_node(js_code: str):
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False, encoding='utf-8') as f:
+        f.write(js_code)
+    try:
+        result = subprocess.run(['node', f.name], check=True, capture_output=True, text=True)
+        elapsed, total = re.search(r"tempo ([\d.e-]+) (-?[\d.e+-]+)", result.stdout).groups()
+        return float(elapsed), total
+    finally:
+        os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=10_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not shutil.which('node'):
+        sys.exit("node não encontrado: o benchmark executa o JavaScript gerado")
+
+    exact = PythonToJSTranspiler()
+    native = NativeTranspiler()
+    for name, (loop, body) in WORKLOADS.items():
+        python_code = TEMPLATE.format(loop=loop, body=body, size=args.size, repeat=args.repeat)
+        exact_js = exact.transpile(python_code)
+        native_js = native.transpile(python_code)
+        fast, native_total = run_node(native_js)
+        slow, exact_total = run_node(exact_js)
+        # Sem operandos negativos os dois resultados coincidem, exceto no resto
+        if name != 'resto' and name != 'divisão inteira':
+            assert native_total == exact_total, (name, native_total, exact_total)
+        extra = len(exact_js.encode('utf-8')) - len(native_js.encode('utf-8'))
+        print(f"{name:<16} runtime {slow:8.2f} ms   nativo {fast:8.2f} ms   "
+              f"({slow / fast:4.2f}x, +{extra} bytes)")
+
+    # Tamanho de cada função do runtime quando incluída
+    print()
+    for helper in ('mod', 'floordiv', 'len', 'in', 'range'):
+        code = f"x($py_{helper});"
+        print(f"$py_{helper:<9} +{len(with_runtime(code, compact=True)) - len(code)} bytes (compacto)")
+
+
+if __name__ == '__main__':
+    main()
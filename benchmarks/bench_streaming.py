@@ -0,0 +1,70 @@
+"""
+Benchmark da transpilação em streaming: tempo até a primeira parte e pico de
+memória ao gravar a saída de um código-fonte de vários megabytes.
+
+Uso:
+    python -m benchmarks.bench_streaming [--functions 20000]
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+from transpiler import transpile_iter, transpile_python_to_js
+
+
+def generate_source(functions: int) -> str:
+    return "".join(
+        f"def funcao_{i}(a, b):\n"
+        f"    total = a * {i} + b\n"
+        f"    for item in itens:\n"
+        f"        total += item\n"
+        f"    return total\n\n"
+        for i in range(functions)
+    )
+
+
+def run_full(source: str, sink) -> float:
+    js_code = transpile_python_to_js(source)
+    first = time.perf_counter()
+    sink.write(js_code)
+    return first
+
+
+def run_streaming(source: str, sink) -> float:
+    first = None
+    for chunk in transpile_iter(source):
+        if first is None:
+            first = time.perf_counter()
+        sink.write(chunk)
+    return first
+
+
+def measure(run, source: str):
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        tracemalloc.start()
+        start = time.perf_counter()
+        first = run(source, sink)
+        total = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return first - start, total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--functions', type=int, default=20000)
+    args = parser.parse_args()
+
+    source = generate_source(args.functions)
+    print(f"Entrada: {len(source) / 1024 / 1024:.1f} MiB")
+
+    for label, run in (("completo", run_full), ("streaming", run_streaming)):
+        ttfb, total, peak = measure(run, source)
+        print(f"{label:>10}: primeira parte {ttfb * 1000:8.1f} ms   total {total * 1000:8.1f} ms   "
+              f"pico {peak / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
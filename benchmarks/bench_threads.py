@@ -0,0 +1,64 @@
+"""
+Benchmark de vazão com threads: uma instância configurada de
+PythonToJSTranspiler compartilhada por 1 a N threads, comparada com uma
+instância nova por chamada.
+
+Com o GIL a vazão não cresce com as threads (o ganho esperado é a ausência
+de perda); em builds free-threaded (python3.13t) ela deve escalar com os
+núcleos.
+
+Uso:
+    python -m benchmarks.bench_threads [--threads 8] [--scale 0.5]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from benchmarks.corpus import generate
+from transpiler import PythonToJSTranspiler
+
+
+def run(threads: int, documents, transpile) -> float:
+    """Documentos por segundo com ``threads`` threads dividindo os documentos"""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(n):
+        barrier.wait()
+        for doc in documents[n::threads]:
+            transpile(doc)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return len(documents) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--scale', type=float, default=0.5)
+    args = parser.parse_args()
+
+    documents = generate('small_snippets', args.scale) * 4
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"{len(documents)} documentos, {os.cpu_count()} núcleo(s), GIL {'ativo' if gil else 'desativado'}")
+
+    shared = PythonToJSTranspiler()
+    baseline = None
+    for threads in range(1, args.threads + 1):
+        rate = run(threads, documents, shared.transpile)
+        fresh = run(threads, documents, lambda doc: PythonToJSTranspiler().transpile(doc))
+        baseline = baseline or rate
+        print(f"{threads:>3} thread(s): compartilhada {rate:9.0f} docs/s ({rate / baseline:4.2f}x)   "
+              f"nova por chamada {fresh:9.0f} docs/s")
+
+
+if __name__ == '__main__':
+    main()
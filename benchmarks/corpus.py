@@ -0,0 +1,165 @@
+"""
+Gerador determinístico de corpus sintético para os benchmarks.
+
+Cada carga de trabalho é uma lista de documentos Python gerados a partir de
+uma semente fixa, de modo que a mesma combinação de ``seed`` e ``scale``
+produz sempre exatamente o mesmo código:
+
+- ``small_snippets``: muitos trechos curtos, como os enviados pela interface web;
+- ``wide_module``: um módulo com milhares de funções de nível superior;
+- ``deep_nesting``: fluxo de controle profundamente aninhado;
+- ``class_heavy``: muitas classes com construtor e métodos;
+- ``huge_literals``: listas, dicionários e strings literais enormes.
+
+Uso:
+    python -m benchmarks.corpus wide_module [--scale 1.0] [--seed 0]
+"""
+
+import argparse
+import random
+from typing import Callable, Dict, List
+
+NAMES = ('total', 'valor', 'item', 'contador', 'resultado', 'indice', 'limite', 'soma')
+OPERATORS = ('+', '-', '*', '//', '%')
+COMPARISONS = ('<', '>', '<=', '>=', '==', '!=')
+
+
+def _expression(rng: random.Random, names) -> str:
+    left = rng.choice(names)
+    if rng.random() < 0.5:
+        return f"{left} {rng.choice(OPERATORS)} {rng.randint(1, 99)}"
+    return f"{left} {rng.choice(OPERATORS)} {rng.choice(names)}"
+
+
+def _statement(rng: random.Random, indent: str, names) -> str:
+    kind = rng.randrange(5)
+    target = rng.choice(names)
+    if kind == 0:
+        return f"{indent}{target} = {_expression(rng, names)}"
+    if kind == 1:
+        return f"{indent}{target} += {rng.randint(1, 9)}"
+    if kind == 2:
+        return f"{indent}print(f\"{target}: {{{target}}}\")"
+    if kind == 3:
+        return f"{indent}{target} = len(lista) + {rng.randint(0, 9)}"
+    return f"{indent}{target} = [{', '.join(str(rng.randint(0, 999)) for _ in range(4))}]"
+
+
+def _function(rng: random.Random, name: str, statements: int, indent: str = "") -> List[str]:
+    args = rng.sample(NAMES, 2)
+    names = list(args) + ['total']
+    lines = [f"{indent}def {name}({', '.join(args)}):", f"{indent}    total = 0"]
+    for _ in range(statements):
+        if rng.random() < 0.25:
+            lines.append(f"{indent}    if {rng.choice(names)} {rng.choice(COMPARISONS)} {rng.randint(0, 99)}:")
+            lines.append(_statement(rng, indent + "        ", names))
+            lines.append(f"{indent}    else:")
+            lines.append(_statement(rng, indent + "        ", names))
+        elif rng.random() < 0.2:
+            lines.append(f"{indent}    for i in range({rng.randint(1, 100)}):")
+            lines.append(f"{indent}        total += i")
+        else:
+            lines.append(_statement(rng, indent + "    ", names))
+    lines.append(f"{indent}    return total")
+    return lines
+
+
+def small_snippets(rng: random.Random, scale: float) -> List[str]:
+    snippets = []
+    for n in range(max(1, int(300 * scale))):
+        if n % 3 == 0:
+            lines = _function(rng, f"funcao_{n}", rng.randint(1, 4))
+        else:
+            lines = ["lista = [1, 2, 3]"] + [_statement(rng, "", NAMES) for _ in range(rng.randint(2, 8))]
+        snippets.append("\n".join(lines) + "\n")
+    return snippets
+
+
+def wide_module(rng: random.Random, scale: float) -> List[str]:
+    lines = []
+    for n in range(max(1, int(2000 * scale))):
+        lines.extend(_function(rng, f"funcao_{n}", rng.randint(3, 8)))
+        lines.append("")
+    return ["\n".join(lines)]
+
+
+def deep_nesting(rng: random.Random, scale: float) -> List[str]:
+    # O parser do CPython limita a indentação a 100 níveis
+    depth = 60
+    lines = []
+    for n in range(max(1, int(40 * scale))):
+        lines.append(f"def aninhada_{n}(a, b):")
+        for level in range(depth):
+            indent = "    " * (level + 1)
+            lines.append(f"{indent}x{level} = a + {level}")
+            kind = rng.randrange(3)
+            if kind == 0:
+                lines.append(f"{indent}if x{level} {rng.choice(COMPARISONS)} b:")
+            elif kind == 1:
+                lines.append(f"{indent}for item{level} in lista:")
+            else:
+                lines.append(f"{indent}while x{level} < b:")
+        lines.append("    " * (depth + 1) + "print(a, b)")
+    return ["\n".join(lines) + "\n"]
+
+
+def class_heavy(rng: random.Random, scale: float) -> List[str]:
+    lines = []
+    for n in range(max(1, int(300 * scale))):
+        fields = rng.sample(NAMES, 3)
+        lines.append(f"class Classe{n}:")
+        lines.append(f"    def __init__(self, {', '.join(fields)}):")
+        lines.extend(f"        self.{field} = {field}" for field in fields)
+        for m in range(rng.randint(2, 6)):
+            field = rng.choice(fields)
+            lines.append(f"    def metodo_{m}(self, valor):")
+            lines.append(f"        self.{field} = self.{field} + valor")
+            lines.append(f"        return self.{field}")
+        lines.append("")
+    return ["\n".join(lines)]
+
+
+def huge_literals(rng: random.Random, scale: float) -> List[str]:
+    size = max(1, int(20000 * scale))
+    numbers = ", ".join(str(rng.randint(-10 ** 6, 10 ** 6)) for _ in range(size))
+    entries = ", ".join(f'"chave_{i}": {rng.randint(0, 10 ** 6)}' for i in range(size // 4))
+    words = " ".join(rng.choice(NAMES) for _ in range(size // 2))
+    matrix = ", ".join(
+        "[" + ", ".join(str(rng.randint(0, 9)) for _ in range(16)) + "]"
+        for _ in range(size // 16)
+    )
+    return [
+        f"numeros = [{numbers}]\n"
+        f"tabela = {{{entries}}}\n"
+        f"texto = \"{words}\"\n"
+        f"matriz = [{matrix}]\n"
+    ]
+
+
+WORKLOADS: Dict[str, Callable[[random.Random, float], List[str]]] = {
+    'small_snippets': small_snippets,
+    'wide_module': wide_module,
+    'deep_nesting': deep_nesting,
+    'class_heavy': class_heavy,
+    'huge_literals': huge_literals,
+}
+
+
+def generate(workload: str, scale: float = 1.0, seed: int = 0) -> List[str]:
+    """Documentos da carga de trabalho ``workload``; mesma semente, mesmo código"""
+    rng = random.Random(f"{seed}:{workload}")
+    return WORKLOADS[workload](rng, scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('workload', choices=sorted(WORKLOADS))
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("\n# ---\n".join(generate(args.workload, args.scale, args.seed)))
+
+
+if __name__ == '__main__':
+    main()
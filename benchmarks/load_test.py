@@ -0,0 +1,89 @@
+"""
+Teste de carga do endpoint /transpile: requisições por segundo e latências
+p50/p99.
+
+Uso (com o servidor rodando, por exemplo ``python serve.py``):
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 16 --requests 2000
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+SNIPPET = '''def fatorial(n):
+    resultado = 1
+    for i in range(1, n + 1):
+        resultado *= i
+    return resultado
+
+print(f"{VARIANTE}: {fatorial(10)}")
+'''
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def worker(url, counter, lock, total, unique, latencies, errors):
+    while True:
+        with lock:
+            if counter[0] >= total:
+                return
+            index = counter[0]
+            counter[0] += 1
+
+        python_code = SNIPPET.replace("VARIANTE", f"v{index}" if unique else "v")
+        body = json.dumps({'python_code': python_code}).encode('utf-8')
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            with lock:
+                errors[0] += 1
+            continue
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do endpoint /transpile")
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--unique', action='store_true',
+                        help='envia um código diferente por requisição (sem acertos de cache)')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/') + '/transpile'
+    counter, errors, latencies = [0], [0], []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(url, counter, lock, args.requests,
+                                              args.unique, latencies, errors))
+        for _ in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"Requisições: {len(latencies)} ok, {errors[0]} erro(s) em {elapsed:.2f}s")
+    print(f"Vazão:       {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"Latência:    p50 {percentile(latencies, 0.50) * 1000:.1f} ms   "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
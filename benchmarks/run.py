@@ -0,0 +1,177 @@
+"""
+Suíte de benchmarks de ``transpile_python_to_js`` com verificação de regressão.
+
+Para cada carga de trabalho do corpus sintético (``benchmarks.corpus``) mede
+a vazão (bytes de código Python por segundo), os percentis de latência por
+documento e o pico de memória alocada (tracemalloc), e grava tudo em JSON.
+
+Com ``--baseline``, compara o resultado com uma execução anterior e termina
+com código 1 se alguma métrica piorar além de ``--threshold``.
+
+Uso:
+    python -m benchmarks.run [-o resultado.json] [--scale 1.0] [--repeat 5]
+    python -m benchmarks.run --baseline benchmarks/baseline.json [--threshold 0.15]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from benchmarks.corpus import WORKLOADS, generate
+from cache import TRANSPILER_VERSION
+from transpiler import transpile_python_to_js
+
+RESULTS_VERSION = 1
+
+# Métrica -> True se valores maiores são melhores
+METRICS = {
+    'throughput_bytes_per_s': True,
+    'latency_p50_ms': False,
+    'latency_p95_ms': False,
+    'peak_memory_bytes': False,
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Percentil por interpolação linear entre as amostras ordenadas"""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def run_workload(documents: List[str], repeat: int) -> Dict[str, float]:
+    """Mede uma carga de trabalho; a medição de memória é feita em uma passada separada"""
+    total_bytes = sum(len(doc.encode('utf-8')) for doc in documents)
+
+    # Aquecimento: importa, preenche caches internos do interpretador
+    transpile_python_to_js(documents[0])
+
+    latencies = []
+    rounds = []
+    for _ in range(repeat):
+        round_start = time.perf_counter()
+        for doc in documents:
+            start = time.perf_counter()
+            transpile_python_to_js(doc)
+            latencies.append(time.perf_counter() - start)
+        rounds.append(time.perf_counter() - round_start)
+
+    peak = 0
+    for doc in documents:
+        tracemalloc.start()
+        transpile_python_to_js(doc)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'documents': len(documents),
+        'input_bytes': total_bytes,
+        'throughput_bytes_per_s': total_bytes / min(rounds),
+        'latency_p50_ms': percentile(latencies, 0.50) * 1000,
+        'latency_p95_ms': percentile(latencies, 0.95) * 1000,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_memory_bytes': peak,
+    }
+
+
+def run_suite(workloads: List[str], scale: float = 1.0, seed: int = 0, repeat: int = 5,
+              log=None) -> dict:
+    results = {
+        'version': RESULTS_VERSION,
+        'transpiler_version': TRANSPILER_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'scale': scale,
+        'seed': seed,
+        'repeat': repeat,
+        'workloads': {},
+    }
+    for name in workloads:
+        stats = run_workload(generate(name, scale, seed), repeat)
+        results['workloads'][name] = stats
+        if log is not None:
+            log(f"{name:>15}: {stats['throughput_bytes_per_s'] / 1024 / 1024:7.2f} MiB/s   "
+                f"p50 {stats['latency_p50_ms']:9.2f} ms   p95 {stats['latency_p95_ms']:9.2f} ms   "
+                f"p99 {stats['latency_p99_ms']:9.2f} ms   "
+                f"memória {stats['peak_memory_bytes'] / 1024 / 1024:7.1f} MiB")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Lista as regressões de ``results`` em relação a ``baseline``.
+
+    Uma métrica regride quando piora mais que ``threshold`` (fração: 0.15 =
+    15%). Só são comparadas cargas de trabalho presentes nas duas execuções.
+    """
+    if (baseline.get('scale'), baseline.get('seed')) != (results['scale'], results['seed']):
+        raise ValueError(
+            f"Linha de base gerada com scale={baseline.get('scale')} seed={baseline.get('seed')}; "
+            f"execução atual com scale={results['scale']} seed={results['seed']}"
+        )
+
+    regressions = []
+    for name, stats in results['workloads'].items():
+        reference = baseline.get('workloads', {}).get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = reference.get(metric), stats[metric]
+            if not old:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > threshold:
+                regressions.append(f"{name}.{metric}: {old:.6g} -> {new:.6g} ({change:+.1%} pior)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('workloads', nargs='*', metavar='CARGA',
+                        help=f"cargas a medir (padrão: todas): {', '.join(WORKLOADS)}")
+    parser.add_argument('-o', '--output', metavar='ARQUIVO', help='grava o resultado em JSON')
+    parser.add_argument('--scale', type=float, default=1.0, help='fator de tamanho do corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', metavar='ARQUIVO',
+                        help='resultado anterior para verificar regressões')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='piora máxima tolerada por métrica (padrão: 0.15 = 15%%)')
+    args = parser.parse_args(argv)
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"carga desconhecida: {', '.join(sorted(unknown))}")
+
+    results = run_suite(args.workloads or list(WORKLOADS), args.scale, args.seed, args.repeat,
+                        log=print)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultado gravado em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(results, baseline, args.threshold)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return 2
+        if regressions:
+            print(f"Regressões acima de {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"Sem regressões acima de {args.threshold:.0%} em relação a {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,512 @@
+"""
+Modo projeto: empacota um programa de vários módulos em um único módulo ES.
+
+A partir do módulo de entrada, as importações (``import a.b``,
+``from a import b``, ``from . import c``...) são resolvidas dentro do
+diretório do projeto e formam o grafo de dependências. Cada módulo é
+transpilado uma única vez, statement de nível superior por statement, em
+um pool de processos; o resultado fica em cache (cache.py) pelo hash do
+código e das opções, de modo que uma nova montagem só retranspila os
+módulos alterados.
+
+Na montagem (``link``):
+
+- os módulos importados viram closures executadas em ordem topológica,
+  ``const $pacote$util = (() => { ... return {f, g}; })();``, que devolvem
+  só os nomes usados por outros módulos;
+- as importações viram ``const {f, g: h} = $pacote$util;``;
+- o código do módulo de entrada fica no nível superior (o corpo de
+  ``if __name__ == '__main__':`` inclusive) e suas funções e classes
+  públicas são exportadas com ``export {...}``;
+- tree shaking: funções e classes que não são alcançadas a partir do
+  código de nível superior dos módulos e das exportações da entrada são
+  removidas. A análise segue os nomes lidos e os acessos ``modulo.nome``;
+  um módulo usado como valor (``f(modulo)``) mantém tudo o que define.
+
+Módulos fora do projeto (biblioteca padrão, pacotes instalados) não são
+incluídos e aparecem em ``Bundle.external``. Importações circulares
+levantam ``BundleError``.
+
+Uso:
+    Bundler(jobs=4, minify=True).build('app/main.py').code
+"""
+
+import ast
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from cache import TranspileCache
+from runtime import with_runtime
+from transpiler import SYNTAX_ERROR_PREFIX, shared_transpiler
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_IMPORTS = (ast.Import, ast.ImportFrom)
+
+# Referência a um nome de um módulo; nome None é o módulo inteiro
+Symbol = Tuple[str, Optional[str]]
+
+
+class BundleError(Exception):
+    """Projeto que não pode ser empacotado (entrada ausente, erro de sintaxe, ciclo)"""
+
+
+@dataclass
+class Module:
+    """Módulo do projeto com as ligações criadas por suas importações"""
+    name: str
+    path: str
+    source: str
+    tree: ast.Module
+    is_package: bool = False
+    # Funções e classes de nível superior: nome -> índice do statement
+    definitions: Dict[str, int] = field(default_factory=dict)
+    # Nomes atribuídos no nível superior fora de definições e importações
+    assigned: Set[str] = field(default_factory=set)
+    # Nome local -> (módulo, nome importado); nome None liga o próprio módulo
+    bindings: Dict[str, Symbol] = field(default_factory=dict)
+    # import a.b sem alias: nome local 'a' -> submódulos importados ('a.b', ...)
+    packages: Dict[str, List[str]] = field(default_factory=dict)
+    star_imports: List[str] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
+    # JavaScript de cada statement de nível superior (None nas importações)
+    statements: List[Optional[str]] = field(default_factory=list)
+
+    @property
+    def variable(self) -> str:
+        return '$' + self.name.replace('.', '$')
+
+    def top_level_names(self) -> Set[str]:
+        return set(self.definitions) | self.assigned
+
+
+@dataclass
+class Bundle:
+    """Resultado de uma montagem"""
+    code: str
+    # Módulos na ordem de execução (a entrada por último)
+    modules: List[str]
+    transpiled: List[str]
+    cached: List[str]
+    # Tamanho em bytes sem e com tree shaking
+    size_before: int
+    size_after: int
+    # Funções e classes removidas ('modulo.nome')
+    removed: List[str]
+    external: List[str]
+
+
+def is_main_guard(stmt: ast.stmt) -> bool:
+    """``if __name__ == '__main__':`` (sem else)"""
+    if not isinstance(stmt, ast.If) or stmt.orelse or not isinstance(stmt.test, ast.Compare):
+        return False
+    test = stmt.test
+    operands = [test.left] + test.comparators
+    return (len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)
+            and any(isinstance(o, ast.Name) and o.id == '__name__' for o in operands)
+            and any(isinstance(o, ast.Constant) and o.value == '__main__' for o in operands))
+
+
+def transpile_module(source: str, options: Dict[str, Any]) -> List[Optional[str]]:
+    """
+    JavaScript de cada statement de nível superior do módulo; importações
+    ficam como None (o ``link`` as converte). Executado nos processos do pool.
+    """
+    transpiler = shared_transpiler(**options)
+    try:
+        tree = transpiler.parse(source)
+    except SyntaxError as e:
+        raise BundleError(f"{SYNTAX_ERROR_PREFIX} {e}") from None
+    newline = transpiler.writer_class.NEWLINE
+    statements = []
+    for stmt in tree.body:
+        if isinstance(stmt, _IMPORTS):
+            statements.append(None)
+        elif is_main_guard(stmt):
+            # Só a entrada executa o bloco; o link descarta nos demais módulos
+            body = [s for s in stmt.body if not isinstance(s, _IMPORTS)]
+            statements.append(newline.join(filter(None, map(transpiler.emit_statement, body))))
+        else:
+            statements.append(transpiler.emit_statement(stmt))
+    return statements
+
+
+class Bundler:
+    """
+    Monta projetos com as opções do transpilador. O cache (por padrão em
+    memória) é reaproveitado entre montagens da mesma instância; com um
+    ``TranspileCache`` em SQLite ele vale também entre execuções.
+    """
+
+    def __init__(self, root: Optional[str] = None, jobs: Optional[int] = None,
+                 cache: Optional[TranspileCache] = None, **options):
+        self.root = root
+        self.jobs = jobs
+        self.cache = cache if cache is not None else TranspileCache()
+        self.options = options
+        # Chave de cache própria: o valor guardado é a lista de statements
+        self._cache_options = dict(options, bundle_statements=True)
+
+    # -- grafo de dependências ---------------------------------------------
+
+    def _find(self, root: str, name: str) -> Optional[Tuple[str, bool]]:
+        """Caminho do módulo pontuado ``name`` em ``root`` e se é um pacote"""
+        base = os.path.join(root, *name.split('.'))
+        if os.path.isfile(base + '.py'):
+            return base + '.py', False
+        if os.path.isfile(os.path.join(base, '__init__.py')):
+            return os.path.join(base, '__init__.py'), True
+        return None
+
+    def _load(self, root: str, name: str, path: str, is_package: bool) -> Module:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise BundleError(f"{path}: {e}") from None
+        try:
+            tree = ast.parse(source)
+        except SyntaxError as e:
+            raise BundleError(f"{path}: {SYNTAX_ERROR_PREFIX} {e}") from None
+        return Module(name, path, source, tree, is_package)
+
+    def _absolute(self, module: Module, node: ast.ImportFrom) -> str:
+        """Nome absoluto do módulo de um ``from ... import`` (relativo ou não)"""
+        if not node.level:
+            return node.module or ''
+        parts = module.name.split('.')
+        if not module.is_package:
+            parts = parts[:-1]
+        if node.level - 1 > len(parts):
+            raise BundleError(f"{module.path}:{node.lineno}: importação relativa além do projeto")
+        parts = parts[:len(parts) - (node.level - 1)]
+        if node.module:
+            parts.append(node.module)
+        return '.'.join(parts)
+
+    def _scan(self, module: Module, resolve) -> None:
+        """Definições, atribuições e ligações de importação do nível superior"""
+        for index, stmt in enumerate(module.tree.body):
+            if isinstance(stmt, _DEFINITIONS):
+                module.definitions[stmt.name] = index
+            elif isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    if not resolve(alias.name):
+                        continue
+                    if alias.asname:
+                        module.bindings[alias.asname] = (alias.name, None)
+                    else:
+                        top = alias.name.split('.')[0]
+                        module.bindings[top] = (top, None)
+                        if top != alias.name:
+                            module.packages.setdefault(top, []).append(alias.name)
+            elif isinstance(stmt, ast.ImportFrom):
+                source = self._absolute(module, stmt)
+                for alias in stmt.names:
+                    submodule = f"{source}.{alias.name}" if source else alias.name
+                    if alias.name == '*':
+                        if resolve(source):
+                            module.star_imports.append(source)
+                    elif resolve(submodule, quiet=True):
+                        module.bindings[alias.asname or alias.name] = (submodule, None)
+                    elif resolve(source):
+                        module.bindings[alias.asname or alias.name] = (source, alias.name)
+            elif not is_main_guard(stmt):
+                for node in ast.walk(stmt):
+                    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                        module.assigned.add(node.id)
+                    elif isinstance(node, _DEFINITIONS):
+                        # Definições dentro de if/try no nível superior
+                        module.assigned.add(node.name)
+
+    def graph(self, entry: str) -> Tuple[Dict[str, Module], List[str], List[str]]:
+        """Módulos alcançáveis a partir de ``entry``, a ordem de execução e os externos"""
+        if not os.path.isfile(entry):
+            raise BundleError(f"Arquivo não encontrado: {entry}")
+        root = self.root or os.path.dirname(os.path.abspath(entry))
+        entry_name = os.path.splitext(os.path.basename(entry))[0]
+        modules = {entry_name: self._load(root, entry_name, entry, False)}
+        external: List[str] = []
+        pending = [entry_name]
+
+        while pending:
+            module = modules[pending.pop()]
+
+            def resolve(name: str, quiet: bool = False) -> bool:
+                if not name:
+                    return False
+                parts = name.split('.')
+                # Importar a.b executa antes o __init__ de a
+                for i in range(1, len(parts) + 1):
+                    prefix = '.'.join(parts[:i])
+                    if prefix not in modules:
+                        found = self._find(root, prefix)
+                        if found is None:
+                            if i == len(parts) and not quiet and name not in external:
+                                external.append(name)
+                            if i == len(parts):
+                                return False
+                            continue
+                        modules[prefix] = self._load(root, prefix, *found)
+                        pending.append(prefix)
+                    # O pacote de quem importa já está sendo inicializado: não é dependência
+                    inside = i < len(parts) and module.name.startswith(prefix + '.')
+                    if prefix not in module.dependencies and prefix != module.name and not inside:
+                        module.dependencies.append(prefix)
+                return True
+
+            self._scan(module, resolve)
+
+        return modules, self._order(modules, entry_name), external
+
+    def _order(self, modules: Dict[str, Module], entry: str) -> List[str]:
+        """Ordem topológica (dependências antes); importação circular é erro"""
+        order: List[str] = []
+        state: Dict[str, int] = {}
+        # Pilha explícita: (módulo, índice da próxima dependência)
+        stack = [(entry, 0)]
+        path = [entry]
+        state[entry] = 1
+        while stack:
+            name, index = stack.pop()
+            dependencies = modules[name].dependencies
+            if index < len(dependencies):
+                stack.append((name, index + 1))
+                dependency = dependencies[index]
+                if state.get(dependency) == 1:
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise BundleError("Importação circular: " + " -> ".join(cycle))
+                if dependency not in state:
+                    state[dependency] = 1
+                    path.append(dependency)
+                    stack.append((dependency, 0))
+            else:
+                state[name] = 2
+                path.pop()
+                order.append(name)
+        return order
+
+    # -- transpilação --------------------------------------------------------
+
+    def transpile(self, modules: Dict[str, Module]) -> Tuple[List[str], List[str]]:
+        """Preenche ``statements`` de cada módulo; devolve (transpilados, do cache)"""
+        cached, pending = [], []
+        for name, module in modules.items():
+            value = self.cache.lookup(module.source, **self._cache_options)
+            if value is not None:
+                module.statements = json.loads(value)
+                cached.append(name)
+            else:
+                pending.append(module)
+
+        jobs = self.jobs or os.cpu_count() or 1
+        if jobs == 1 or len(pending) <= 1:
+            results = [transpile_module(m.source, self.options) for m in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+                results = list(pool.map(transpile_module, [m.source for m in pending],
+                                        [self.options] * len(pending)))
+
+        for module, statements in zip(pending, results):
+            module.statements = statements
+            self.cache.store(module.source, json.dumps(statements, ensure_ascii=False), **self._cache_options)
+        return sorted(m.name for m in pending), sorted(cached)
+
+    # -- tree shaking e montagem ---------------------------------------------
+
+    def references(self, modules: Dict[str, Module], module: Module, stmt: ast.AST) -> Set[Symbol]:
+        """Símbolos (de qualquer módulo) lidos por um statement"""
+        parents: Dict[int, ast.AST] = {}
+        for node in ast.walk(stmt):
+            for child in ast.iter_child_nodes(node):
+                parents[id(child)] = node
+
+        def module_of(node: ast.AST) -> Optional[str]:
+            # Módulo denotado por um nome importado ou por a.b.c sobre ele
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                binding = module.bindings.get(node.id)
+                if binding is not None and binding[1] is None and node.id not in module.assigned:
+                    return binding[0]
+            elif isinstance(node, ast.Attribute):
+                base = module_of(node.value)
+                if base is not None and f"{base}.{node.attr}" in modules:
+                    return f"{base}.{node.attr}"
+            return None
+
+        symbols: Set[Symbol] = set()
+        for node in ast.walk(stmt):
+            target = module_of(node)
+            if target is not None:
+                parent = parents.get(id(node))
+                if not (isinstance(parent, ast.Attribute) and parent.value is node):
+                    # Módulo usado como valor: tudo o que ele define
+                    symbols.add((target, None))
+                elif f"{target}.{parent.attr}" not in modules:
+                    symbols.add((target, parent.attr))
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                symbols.add(self._resolve_name(modules, module, node.id))
+        return symbols
+
+    def _resolve_name(self, modules: Dict[str, Module], module: Module, name: str) -> Symbol:
+        if name in module.definitions or name in module.assigned or name in module.bindings:
+            return module.name, name
+        for source in module.star_imports:
+            if name in modules[source].top_level_names():
+                return source, name
+        return module.name, name
+
+    def shake(self, modules: Dict[str, Module], entry: str, shake: bool = True
+              ) -> Tuple[Dict[str, Set[int]], Dict[str, Set[str]]]:
+        """
+        Statements mantidos em cada módulo e nomes que cada módulo precisa
+        fornecer a outros. Sem ``shake`` todos os statements são mantidos.
+        """
+        kept: Dict[str, Set[int]] = {name: set() for name in modules}
+        requested: Dict[str, Set[str]] = {name: set() for name in modules}
+        seen: Set[Symbol] = set()
+        # (símbolo, módulo que o lê); só leituras de outros módulos viram exportações
+        pending: List[Tuple[Symbol, Optional[str]]] = []
+
+        def keep(module: Module, index: int) -> None:
+            if index not in kept[module.name]:
+                kept[module.name].add(index)
+                references = self.references(modules, module, module.tree.body[index])
+                pending.extend((symbol, module.name) for symbol in references)
+
+        for name, module in modules.items():
+            for index, stmt in enumerate(module.tree.body):
+                if isinstance(stmt, _IMPORTS) or (is_main_guard(stmt) and name != entry):
+                    continue
+                if not shake or not isinstance(stmt, _DEFINITIONS):
+                    keep(module, index)
+        for name in modules[entry].definitions:
+            if not name.startswith('_'):
+                pending.append(((entry, name), entry))
+
+        while pending:
+            symbol, reader = pending.pop()
+            module_name, name = symbol
+            if module_name not in modules:
+                continue
+            module = modules[module_name]
+            if name is None:
+                # Módulo usado como valor: fornece tudo o que define
+                names = module.top_level_names() | set(module.bindings)
+                requested[module_name].update(names)
+                pending.extend(((module_name, n), module_name) for n in names)
+                continue
+            if reader != module_name:
+                requested[module_name].add(name)
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            if name in module.definitions:
+                keep(module, module.definitions[name])
+            elif name in module.bindings and name not in module.assigned:
+                pending.append((module.bindings[name], module_name))
+        return kept, requested
+
+    def link(self, modules: Dict[str, Module], order: List[str], entry: str,
+             kept: Dict[str, Set[int]], requested: Dict[str, Set[str]]) -> str:
+        """Junta os statements mantidos em um único módulo ES"""
+        newline = shared_transpiler(**self.options).writer_class.NEWLINE
+        minify = bool(self.options.get('minify'))
+        parts: List[str] = []
+        emitted: Set[str] = set()
+
+        for name in order:
+            module = modules[name]
+            body: List[str] = []
+            bound: Set[str] = set()
+            # Importações só são ligadas se lidas pelo código mantido ou reexportadas
+            used = set(requested[name])
+            for index in kept[name]:
+                used.update(node.id for node in ast.walk(module.tree.body[index])
+                            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load))
+            for index, stmt in enumerate(module.tree.body):
+                if isinstance(stmt, _IMPORTS):
+                    body.extend(self._imports(modules, module, stmt, used, emitted, bound))
+                elif index in kept[name] and module.statements[index]:
+                    body.append(module.statements[index])
+
+            if name == entry:
+                parts.extend(body)
+                exports = sorted(n for n in modules[entry].definitions
+                                 if not n.startswith('_') and modules[entry].definitions[n] in kept[entry])
+                if exports:
+                    parts.append(f"export {{{', '.join(exports)}}};")
+                continue
+
+            exports = sorted(n for n in requested[name] if n in module.top_level_names() or n in bound)
+            if not body and not exports:
+                continue
+            emitted.add(name)
+            if not minify:
+                parts.append(f"// {os.path.relpath(module.path, os.path.dirname(modules[entry].path))}")
+            parts.append(f"const {module.variable} = (() => {{")
+            parts.extend(body)
+            parts.append(f"return {{{', '.join(exports)}}};")
+            parts.append("})();")
+        # Uma única cópia das funções do runtime usadas por todos os módulos
+        return with_runtime(newline.join(parts), minify)
+
+    def _imports(self, modules: Dict[str, Module], module: Module, stmt: ast.stmt,
+                 used: Set[str], emitted: Set[str], bound: Set[str]) -> List[str]:
+        """``const`` das ligações de uma importação que são de fato usadas"""
+        lines = []
+        for alias in stmt.names:
+            local = alias.asname or alias.name.split('.')[0]
+            binding = module.bindings.get(local)
+            if alias.name == '*' or binding is None or local in bound or local not in used:
+                continue
+            bound.add(local)
+            target, imported = binding
+            if imported is not None:
+                if target not in emitted:
+                    continue
+                pattern = imported if imported == local else f"{imported}: {local}"
+                lines.append(f"const {{{pattern}}} = {modules[target].variable};")
+            elif local in module.packages:
+                lines.append(f"const {local} = {self._namespace(modules, local, module.packages[local], emitted)};")
+            else:
+                lines.append(f"const {local} = {self._module_value(modules, target, emitted)};")
+        return lines
+
+    def _module_value(self, modules: Dict[str, Module], name: str, emitted: Set[str]) -> str:
+        return modules[name].variable if name in emitted else "{}"
+
+    def _namespace(self, modules: Dict[str, Module], package: str, submodules: List[str],
+                   emitted: Set[str]) -> str:
+        """Objeto de ``import a.b``: o pacote a com o atributo b (recursivo)"""
+        children: Dict[str, List[str]] = {}
+        for submodule in submodules:
+            rest = submodule[len(package) + 1:]
+            if rest:
+                child = f"{package}.{rest.split('.')[0]}"
+                children.setdefault(child, []).append(submodule)
+        value = self._module_value(modules, package, emitted)
+        if not children:
+            return value
+        items = [f"{child.rsplit('.', 1)[1]}: {self._namespace(modules, child, subs, emitted)}"
+                 for child, subs in children.items()]
+        if package in emitted:
+            items.insert(0, f"...{value}")
+        return f"{{{', '.join(items)}}}"
+
+    def build(self, entry: str) -> Bundle:
+        """Monta o projeto a partir do arquivo de entrada"""
+        modules, order, external = self.graph(entry)
+        entry_name = order[-1]
+        transpiled, cached = self.transpile(modules)
+
+        before = self.link(modules, order, entry_name, *self.shake(modules, entry_name, shake=False))
+        kept, requested = self.shake(modules, entry_name)
+        code = self.link(modules, order, entry_name, kept, requested)
+
+        removed = sorted(f"{name}.{definition}" for name, module in modules.items()
+                         for definition, index in module.definitions.items()
+                         if index not in kept[name])
+        return Bundle(code, order, transpiled, cached, len(before.encode('utf-8')),
+                      len(code.encode('utf-8')), removed, external)
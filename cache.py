@@ -0,0 +1,282 @@
+"""
+Cache endereçado por conteúdo para o transpilador Python → JavaScript.
+
+A chave de cada entrada é o hash SHA-256 do código Python junto com as
+opções do transpilador, de modo que um acerto devolve o JavaScript já
+gerado sem executar ``ast.parse`` nem percorrer a AST.
+
+Dois backends estão disponíveis:
+
+- ``MemoryBackend``: LRU em memória, local ao processo;
+- ``SQLiteBackend``: arquivo SQLite compartilhado entre processos
+  (por exemplo, vários workers do servidor web).
+
+Ambos aplicam limite de entradas (LRU) e tempo de vida (TTL) e mantêm
+contadores de acertos, faltas e remoções.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import transpiler
+
+# Módulos cujo código determina o JavaScript gerado (e o que o bundle guarda
+# no cache); mudar qualquer um deles invalida o cache, os ETags do /transpile
+# e o manifesto do modo em lote
+EMISSION_MODULES = ('transpiler', 'runtime', 'optimizer', 'minifier', 'literals', 'shapes', 'bundle')
+
+
+def _versao_transpilador(directory: str = os.path.dirname(os.path.abspath(__file__))) -> str:
+    """Hash do código-fonte dos módulos de emissão, para invalidar o cache quando mudam"""
+    digest = hashlib.sha256()
+    for name in EMISSION_MODULES:
+        digest.update(name.encode('ascii') + b'\0')
+        with open(os.path.join(directory, name + '.py'), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+TRANSPILER_VERSION = _versao_transpilador()
+
+
+def make_key(python_code: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Gera a chave do cache a partir do código e das opções do transpilador"""
+    digest = hashlib.sha256()
+    digest.update(TRANSPILER_VERSION.encode('ascii'))
+    digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(python_code.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class MemoryBackend:
+    """Backend LRU em memória, protegido por lock para uso entre threads"""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if self.ttl is None or time.time() - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._counters['evictions'] += 1
+            self._counters['misses'] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
+
+
+class SQLiteBackend:
+    """
+    Backend em arquivo SQLite, compartilhado entre processos.
+
+    Um acerto é só um SELECT: o horário de acesso (usado na remoção LRU) e
+    os contadores ficam na memória do processo e são gravados junto com o
+    próximo ``set``, em ``stats``/``clear`` ou, sem escritas, a cada
+    FLUSH_INTERVAL segundos. Assim os workers que compartilham o arquivo não
+    disputam o lock de escrita do SQLite para ler.
+    """
+
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, path: str, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._reset_pending()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                [('hits',), ('misses',), ('evictions',)],
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _increment(self, conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def _reset_pending(self) -> None:
+        self._accessed: Dict[str, float] = {}
+        self._counts = {'hits': 0, 'misses': 0}
+        self._last_flush = time.monotonic()
+        self._pending_pid = os.getpid()
+
+    def _record(self, name: str, key: Optional[str] = None, now: Optional[float] = None) -> None:
+        """Conta um acerto ou falta (e o acesso a ``key``) para a próxima gravação"""
+        with self._pending_lock:
+            if self._pending_pid != os.getpid():
+                # Pendências herdadas do processo pai no fork já são dele
+                self._reset_pending()
+            self._counts[name] += 1
+            if key is not None:
+                self._accessed[key] = now
+            due = time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL
+        if due:
+            with self._connect() as conn:
+                self._flush(conn)
+
+    def _flush(self, conn: sqlite3.Connection) -> None:
+        """Grava na transação de ``conn`` os acessos e contadores pendentes"""
+        with self._pending_lock:
+            if self._pending_pid != os.getpid():
+                self._reset_pending()
+            accessed, counts = self._accessed, self._counts
+            self._accessed = {}
+            self._counts = {'hits': 0, 'misses': 0}
+            self._last_flush = time.monotonic()
+        if accessed:
+            conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                             [(now, key) for key, now in accessed.items()])
+        for name, amount in counts.items():
+            if amount:
+                self._increment(conn, name, amount)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, created FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            value, created = row
+            if self.ttl is None or now - created < self.ttl:
+                self._record('hits', key, now)
+                return value
+            with conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._increment(conn, 'evictions')
+        self._record('misses')
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            # Acessos pendentes antes de escolher as entradas menos usadas
+            self._flush(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+                self._increment(conn, 'evictions', excess)
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            self._flush(conn)
+            conn.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        with conn:
+            self._flush(conn)
+        stats = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        stats['size'] = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return stats
+
+
+class TranspileCache:
+    """Cache posicionado na frente de ``transpile_python_to_js``"""
+
+    def __init__(self, backend=None, profiler=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        # TranspileProfile opcional que recebe as métricas das faltas do cache
+        self.profiler = profiler
+
+    def transpile(self, python_code: str, **options) -> str:
+        """Devolve o JavaScript do cache ou transpila e armazena o resultado"""
+        key = make_key(python_code, options)
+        js_code = self.backend.get(key)
+        if js_code is None:
+            if self.profiler is not None:
+                options = dict(options, profiler=self.profiler)
+            js_code = transpiler.transpile_python_to_js(python_code, **options)
+            self.backend.set(key, js_code)
+        return js_code
+
+    def lookup(self, python_code: str, **options) -> Optional[str]:
+        """Devolve o JavaScript em cache, ou None, sem transpilar"""
+        return self.backend.get(make_key(python_code, options))
+
+    def store(self, python_code: str, js_code: str, **options) -> None:
+        """Armazena um resultado transpilado fora do cache (por exemplo, em outro processo)"""
+        self.backend.set(make_key(python_code, options), js_code)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de acertos, faltas, remoções e tamanho atual"""
+        return self.backend.stats()
+
+
+def cache_from_env() -> TranspileCache:
+    """
+    Cria o cache a partir de variáveis de ambiente:
+
+    - TRANSPILER_CACHE_PATH: arquivo SQLite compartilhado (padrão: memória)
+    - TRANSPILER_CACHE_SIZE: número máximo de entradas (padrão: 1024)
+    - TRANSPILER_CACHE_TTL: tempo de vida em segundos, 0 = sem expiração (padrão: 3600)
+    """
+    max_entries = int(os.environ.get('TRANSPILER_CACHE_SIZE', 1024))
+    ttl = float(os.environ.get('TRANSPILER_CACHE_TTL', 3600)) or None
+    path = os.environ.get('TRANSPILER_CACHE_PATH')
+
+    if path:
+        return TranspileCache(SQLiteBackend(path, max_entries=max_entries, ttl=ttl))
+    return TranspileCache(MemoryBackend(max_entries=max_entries, ttl=ttl))
@@ -0,0 +1,261 @@
+"""
+Interface de linha de comando do transpilador Python → JavaScript.
+
+Uso:
+    python transpiler.py entrada.py saida.js [--watch] [--profile [perfil.json]] [-O] [-j 8]
+    python transpiler.py src/ "lib/**/*.py" @lista.txt -o build/ [-j 8] [--force]
+    python transpiler.py entrada.py saida.js --passes fold_constants,native_pow
+    python transpiler.py entrada.py saida.min.js --minify
+    python transpiler.py dados.py dados.js --json-parse 10000
+    python transpiler.py app/main.py app.mjs --bundle [-j 8] [--minify]
+
+Com o daemon (``python daemon.py start``) rodando, o modo de arquivo único
+envia o código a ele em vez de transpilar no próprio processo.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import daemon
+from optimizer import PASSES, resolve_passes
+from transpiler import PythonToJSTranspiler, transpile_iter, transpile_python_to_js
+
+BUNDLE_CACHE = '.transpile-bundle-cache.sqlite'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='transpiler.py',
+        description='Transpilador Python → JavaScript',
+        fromfile_prefix_chars='@',
+        epilog='Argumentos iniciados com @ são lidos de um arquivo (um por linha).',
+    )
+    parser.add_argument('paths', nargs='+', metavar='ARQUIVO',
+                        help='entrada.py saida.js, ou, com -o, arquivos, diretórios e globs')
+    parser.add_argument('-o', '--output-dir', metavar='DIR',
+                        help='modo em lote: espelha as entradas neste diretório')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='processos do modo em lote (padrão: número de núcleos); no modo de '
+                             'arquivo único, transpila o módulo em paralelo')
+    parser.add_argument('--force', action='store_true',
+                        help='ignora o manifesto e transpila todos os arquivos')
+    parser.add_argument('--watch', action='store_true',
+                        help='observa entrada.py e retranspila de forma incremental a cada alteração')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='ARQUIVO',
+                        help='grava métricas por visitante em JSON (padrão: saída padrão)')
+    parser.add_argument('-O', '--optimize', action='store_true',
+                        help='aplica todos os passes de otimização antes da emissão')
+    parser.add_argument('--passes', metavar='LISTA',
+                        help=f"passes de otimização separados por vírgula: {', '.join(PASSES)}")
+    parser.add_argument('--minify', action='store_true',
+                        help='saída compacta: sem indentação nem quebras de linha, locais renomeadas')
+    parser.add_argument('--json-parse', type=int, metavar='BYTES',
+                        help="emite listas/dicionários só de constantes com JSON a partir de BYTES "
+                             "como JSON.parse('...')")
+    parser.add_argument('--bundle', action='store_true',
+                        help='modo projeto: segue as importações de entrada.py e gera um único '
+                             'módulo ES, sem as funções e classes não usadas')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='transpila no próprio processo mesmo com o daemon (daemon.py) rodando')
+    return parser
+
+
+def transpiler_options(args: argparse.Namespace) -> dict:
+    """Opções do transpilador correspondentes a -O/--passes/--minify/--json-parse"""
+    options = {}
+    if args.passes:
+        options['optimize'] = args.passes
+    elif args.optimize:
+        options['optimize'] = True
+    if args.minify:
+        options['minify'] = True
+    if args.json_parse:
+        options['json_parse_min'] = args.json_parse
+    return options
+
+
+def transpile_via_daemon(python_code: str, **options) -> Optional[dict]:
+    """Resposta do daemon (daemon.py), ou None se nenhum estiver rodando"""
+    if daemon.unreachable_socket == daemon.default_socket_path():
+        # daemon.run_client já tentou conectar nesta execução
+        return None
+    try:
+        return daemon.transpile(python_code, **options)
+    except daemon.DaemonUnavailable:
+        return None
+
+
+def transpile_single(input_file: str, output_file: str, use_daemon: bool = True,
+                     jobs: Optional[int] = None, **options) -> int:
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            python_code = f.read()
+
+        response = None
+        if jobs is not None and jobs > 1:
+            from parallel import transpile_parallel
+            response = {'js_code': transpile_parallel(python_code, jobs=jobs, **options)}
+        elif use_daemon:
+            response = transpile_via_daemon(python_code, **options)
+        if response is not None:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(response['js_code'])
+            size = len(response['js_code'].encode('utf-8'))
+        else:
+            # Grava cada parte assim que é gerada, sem montar a saída inteira
+            size = 0
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for chunk in transpile_iter(python_code, **options):
+                    f.write(chunk)
+                    size += len(chunk.encode('utf-8'))
+
+        saved = response.get('saved_bytes') if response is not None else None
+        if saved is None and options.get('minify'):
+            pretty = transpile_python_to_js(python_code, **dict(options, minify=False))
+            saved = len(pretty.encode('utf-8')) - size
+
+        print(f"Código transpilado com sucesso: {input_file} -> {output_file}")
+        if saved is not None:
+            print(f"Modo compacto: {size} bytes ({saved} bytes economizados)")
+
+    except FileNotFoundError:
+        print(f"Arquivo não encontrado: {input_file}")
+    except Exception as e:
+        print(f"Erro: {e}")
+    return 0
+
+
+def transpile_profiled(input_file: str, output_file: str, profile_file: str, **options) -> int:
+    """Transpila com instrumentação e grava as métricas em JSON"""
+    from profiling import TranspileProfile
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        python_code = f.read()
+
+    profile = TranspileProfile()
+    js_code = PythonToJSTranspiler(profiler=profile, **options).transpile(python_code)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(js_code)
+
+    if profile_file == '-':
+        print(profile.to_json())
+    else:
+        with open(profile_file, 'w', encoding='utf-8') as f:
+            f.write(profile.to_json())
+        print(f"Perfil gravado em {profile_file}")
+    return 0
+
+
+def watch_single(input_file: str, output_file: str, interval: float = 0.2, **options) -> int:
+    """Retranspila ``input_file`` a cada alteração, reemitindo só os statements modificados"""
+    from incremental import IncrementalTranspiler
+
+    incremental = IncrementalTranspiler(PythonToJSTranspiler(**options))
+    last_mtime = None
+    print(f"Observando {input_file} (Ctrl+C para sair)")
+
+    try:
+        while True:
+            try:
+                mtime = os.stat(input_file).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if mtime is not None and mtime != last_mtime:
+                last_mtime = mtime
+                with open(input_file, 'r', encoding='utf-8') as f:
+                    python_code = f.read()
+
+                start = time.perf_counter()
+                js_code = incremental.transpile(python_code)
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(js_code)
+
+                stats = incremental.stats
+                print(f"{time.strftime('%H:%M:%S')} {output_file} atualizado em "
+                      f"{(time.perf_counter() - start) * 1000:.1f} ms "
+                      f"({stats['emitted']} reemitido(s), {stats['reused']} reaproveitado(s))")
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def bundle_project(input_file: str, output_file: str, jobs: Optional[int] = None, **options) -> int:
+    """Empacota o projeto de ``input_file``; o cache por módulo fica ao lado da saída"""
+    from bundle import BundleError, Bundler
+    from cache import SQLiteBackend, TranspileCache
+
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(output_file)), BUNDLE_CACHE)
+    bundler = Bundler(jobs=jobs, cache=TranspileCache(SQLiteBackend(cache_path, ttl=None)), **options)
+    try:
+        result = bundler.build(input_file)
+    except BundleError as e:
+        print(f"Erro: {e}")
+        return 1
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(result.code)
+
+    print(f"Projeto empacotado: {input_file} -> {output_file} ({len(result.modules)} módulo(s), "
+          f"{len(result.transpiled)} transpilado(s), {len(result.cached)} do cache)")
+    print(f"Tree shaking: {result.size_before} -> {result.size_after} bytes "
+          f"({len(result.removed)} definição(ões) removida(s))")
+    if result.external:
+        print(f"Importações externas não incluídas: {', '.join(result.external)}")
+    return 0
+
+
+def transpile_batch(args: argparse.Namespace) -> int:
+    from batch import print_summary, run_batch
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(args.paths, args.output_dir, jobs=args.jobs, force=args.force,
+                            options=transpiler_options(args))
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 1
+    print_summary(results, time.perf_counter() - start)
+    return 1 if any(r.error for r in results) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        resolve_passes(args.passes)
+    except ValueError as e:
+        parser.error(str(e))
+    options = transpiler_options(args)
+
+    if args.output_dir:
+        if args.bundle:
+            parser.error("--bundle gera um único arquivo: use entrada.py saida.mjs")
+        if args.profile:
+            parser.error("--profile está disponível apenas no modo de arquivo único")
+        return transpile_batch(args)
+
+    if len(args.paths) != 2:
+        print("Uso: python transpiler.py input.py output.js")
+        print("     python transpiler.py ARQUIVOS... -o DIRETORIO   (modo em lote)")
+        return 1
+
+    if args.bundle:
+        if args.watch or args.profile:
+            parser.error("--bundle não pode ser combinado com --watch nem --profile")
+        return bundle_project(*args.paths, jobs=args.jobs, **options)
+
+    if args.watch:
+        return watch_single(*args.paths, **options)
+
+    if args.profile:
+        return transpile_profiled(*args.paths, args.profile, **options)
+
+    return transpile_single(*args.paths, use_daemon=not args.no_daemon, jobs=args.jobs, **options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Daemon local do transpilador, acessível por um socket de domínio Unix.
+
+O daemon mantém o transpilador importado e o cache de transpilação quente
+entre as chamadas da linha de comando, do plugin do editor e do hook de
+pre-commit. A CLI (``python transpiler.py entrada.py saida.js``) usa o
+daemon automaticamente quando ele está rodando e transpila no próprio
+processo quando não está.
+
+Protocolo: uma mensagem JSON por linha em cada sentido.
+
+    {"command": "transpile", "python_code": "...", "options": {"minify": true}}
+    -> {"success": true, "js_code": "...", "saved_bytes": 123}
+    {"command": "status"} -> {"success": true, "pid": ..., "requests": ..., "cache": {...}}
+    {"command": "stop"}   -> {"success": true}
+
+O daemon encerra sozinho depois de ``--idle-timeout`` segundos sem
+requisições. O servidor fica em daemon_server.py; este módulo é o lado
+cliente, importado pela linha de comando em toda chamada, e por isso só usa
+``json``, ``os``, ``socket`` e ``sys`` no nível do módulo (``run_client``
+transpila pelo daemon antes de qualquer parte do transpilador ser
+importada).
+
+Uso:
+    python daemon.py start [--socket CAMINHO] [--idle-timeout 900] [--foreground]
+    python daemon.py status
+    python daemon.py stop
+
+Variáveis de ambiente:
+    TRANSPILER_DAEMON_SOCKET   caminho do socket (padrão: transpiler-<uid>.sock
+                               em $XDG_RUNTIME_DIR ou transpiler-<uid>/daemon.sock,
+                               diretório 0700, no diretório temporário)
+
+O cliente só conecta a um socket que pertence ao próprio usuário; em um
+diretório compartilhado, outro usuário poderia criar o socket antes e
+responder com o JavaScript que quisesse.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+
+# Sem ``typing``: as anotações abaixo ficam em strings e não são avaliadas
+
+DEFAULT_IDLE_TIMEOUT = 900
+CONNECT_TIMEOUT = 0.5
+POLL_INTERVAL = 0.5
+
+
+# Socket em que run_client não achou daemon: a CLI completa, chamada em
+# seguida no mesmo processo, não tenta conectar de novo
+unreachable_socket: 'Optional[str]' = None
+
+
+class DaemonUnavailable(Exception):
+    """Nenhum daemon (do próprio usuário) respondendo no socket"""
+
+
+def default_socket_path() -> str:
+    path = os.environ.get('TRANSPILER_DAEMON_SOCKET')
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    directory = os.environ.get('XDG_RUNTIME_DIR')
+    if directory:
+        return os.path.join(directory, f"transpiler-{uid}.sock")
+    # O diretório temporário é de todos: o socket fica em um subdiretório
+    # privado, criado pelo daemon (daemon_server.py)
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"transpiler-{uid}", "daemon.sock")
+
+
+def check_socket_owner(path: str) -> None:
+    """Levanta DaemonUnavailable se ``path`` não for um socket do usuário atual"""
+    if not hasattr(os, 'getuid'):
+        return
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError as e:
+        raise DaemonUnavailable(f"daemon não está rodando em {path}") from e
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise DaemonUnavailable(f"{path} não é um socket do usuário atual")
+
+
+def request(message: dict, socket_path: 'Optional[str]' = None,
+            timeout: 'Optional[float]' = None) -> dict:
+    """
+    Envia uma mensagem ao daemon e devolve a resposta.
+
+    Levanta DaemonUnavailable se não há daemon escutando no socket.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise DaemonUnavailable("sockets Unix não são suportados nesta plataforma")
+    path = socket_path or default_socket_path()
+    check_socket_owner(path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+            raise DaemonUnavailable(f"daemon não está rodando em {path}") from e
+        sock.settimeout(timeout)
+        with sock.makefile('rwb') as stream:
+            stream.write(json.dumps(message).encode('utf-8') + b'\n')
+            stream.flush()
+            line = stream.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise DaemonUnavailable(f"o daemon em {path} encerrou a conexão")
+    return json.loads(line)
+
+
+def transpile(python_code: str, socket_path: 'Optional[str]' = None, **options) -> dict:
+    """Transpila pelo daemon; a resposta traz ``js_code`` (e ``saved_bytes`` com minify)"""
+    response = request({'command': 'transpile', 'python_code': python_code, 'options': options},
+                       socket_path)
+    if not response.get('success'):
+        raise RuntimeError(response.get('error', 'erro desconhecido no daemon'))
+    return response
+
+
+def is_running(socket_path: 'Optional[str]' = None) -> bool:
+    try:
+        request({'command': 'status'}, socket_path, timeout=CONNECT_TIMEOUT)
+    except (DaemonUnavailable, OSError, ValueError):
+        return False
+    return True
+
+
+# Opções da CLI entendidas por run_client -> (opção do transpilador, recebe valor)
+CLIENT_OPTIONS = {
+    '-O': ('optimize', False),
+    '--optimize': ('optimize', False),
+    '--passes': ('passes', True),
+    '--minify': ('minify', False),
+    '--json-parse': ('json_parse_min', True),
+}
+
+
+def client_options(argv: list) -> 'Optional[tuple]':
+    """
+    ``(entrada, saída, opções)`` de ``transpiler.py entrada.py saida.js
+    [-O] [--passes LISTA] [--minify] [--json-parse BYTES]``, ou None para
+    qualquer outra linha de comando (lote, --watch, -j, @arquivo, ...).
+    """
+    paths = []
+    flags = {}
+    args = iter(argv)
+    for arg in args:
+        if not arg.startswith(('-', '@')):
+            paths.append(arg)
+            continue
+        name, _, value = arg.partition('=')
+        if name not in CLIENT_OPTIONS:
+            return None
+        option, takes_value = CLIENT_OPTIONS[name]
+        if takes_value and not value:
+            value = next(args, None)
+            if value is None:
+                return None
+        flags[option] = value if takes_value else True
+    if len(paths) != 2:
+        return None
+
+    # Mesma forma das opções montadas pela CLI (cli.transpiler_options)
+    options = {}
+    if flags.get('passes'):
+        options['optimize'] = flags['passes']
+    elif flags.get('optimize'):
+        options['optimize'] = True
+    if flags.get('minify'):
+        options['minify'] = True
+    if flags.get('json_parse_min'):
+        if not flags['json_parse_min'].isdigit():
+            return None
+        options['json_parse_min'] = int(flags['json_parse_min'])
+    return paths[0], paths[1], options
+
+
+def run_client(argv: list, socket_path: 'Optional[str]' = None) -> 'Optional[int]':
+    """
+    Caminho rápido da linha de comando: transpila ``entrada.py saida.js``
+    pelo daemon e devolve o código de saída.
+
+    Devolve None (e a CLI completa assume, importando o transpilador) quando
+    a linha de comando não é um arquivo único simples, os arquivos não podem
+    ser lidos ou gravados (a CLI informa o erro), o daemon não está rodando
+    (a CLI não tenta conectar de novo) ou responde com erro.
+    """
+    global unreachable_socket
+    parsed = client_options(argv)
+    if parsed is None:
+        return None
+    input_file, output_file, options = parsed
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            python_code = f.read()
+        response = transpile(python_code, socket_path, **options)
+        js_code = response['js_code']
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(js_code)
+    except DaemonUnavailable:
+        unreachable_socket = socket_path or default_socket_path()
+        return None
+    except (OSError, ValueError, RuntimeError):
+        return None
+    print(f"Código transpilado com sucesso: {input_file} -> {output_file}")
+    if response.get('saved_bytes') is not None:
+        print(f"Modo compacto: {len(js_code.encode('utf-8'))} bytes "
+              f"({response['saved_bytes']} bytes economizados)")
+    return 0
+
+
+def start(socket_path: str, idle_timeout: float, wait: float = 10.0) -> int:
+    """Inicia o daemon em segundo plano e espera ele responder"""
+    import subprocess
+    import time
+
+    if is_running(socket_path):
+        print(f"Daemon já está rodando em {socket_path}")
+        return 0
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'start', '--foreground',
+         '--socket', socket_path, '--idle-timeout', str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, close_fds=True,
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            print(f"Daemon iniciado em {socket_path}")
+            return 0
+        time.sleep(0.05)
+    print(f"Erro: o daemon não respondeu em {wait:.0f}s")
+    return 1
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('command', choices=('start', 'status', 'stop'))
+    parser.add_argument('--socket', default=None, metavar='CAMINHO',
+                        help='caminho do socket (padrão: TRANSPILER_DAEMON_SOCKET ou diretório temporário)')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='segundos sem requisições até encerrar (0 = nunca; padrão: %(default)s)')
+    parser.add_argument('--foreground', action='store_true',
+                        help='roda no processo atual em vez de em segundo plano')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    socket_path = args.socket or default_socket_path()
+
+    if args.command == 'start':
+        if not args.foreground:
+            return start(socket_path, args.idle_timeout)
+        from daemon_server import TranspilerDaemon
+        TranspilerDaemon(socket_path, args.idle_timeout).serve()
+        return 0
+
+    try:
+        response = request({'command': args.command}, socket_path, timeout=5)
+    except DaemonUnavailable as e:
+        print(f"Daemon não está rodando ({e})")
+        return 1
+
+    if args.command == 'status':
+        print(json.dumps(response, indent=2))
+    else:
+        print(f"Daemon em {socket_path} encerrado")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
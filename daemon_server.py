@@ -0,0 +1,143 @@
+"""
+Servidor do daemon do transpilador (ver daemon.py, que tem o protocolo e o
+lado cliente).
+
+Fica em um módulo separado para que o cliente, importado pela linha de
+comando em toda chamada, não carregue ``socketserver`` nem o transpilador.
+"""
+
+import json
+import os
+import socketserver
+import threading
+import time
+
+from cache import cache_from_env
+from daemon import DEFAULT_IDLE_TIMEOUT, POLL_INTERVAL, is_running
+from transpiler import transpile_python_to_js
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Atende as mensagens de uma conexão, uma por linha"""
+
+    def handle(self):
+        server = self.server
+        with server.activity():
+            for line in self.rfile:
+                try:
+                    response = server.dispatch(json.loads(line))
+                except Exception as e:
+                    response = {'success': False, 'error': str(e)}
+                self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+                self.wfile.flush()
+
+
+# Sem sockets Unix (Windows) o cliente sempre cai no modo local
+_UnixStreamServer = getattr(socketserver, 'UnixStreamServer', socketserver.TCPServer)
+
+
+class TranspilerDaemon(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """Servidor do daemon: uma thread por conexão, cache compartilhado"""
+
+    daemon_threads = True
+    timeout = POLL_INTERVAL
+
+    def __init__(self, socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.cache = cache_from_env()
+        self.started = time.time()
+        self.last_activity = time.monotonic()
+        self.requests = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._stopping = False
+
+        # Aquece o transpilador antes da primeira requisição
+        transpile_python_to_js("def f(x):\n    return x\n")
+
+        # Diretório privado do socket padrão (ver daemon.default_socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+        _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def activity(self) -> 'TranspilerDaemon':
+        """Uso: ``with server.activity(): ...`` marca uma conexão em andamento"""
+        return self
+
+    def __enter__(self):
+        with self._lock:
+            self._active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self._active -= 1
+            self.last_activity = time.monotonic()
+
+    def dispatch(self, message: dict) -> dict:
+        command = message.get('command')
+        with self._lock:
+            self.requests += 1
+            self.last_activity = time.monotonic()
+
+        if command == 'transpile':
+            options = message.get('options') or {}
+            js_code = self.cache.transpile(message.get('python_code', ''), **options)
+            response = {'success': True, 'js_code': js_code}
+            if options.get('minify'):
+                # Mesmas opções sem minify: reaproveita a saída formatada em cache
+                pretty_options = {k: v for k, v in options.items() if k != 'minify'}
+                pretty = self.cache.transpile(message.get('python_code', ''), **pretty_options)
+                response['saved_bytes'] = len(pretty.encode('utf-8')) - len(js_code.encode('utf-8'))
+            return response
+        if command == 'status':
+            return {'success': True, **self.status()}
+        if command == 'stop':
+            self._stopping = True
+            return {'success': True}
+        return {'success': False, 'error': f"Comando desconhecido: {command}"}
+
+    def status(self) -> dict:
+        with self._lock:
+            idle = time.monotonic() - self.last_activity
+            return {
+                'pid': os.getpid(),
+                'socket': self.socket_path,
+                'uptime_seconds': round(time.time() - self.started, 3),
+                'idle_seconds': round(idle, 3),
+                'idle_timeout': self.idle_timeout,
+                'requests': self.requests,
+                'active_connections': self._active,
+                'cache': self.cache.stats(),
+            }
+
+    def _idle(self) -> bool:
+        with self._lock:
+            return (self.idle_timeout > 0 and not self._active
+                    and time.monotonic() - self.last_activity > self.idle_timeout)
+
+    def serve(self) -> None:
+        """Atende conexões até receber ``stop`` ou ficar ocioso por idle_timeout"""
+        try:
+            while not self._stopping and not self._idle():
+                self.handle_request()
+        finally:
+            self.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove o arquivo do socket de um daemon que não está mais rodando"""
+    if not os.path.exists(path):
+        return
+    if is_running(path):
+        raise RuntimeError(f"Já existe um daemon rodando em {path}")
+    os.unlink(path)
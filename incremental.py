@@ -0,0 +1,143 @@
+"""
+Transpilação incremental por statement de nível superior.
+
+``IncrementalTranspiler`` guarda o JavaScript de cada statement de nível
+superior (função, classe ou statement simples) do último código
+transpilado. A cada nova versão do código:
+
+1. as linhas iniciais e finais que não mudaram são localizadas;
+2. apenas o trecho alterado, expandido até os limites dos statements que
+   ele toca, é analisado com ``PythonToJSTranspiler.parse`` e reemitido;
+3. os statements antes e depois do trecho reaproveitam o JavaScript
+   anterior.
+
+Quando o trecho alterado não pode ser analisado isoladamente (por exemplo,
+uma linha indentada acrescentada ao corpo da função anterior), o módulo
+inteiro é analisado de novo; mesmo assim, statements cujo código-fonte não
+mudou reaproveitam o JavaScript do cache, indexado pelo texto do statement.
+
+Com ``cancelled``, a transpilação é interrompida entre dois statements
+quando a função devolve True (por exemplo, porque chegou uma versão mais
+nova do código); o estado anterior é mantido.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from runtime import with_runtime
+from transpiler import SYNTAX_ERROR_PREFIX, PythonToJSTranspiler
+
+
+class TranspileCancelled(Exception):
+    """Transpilação interrompida por ``cancelled``"""
+
+
+class _Unit:
+    """Statement de nível superior: intervalo de linhas [start, end) e JavaScript"""
+
+    __slots__ = ('start', 'end', 'key', 'js')
+
+    def __init__(self, start: int, end: int, key: Tuple[str, int], js: str):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.js = js
+
+
+class IncrementalTranspiler:
+    """Retranspila apenas os statements de nível superior que mudaram"""
+
+    def __init__(self, transpiler: Optional[PythonToJSTranspiler] = None):
+        self.transpiler = transpiler if transpiler is not None else PythonToJSTranspiler()
+        self._lines: List[str] = []
+        self._units: List[_Unit] = []
+        self._output: Optional[str] = None
+        self.stats = {'reused': 0, 'emitted': 0, 'full_parse': False}
+        self._cancelled: Optional[Callable[[], bool]] = None
+
+    def transpile(self, python_code: str, cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """
+        Transpila a nova versão do código reaproveitando o que não mudou.
+
+        Levanta TranspileCancelled se ``cancelled()`` devolver True no meio
+        do trabalho.
+        """
+        lines = python_code.splitlines(keepends=True)
+        self.stats = {'reused': 0, 'emitted': 0, 'full_parse': False}
+
+        if self._output is not None and lines == self._lines:
+            self.stats['reused'] = len(self._units)
+            return self._output
+
+        self._cancelled = cancelled
+        try:
+            units = self._update(lines)
+        except SyntaxError as e:
+            return f"{SYNTAX_ERROR_PREFIX} {e}"
+        finally:
+            self._cancelled = None
+
+        self._lines = lines
+        self._units = units
+        js_code = self.transpiler.writer_class.NEWLINE.join(unit.js for unit in units if unit.js)
+        self._output = with_runtime(js_code, self.transpiler.minify)
+        return self._output
+
+    def _update(self, lines: List[str]) -> List[_Unit]:
+        old_lines, old_units = self._lines, self._units
+        cache = {unit.key: unit.js for unit in old_units}
+        if self._output is None:
+            return self._parse(lines, 0, len(lines), cache)
+
+        # Linhas iguais no início e no fim das duas versões
+        limit = min(len(old_lines), len(lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+
+        # Expande o trecho alterado até os limites dos statements afetados
+        changed_end = len(old_lines) - suffix
+        region_start, region_end = prefix, changed_end
+        for unit in old_units:
+            if unit.start < max(changed_end, prefix + 1) and unit.end > prefix:
+                region_start = min(region_start, unit.start)
+                region_end = max(region_end, unit.end)
+
+        delta = len(lines) - len(old_lines)
+        try:
+            middle = self._parse(lines, region_start, region_end + delta, cache)
+        except SyntaxError:
+            self.stats = {'reused': 0, 'emitted': 0, 'full_parse': True}
+            return self._parse(lines, 0, len(lines), cache)
+
+        head = [unit for unit in old_units if unit.end <= region_start]
+        tail = [
+            _Unit(unit.start + delta, unit.end + delta, unit.key, unit.js)
+            for unit in old_units if unit.start >= region_end
+        ]
+        self.stats['reused'] += len(head) + len(tail)
+        return head + middle + tail
+
+    def _parse(self, lines: List[str], start: int, end: int,
+               cache: Dict[Tuple[str, int], str]) -> List[_Unit]:
+        """Analisa as linhas [start, end) e emite seus statements de nível superior"""
+        tree = self.transpiler.parse("".join(lines[start:end]))
+        units = []
+        for stmt in tree.body:
+            first = min([stmt.lineno] + [d.lineno for d in getattr(stmt, 'decorator_list', [])])
+            unit_start = start + first - 1
+            unit_end = start + stmt.end_lineno
+            key = ("".join(lines[unit_start:unit_end]), stmt.col_offset)
+
+            js = cache.get(key)
+            if js is None:
+                if self._cancelled is not None and self._cancelled():
+                    raise TranspileCancelled()
+                js = self.transpiler.emit_statement(stmt)
+                self.stats['emitted'] += 1
+            else:
+                self.stats['reused'] += 1
+            units.append(_Unit(unit_start, unit_end, key, js))
+        return units
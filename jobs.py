@@ -0,0 +1,301 @@
+"""
+Fila assíncrona de transpilação para códigos muito grandes.
+
+O cliente envia o código e recebe imediatamente o id do job; a
+transpilação roda em um pool de processos em segundo plano e o resultado
+é consultado (ou aguardado com long-poll) pelo id.
+
+- A fila é limitada: com ``max_pending`` jobs na fila ou em execução,
+  ``submit`` levanta ``QueueFull`` (o endpoint responde 429).
+- Resultados expiram ``ttl`` segundos após a conclusão.
+- Cada job tem um prazo de ``timeout`` segundos: vencido, ele é marcado como
+  falho e libera sua vaga na fila; no processo do pool a transpilação é
+  interrompida pelo mesmo limite de tempo de CPU.
+- Se um processo do pool morrer (falta de memória, crash), o pool é recriado
+  no envio seguinte.
+- O estado dos jobs fica em um ``MemoryJobStore`` (local ao processo) ou em
+  um ``FileJobStore`` (diretório local), que permite consultar o job a
+  partir de qualquer worker do servidor.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from transpiler import transpile_python_to_js
+
+FINAL_STATUSES = ('done', 'failed')
+TIMEOUT_MESSAGE = "Tempo limite do job excedido"
+
+
+class QueueFull(Exception):
+    """A fila atingiu o limite de jobs pendentes"""
+
+
+def transpile_job(python_code: str, seconds: Optional[float] = None) -> str:
+    """Transpila no processo do pool, interrompido após ``seconds`` de CPU"""
+    if not seconds or not hasattr(signal, 'setitimer'):
+        return transpile_python_to_js(python_code)
+
+    def on_timeout(signum, frame):
+        raise TimeoutError(TIMEOUT_MESSAGE)
+
+    previous = signal.signal(signal.SIGPROF, on_timeout)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        return transpile_python_to_js(python_code)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+
+class MemoryJobStore:
+    """Estado dos jobs em memória, local ao processo"""
+
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job['job_id']] = dict(job)
+
+    def load(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def delete_expired(self, ttl: float) -> None:
+        limit = time.time() - ttl
+        with self._lock:
+            for job_id in [j for j, job in self._jobs.items()
+                           if job.get('finished') and job['finished'] < limit]:
+                del self._jobs[job_id]
+
+
+class FileJobStore:
+    """Estado dos jobs em arquivos JSON, compartilhado entre processos"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def save(self, job: dict) -> None:
+        path = self._path(job['job_id'])
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def load(self, job_id: str) -> Optional[dict]:
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def delete_expired(self, ttl: float) -> None:
+        limit = time.time() - ttl
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            job = self.load(name[:-len('.json')])
+            if job is not None and job.get('finished') and job['finished'] < limit:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+class JobQueue:
+    """Fila limitada de jobs de transpilação executados em um pool de processos"""
+
+    PURGE_INTERVAL = 5.0
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, ttl: float = 600,
+                 store=None, on_result: Optional[Callable[[str, str], None]] = None,
+                 timeout: Optional[float] = 60):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.timeout = timeout
+        self.store = store if store is not None else MemoryJobStore()
+        self.on_result = on_result
+        self._executor = None
+        self._events: Dict[str, threading.Event] = {}
+        # Jobs na fila ou em execução -> temporizador do prazo (None sem prazo)
+        self._running: Dict[str, Optional[threading.Timer]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Descarta um pool quebrado; o próximo envio cria outro"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, python_code: str) -> Future:
+        executor = self._get_executor()
+        try:
+            return executor.submit(transpile_job, python_code, self.timeout)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            return self._get_executor().submit(transpile_job, python_code, self.timeout)
+
+    def submit(self, python_code: str) -> dict:
+        """Enfileira o código e devolve o job; levanta QueueFull se a fila estiver cheia"""
+        self._purge()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"Fila cheia ({self.max_pending} jobs pendentes)")
+            self._pending += 1
+
+        job = {'job_id': uuid.uuid4().hex, 'status': 'queued',
+               'created': time.time(), 'finished': None}
+        self.store.save(job)
+        self._events[job['job_id']] = threading.Event()
+
+        try:
+            future = self._start(python_code)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        timer = None
+        if self.timeout:
+            timer = threading.Timer(self.timeout, self._expire, (job, future))
+            timer.daemon = True
+        with self._lock:
+            self._running[job['job_id']] = timer
+        if timer is not None:
+            timer.start()
+        future.add_done_callback(lambda f: self._finish(job, python_code, f))
+        return job
+
+    def complete(self, js_code: str) -> dict:
+        """Registra um job já concluído (por exemplo, resultado vindo do cache)"""
+        now = time.time()
+        job = {'job_id': uuid.uuid4().hex, 'status': 'done', 'created': now,
+               'finished': now, 'js_code': js_code}
+        self.store.save(job)
+        return job
+
+    def _expire(self, job: dict, future: Future) -> None:
+        """Prazo vencido: o job falha e libera a vaga, mesmo que o processo ainda não tenha parado"""
+        future.cancel()
+        self._finish(job, None, None, TIMEOUT_MESSAGE)
+
+    def _finish(self, job: dict, python_code: Optional[str], future: Optional[Future],
+                error: Optional[str] = None) -> None:
+        # Chamado pelo future e pelo prazo; só o primeiro conclui o job
+        with self._lock:
+            if job['job_id'] not in self._running:
+                return
+            timer = self._running.pop(job['job_id'])
+            self._pending -= 1
+        if timer is not None:
+            timer.cancel()
+
+        job = dict(job, finished=time.time())
+        if future is not None and error is None:
+            try:
+                job['js_code'] = future.result()
+                job['status'] = 'done'
+            except BrokenProcessPool:
+                # O próximo envio encontra o pool quebrado e o recria (_start)
+                error = "Processo do pool encerrado inesperadamente"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        if error is not None:
+            job['error'] = error
+            job['status'] = 'failed'
+
+        self.store.save(job)
+        event = self._events.pop(job['job_id'], None)
+        if event is not None:
+            event.set()
+        if self.on_result is not None and job['status'] == 'done':
+            self.on_result(python_code, job['js_code'])
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[dict]:
+        """
+        Devolve o estado do job, ou None se ele não existe ou expirou.
+
+        Com ``wait`` > 0, aguarda até esse número de segundos pela conclusão
+        (long-poll) antes de responder.
+        """
+        self._purge()
+        deadline = time.time() + wait
+        while True:
+            job = self.store.load(job_id)
+            if job is None or job['status'] in FINAL_STATUSES:
+                return job
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return job
+
+            event = self._events.get(job_id)
+            if event is not None:
+                event.wait(remaining)
+            else:
+                # Job de outro processo: consulta o armazenamento periodicamente
+                time.sleep(min(0.1, remaining))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'pending': self._pending, 'max_pending': self.max_pending}
+
+    def _purge(self) -> None:
+        now = time.time()
+        if now - self._last_purge >= self.PURGE_INTERVAL:
+            self._last_purge = now
+            self.store.delete_expired(self.ttl)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            timers = [timer for timer in self._running.values() if timer is not None]
+        for timer in timers:
+            timer.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def queue_from_env(on_result: Optional[Callable[[str, str], None]] = None) -> JobQueue:
+    """
+    Cria a fila a partir de variáveis de ambiente:
+
+    - TRANSPILER_JOBS_DIR: diretório dos jobs (padrão: memória do processo)
+    - TRANSPILER_JOBS_WORKERS: processos do pool (padrão: 2)
+    - TRANSPILER_JOBS_MAX_PENDING: jobs na fila ou em execução (padrão: 16)
+    - TRANSPILER_JOBS_TTL: segundos que o resultado fica disponível (padrão: 600)
+    - TRANSPILER_JOBS_TIMEOUT: prazo de cada job em segundos, 0 para nenhum (padrão: 60)
+    """
+    directory = os.environ.get('TRANSPILER_JOBS_DIR')
+    return JobQueue(
+        workers=int(os.environ.get('TRANSPILER_JOBS_WORKERS', 2)),
+        max_pending=int(os.environ.get('TRANSPILER_JOBS_MAX_PENDING', 16)),
+        ttl=float(os.environ.get('TRANSPILER_JOBS_TTL', 600)),
+        timeout=float(os.environ.get('TRANSPILER_JOBS_TIMEOUT', 60)),
+        store=FileJobStore(directory) if directory else MemoryJobStore(),
+        on_result=on_result,
+    )
@@ -0,0 +1,118 @@
+"""
+Emissão em bloco de literais grandes (tabelas, fixtures, dados embutidos).
+
+Uma lista ou dicionário formado só por constantes é convertido de uma vez:
+``literal_value`` obtém o valor Python direto da AST (sem um visitante por
+elemento) e ``js_literal`` o serializa com ``json.dumps``, que já produz
+JavaScript válido com as strings corretamente escapadas.
+
+Só entram no caminho rápido valores com a mesma representação em JSON e em
+JavaScript: strings, números finitos, booleanos, None, listas e
+dicionários com chaves string. Tuplas, conjuntos, bytes e chaves de outros
+tipos seguem pelo visitante normal.
+
+Com ``json_parse_min``, literais cujo JSON tem pelo menos esse número de
+bytes são emitidos como ``JSON.parse('...')``, que os motores JavaScript
+analisam mais rápido que o literal equivalente.
+"""
+
+import ast
+import json
+import math
+from operator import attrgetter
+from typing import Any, List, Optional
+
+# Marca de subárvore que não é um literal puro
+NOT_LITERAL = object()
+
+_SCALARS = (str, int, float, bool, type(None))
+# Escalares que dispensam verificação adicional (floats podem ser inf/nan)
+_FAST_SCALARS = frozenset((str, int, bool, type(None)))
+_SCALAR_SET = frozenset(_SCALARS)
+
+
+class _NotLiteral(Exception):
+    pass
+
+
+_get_value = attrgetter('value')
+_get_kind = attrgetter('kind')
+_CONSTANT_ONLY = {ast.Constant}
+_PLAIN_KINDS = {None, 'u'}
+
+
+def _list(elts: List[ast.expr]) -> list:
+    # Lista só de constantes: map/set percorrem os elementos em C
+    if set(map(type, elts)) <= _CONSTANT_ONLY and set(map(_get_kind, elts)) <= _PLAIN_KINDS:
+        values = list(map(_get_value, elts))
+        types = set(map(type, values))
+        if types <= _FAST_SCALARS:
+            return values
+        if types <= _SCALAR_SET and all(map(math.isfinite, (v for v in values if type(v) is float))):
+            return values
+        raise _NotLiteral
+    # Caso geral: números negativos (-n) tratados sem chamada recursiva
+    values = []
+    append = values.append
+    for elt in elts:
+        elt_type = type(elt)
+        if elt_type is ast.Constant and type(elt.value) in _FAST_SCALARS and elt.kind is None:
+            append(elt.value)
+        elif elt_type is ast.UnaryOp and type(elt.op) is ast.USub \
+                and type(elt.operand) is ast.Constant and type(elt.operand.value) is int:
+            append(-elt.operand.value)
+        else:
+            append(_value(elt))
+    return values
+
+
+def _value(node: ast.AST) -> Any:
+    node_type = type(node)
+    if node_type is ast.Constant:
+        value = node.value
+        if type(value) not in _SCALARS or getattr(node, 'kind', None) == 'f':
+            raise _NotLiteral
+        if type(value) is float and not math.isfinite(value):
+            raise _NotLiteral
+        return value
+    if node_type is ast.List:
+        return _list(node.elts)
+    if node_type is ast.Dict:
+        result = {}
+        for key, value in zip(node.keys, node.values):
+            # key None é um **desempacotamento
+            if type(key) is not ast.Constant or type(key.value) is not str:
+                raise _NotLiteral
+            result[key.value] = _value(value)
+        return result
+    if node_type is ast.UnaryOp and type(node.op) is ast.USub \
+            and type(node.operand) is ast.Constant and type(node.operand.value) in (int, float):
+        return -_value(node.operand)
+    raise _NotLiteral
+
+
+def literal_value(node: ast.AST) -> Any:
+    """Valor Python de uma lista/dicionário só de constantes, ou NOT_LITERAL"""
+    try:
+        return _value(node)
+    except (_NotLiteral, RecursionError):
+        return NOT_LITERAL
+
+
+def js_string(text: str) -> str:
+    """String JavaScript entre aspas duplas, com aspas, barras e controles escapados"""
+    return json.dumps(text, ensure_ascii=False)
+
+
+def js_literal(value: Any, compact: bool = False, json_parse_min: Optional[int] = None) -> str:
+    """JavaScript de um valor obtido por literal_value"""
+    separators = (',', ':') if compact else (', ', ': ')
+    text = json.dumps(value, ensure_ascii=False, separators=separators)
+    if json_parse_min and len(text) >= json_parse_min:
+        if not compact:
+            text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        # Dentro de aspas simples só barras e aspas simples precisam de escape;
+        # json.dumps já escapou as quebras de linha
+        quoted = text.replace('\\', '\\\\').replace("'", "\\'")
+        return f"JSON.parse('{quoted}')"
+    return text
@@ -0,0 +1,252 @@
+"""
+Sessões de transpilação ao vivo para o editor web.
+
+Cada sessão guarda um ``IncrementalTranspiler`` próprio e as linhas do
+último JavaScript enviado. O editor envia as edições (depois de um
+debounce, com um número de versão crescente) e recebe por server-sent
+events apenas o trecho da saída que mudou:
+
+    event: patch
+    data: {"version": 7, "start": 3, "end": 5, "lines": ["...", "..."]}
+
+troca as linhas [start, end) da saída anterior por ``lines``. Cada conexão
+começa com um evento ``snapshot`` (saída completa), e erros de sintaxe
+chegam como ``syntax-error`` sem alterar a saída.
+
+- Só a edição mais recente é transpilada: uma edição pendente é
+  substituída pela seguinte, e uma transpilação em andamento é cancelada
+  (entre dois statements) quando chega uma versão mais nova.
+- O número de sessões é limitado (``SessionLimit``) e sessões sem conexão
+  de eventos expiram depois de ``ttl`` segundos sem atividade.
+- Cada edição tem um limite de tempo de CPU (``cpu_limit``), medido na
+  própria thread e verificado entre dois statements, de modo que vale
+  também nos workers com várias threads, onde o ITIMER_PROF do app não
+  pode ser usado. Acima dele a edição chega como ``cpu-limit`` e a saída
+  anterior é mantida.
+- As sessões ficam na memória do processo: com vários workers, as edições
+  e o canal de eventos de uma sessão precisariam chegar ao mesmo processo,
+  por isso o serve.py só habilita o modo ao vivo (``--live``) com um único
+  worker gthread.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from incremental import IncrementalTranspiler, TranspileCancelled
+from transpiler import SYNTAX_ERROR_PREFIX, shared_transpiler
+
+
+class SessionLimit(Exception):
+    """O número máximo de sessões ao vivo foi atingido"""
+
+
+class CPULimitExceeded(Exception):
+    """A transpilação de uma edição excedeu o limite de tempo de CPU"""
+
+
+def split_lines(js_code: str) -> List[str]:
+    return js_code.split('\n') if js_code else []
+
+
+def diff_lines(old: List[str], new: List[str]) -> Tuple[int, int, List[str]]:
+    """Menor trecho [start, end) de ``old`` que, trocado, produz ``new``"""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
+
+def format_event(event: str, data: dict) -> str:
+    """Mensagem no formato text/event-stream"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class LiveSession:
+    """Estado de um editor: transpilador incremental, edição pendente e saída atual"""
+
+    def __init__(self, session_id: str, cpu_limit: float = 0, **options):
+        self.session_id = session_id
+        self.cpu_limit = cpu_limit
+        self.incremental = IncrementalTranspiler(shared_transpiler(**options))
+        self.lines: List[str] = []
+        self.version = 0
+        self.output_version = 0
+        self.closed = False
+        self.last_activity = time.monotonic()
+        self.stats = {'edits': 0, 'superseded': 0, 'cancelled': 0, 'transpiled': 0, 'cpu_limited': 0}
+        self._pending: Optional[str] = None
+        self._connection: Optional[object] = None
+        self._cond = threading.Condition()
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+    def submit(self, version: int, python_code: str) -> bool:
+        """Registra uma edição; versões antigas (ou repetidas) são ignoradas"""
+        with self._cond:
+            if self.closed or version <= self.version:
+                return False
+            if self._pending is not None:
+                self.stats['superseded'] += 1
+            self.version = version
+            self._pending = python_code
+            self.stats['edits'] += 1
+            self.last_activity = time.monotonic()
+            self._cond.notify_all()
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def _take(self, token: object, timeout: float) -> Optional[Tuple[int, str]]:
+        """Próxima edição pendente, ou None depois de ``timeout`` segundos"""
+        with self._cond:
+            if self._pending is None and not self.closed and self._connection is token:
+                self._cond.wait(timeout)
+            if self._pending is None or self._connection is not token:
+                return None
+            pending = (self.version, self._pending)
+            self._pending = None
+            return pending
+
+    def process(self, version: int, python_code: str) -> Optional[Tuple[str, dict]]:
+        """
+        Transpila uma versão e devolve o evento (nome, dados) a enviar, ou
+        None se uma versão mais nova chegou no meio do trabalho.
+        """
+        deadline = time.thread_time() + self.cpu_limit if self.cpu_limit else None
+
+        def cancelled() -> bool:
+            if deadline is not None and time.thread_time() > deadline:
+                raise CPULimitExceeded("Tempo de CPU da edição excedido")
+            return self.version != version
+
+        try:
+            js_code = self.incremental.transpile(python_code, cancelled=cancelled)
+        except TranspileCancelled:
+            self.stats['cancelled'] += 1
+            return None
+        except CPULimitExceeded as e:
+            self.stats['cpu_limited'] += 1
+            return 'cpu-limit', {'version': version, 'error': str(e)}
+        self.stats['transpiled'] += 1
+
+        if js_code.startswith(SYNTAX_ERROR_PREFIX):
+            return 'syntax-error', {'version': version,
+                                    'error': js_code[len(SYNTAX_ERROR_PREFIX):].strip()}
+
+        lines = split_lines(js_code)
+        start, end, changed = diff_lines(self.lines, lines)
+        self.lines = lines
+        self.output_version = version
+        return 'patch', {'version': version, 'start': start, 'end': end, 'lines': changed}
+
+    def events(self, keepalive: float = 15.0) -> Iterator[str]:
+        """
+        Mensagens SSE da sessão até ela ser fechada. Uma conexão nova assume
+        o lugar da anterior, que é encerrada.
+        """
+        token = object()
+        with self._cond:
+            self._connection = token
+            self._cond.notify_all()
+        try:
+            yield "retry: 1000\n\n"
+            yield format_event('snapshot', {'version': self.output_version, 'lines': self.lines})
+            while not self.closed and self._connection is token:
+                pending = self._take(token, keepalive)
+                self.last_activity = time.monotonic()
+                if pending is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event = self.process(*pending)
+                if event is not None:
+                    yield format_event(*event)
+        finally:
+            with self._cond:
+                if self._connection is token:
+                    self._connection = None
+                self.last_activity = time.monotonic()
+
+
+class LiveSessions:
+    """Sessões ao vivo do processo, limitadas em número e com expiração"""
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 300.0, keepalive: float = 15.0,
+                 cpu_limit: float = 0, enabled: bool = True):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.keepalive = keepalive
+        self.cpu_limit = cpu_limit
+        self.enabled = enabled
+        self._sessions: Dict[str, LiveSession] = {}
+        self._lock = threading.Lock()
+
+    def _expire(self) -> None:
+        limit = time.monotonic() - self.ttl
+        for session_id, session in list(self._sessions.items()):
+            if session.closed or (not session.connected and session.last_activity < limit):
+                session.close()
+                del self._sessions[session_id]
+
+    def create(self, **options) -> LiveSession:
+        """Nova sessão com as opções do transpilador; levanta SessionLimit se cheio"""
+        with self._lock:
+            self._expire()
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionLimit(f"Limite de {self.max_sessions} sessões ao vivo atingido")
+            session = LiveSession(uuid.uuid4().hex, cpu_limit=self.cpu_limit, **options)
+            self._sessions[session.session_id] = session
+            return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session if session is not None and not session.closed else None
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            'sessions': len(sessions),
+            'connected': sum(1 for s in sessions if s.connected),
+            'max_sessions': self.max_sessions,
+        }
+
+
+def sessions_from_env() -> LiveSessions:
+    """
+    Cria o registro de sessões a partir de variáveis de ambiente:
+
+    - TRANSPILER_LIVE_MAX_SESSIONS: sessões simultâneas por processo (padrão: 256)
+    - TRANSPILER_LIVE_TTL: segundos até expirar uma sessão sem conexão (padrão: 300)
+    - TRANSPILER_LIVE_KEEPALIVE: segundos entre mensagens de keepalive (padrão: 15)
+    - TRANSPILER_CPU_LIMIT: tempo de CPU por edição, como no /transpile (padrão: 5)
+    - TRANSPILER_LIVE: ``0`` desativa o modo ao vivo (o serve.py só o ativa com --live)
+    """
+    return LiveSessions(
+        max_sessions=int(os.environ.get('TRANSPILER_LIVE_MAX_SESSIONS', 256)),
+        ttl=float(os.environ.get('TRANSPILER_LIVE_TTL', 300)),
+        keepalive=float(os.environ.get('TRANSPILER_LIVE_KEEPALIVE', 15)),
+        cpu_limit=float(os.environ.get('TRANSPILER_CPU_LIMIT', 5)),
+        enabled=os.environ.get('TRANSPILER_LIVE', '1') != '0',
+    )
@@ -0,0 +1,138 @@
+"""
+Suporte ao modo compacto (``minify``) do transpilador.
+
+- ``compact_line``: remove os espaços de uma linha de JavaScript gerado,
+  preservando strings, template literals, comentários e os espaços que
+  separam palavras (``let x``) ou operadores que se fundiriam (``a - -b``);
+- ``rename_locals``: troca as variáveis locais e os parâmetros de cada
+  função por nomes curtos (``a``, ``b``, ...), quando a troca é segura.
+
+Uma função só tem seus nomes trocados se não contém escopos aninhados
+(funções, classes, lambdas, comprehensions), ``global``/``nonlocal``,
+``import`` ou referências a ``eval``/``exec``/``locals``/``vars``; nesses
+casos os nomes podem ser vistos de fora do corpo da função. Os nomes novos
+nunca coincidem com um nome usado dentro da função nem com palavras
+reservadas do JavaScript.
+"""
+
+import ast
+import itertools
+import re
+import string
+from typing import Dict, Iterable, Iterator, Set
+
+# Strings, template literals, comentários /* */ ou sequências de espaços
+_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`(?:[^`\\]|\\.)*`|/\*.*?\*/|\s+')
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char in '_$'
+
+
+def _squeeze(match: 're.Match') -> str:
+    token = match.group()
+    if not token[0].isspace():
+        return token
+    text = match.string
+    before = text[match.start() - 1] if match.start() else ''
+    after = text[match.end()] if match.end() < len(text) else ''
+    if not before or not after:
+        return ''
+    if (_is_word(before) and _is_word(after)) or (before == after and before in '+-/'):
+        return ' '
+    return ''
+
+
+def compact_line(text: str) -> str:
+    """Linha de JavaScript sem os espaços desnecessários"""
+    return _TOKENS.sub(_squeeze, text)
+
+
+JS_RESERVED = frozenset('''
+    abstract arguments await boolean break byte case catch char class const continue
+    debugger default delete do double else enum eval export extends false final finally
+    float for function goto if implements import in instanceof int interface let long
+    native new null of package private protected public return short static super switch
+    synchronized this throw throws transient true try typeof undefined var void volatile
+    while with yield NaN Infinity
+'''.split())
+
+# Escopos aninhados e statements que expõem nomes locais fora da função
+_NESTED = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda, ast.ListComp,
+           ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.Global, ast.Nonlocal,
+           ast.Import, ast.ImportFrom)
+_INTROSPECTION = frozenset(('eval', 'exec', 'locals', 'vars', 'globals'))
+
+
+def short_names() -> Iterator[str]:
+    """a, b, ..., z, a0, a1, ... (minúsculas, para não virar ``new``)"""
+    first = string.ascii_lowercase
+    rest = string.ascii_lowercase + string.digits
+    for size in itertools.count(1):
+        for head in first:
+            for tail in itertools.product(rest, repeat=size - 1):
+                name = head + "".join(tail)
+                if name not in JS_RESERVED:
+                    yield name
+
+
+def _rename_function(func: ast.FunctionDef, reserved: Set[str]) -> None:
+    params = [arg for arg in func.args.posonlyargs + func.args.args + func.args.kwonlyargs]
+    for arg in (func.args.vararg, func.args.kwarg):
+        if arg is not None:
+            params.append(arg)
+
+    nodes = [node for stmt in func.body for node in ast.walk(stmt)]
+    if any(isinstance(node, _NESTED) for node in nodes):
+        return
+
+    used: Set[str] = {arg.arg for arg in params}
+    counts: Dict[str, int] = {arg.arg: 1 for arg in params}
+    for node in nodes:
+        if isinstance(node, ast.Name):
+            if node.id in _INTROSPECTION:
+                return
+            used.add(node.id)
+            if isinstance(node.ctx, ast.Store):
+                counts.setdefault(node.id, 0)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            used.add(node.name)
+            counts.setdefault(node.name, 0)
+    for node in nodes:
+        if isinstance(node, ast.Name) and node.id in counts:
+            counts[node.id] += 1
+
+    # Nomes tratados de forma especial pelo transpilador e nomes com
+    # maiúscula (chamados com new) ficam como estão
+    local = [name for name in counts
+             if name not in reserved and not name[0].isupper() and name not in JS_RESERVED]
+    if not local:
+        return
+    # Os nomes mais usados recebem os nomes mais curtos
+    local.sort(key=lambda name: -counts[name])
+    available = (name for name in short_names() if name not in used)
+    mapping = {}
+    for name in local:
+        if len(name) > 1:
+            mapping[name] = next(available)
+            if len(mapping[name]) >= len(name):
+                del mapping[name]
+                break
+    if not mapping:
+        return
+
+    for arg in params:
+        arg.arg = mapping.get(arg.arg, arg.arg)
+    for node in nodes:
+        if isinstance(node, ast.Name):
+            node.id = mapping.get(node.id, node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            node.name = mapping.get(node.name, node.name)
+
+
+def rename_locals(tree: ast.AST, reserved: Iterable[str] = ()) -> None:
+    """Encurta os nomes locais de todas as funções de ``tree``, no lugar"""
+    reserved = set(reserved)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            _rename_function(node, reserved)
@@ -0,0 +1,282 @@
+"""
+Passes de otimização aplicadas à AST antes da emissão do JavaScript.
+
+Cada pass recebe a árvore (``ast.Module``) e a altera no lugar; todos são
+iterativos (usam ``ast.walk``), de modo que árvores muito profundas não
+estouram o limite de recursão.
+
+- ``fold_constants``: avalia operações entre constantes (``2 * 60`` vira
+  ``120``), apenas quando o resultado em JavaScript é o mesmo;
+- ``eliminate_dead_branches``: remove ramos de ``if``/``while`` cujo teste é
+  uma constante;
+- ``remove_unreachable``: descarta statements depois de ``return``,
+  ``break``, ``continue`` ou ``raise`` no mesmo bloco;
+- ``native_pow``: emite ``**`` nativo em vez de ``Math.pow``.
+
+Uso:
+    PythonToJSTranspiler(optimize=True)                         # todos os passes
+    PythonToJSTranspiler(optimize=['fold_constants', 'native_pow'])
+"""
+
+import ast
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+class NativePow(ast.Pow):
+    """Operador ** marcado pelo pass native_pow para ser emitido nativamente"""
+
+
+# Maior inteiro representado com exatidão por um Number do JavaScript
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+_NOT_FOLDED = object()
+_NUMBERS = (int, float)
+_PRIMITIVES = (bool, int, float, str, type(None))
+_TERMINATORS = (ast.Return, ast.Break, ast.Continue, ast.Raise)
+_STATEMENT_LISTS = ('body', 'orelse', 'finalbody')
+
+
+def _js_value(value):
+    """Devolve o valor se ele tem a mesma representação em JavaScript, senão _NOT_FOLDED"""
+    if type(value) is int and abs(value) > MAX_SAFE_INTEGER:
+        return _NOT_FOLDED
+    if type(value) is float and not math.isfinite(value):
+        return _NOT_FOLDED
+    return value
+
+
+def _fold_binop(op: ast.operator, left, right):
+    if type(left) is str and type(right) is str and isinstance(op, ast.Add):
+        return left + right
+    if type(left) not in _NUMBERS or type(right) not in _NUMBERS:
+        return _NOT_FOLDED
+    if _js_value(left) is _NOT_FOLDED or _js_value(right) is _NOT_FOLDED:
+        # Inteiros grandes perdem precisão em JavaScript: o resultado seria outro
+        return _NOT_FOLDED
+
+    try:
+        if isinstance(op, ast.Add):
+            value = left + right
+        elif isinstance(op, ast.Sub):
+            value = left - right
+        elif isinstance(op, ast.Mult):
+            value = left * right
+        elif isinstance(op, ast.Div):
+            value = left / right
+        elif isinstance(op, ast.FloorDiv):
+            # Mesma conta que Math.floor(a / b)
+            value = math.floor(left / right)
+            if type(left) is float or type(right) is float:
+                value = float(value)
+        elif isinstance(op, ast.Mod) and left >= 0 and right > 0:
+            # O sinal do resto difere entre Python e JavaScript para negativos
+            value = left % right
+        elif isinstance(op, ast.Pow) and abs(right) <= 64:
+            value = left ** right
+        else:
+            return _NOT_FOLDED
+    except (ArithmeticError, ValueError):
+        return _NOT_FOLDED
+    if type(value) is complex:
+        return _NOT_FOLDED
+    return _js_value(value)
+
+
+def _fold_unaryop(op: ast.unaryop, operand):
+    if isinstance(op, ast.Not):
+        return not operand if type(operand) in _PRIMITIVES else _NOT_FOLDED
+    if type(operand) not in _NUMBERS or _js_value(operand) is _NOT_FOLDED:
+        return _NOT_FOLDED
+    if isinstance(op, ast.USub):
+        return -operand
+    if isinstance(op, ast.UAdd):
+        return operand
+    if isinstance(op, ast.Invert) and type(operand) is int and -2 ** 31 <= operand < 2 ** 31:
+        # ~ do JavaScript opera em 32 bits
+        return ~operand
+    return _NOT_FOLDED
+
+
+_COMPARISONS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+
+
+def _fold_compare(node: ast.Compare):
+    if len(node.ops) != 1 or not isinstance(node.left, ast.Constant):
+        return _NOT_FOLDED
+    compare = _COMPARISONS.get(type(node.ops[0]))
+    right = node.comparators[0]
+    if compare is None or not isinstance(right, ast.Constant):
+        return _NOT_FOLDED
+    left, right = node.left.value, right.value
+    if type(left) in _NUMBERS and type(right) in _NUMBERS:
+        return compare(left, right)
+    if type(left) is str and type(right) is str and isinstance(node.ops[0], (ast.Eq, ast.NotEq)):
+        # < e > comparam unidades UTF-16 em JavaScript; só a igualdade coincide
+        return compare(left, right)
+    return _NOT_FOLDED
+
+
+def _fold_boolop(node: ast.BoolOp) -> ast.expr:
+    """Descarta constantes iniciais que não decidem o resultado de and/or"""
+    values = list(node.values)
+    is_and = isinstance(node.op, ast.And)
+    while values and isinstance(values[0], ast.Constant) and type(values[0].value) in _PRIMITIVES:
+        first = values[0].value
+        if bool(first) != is_and or len(values) == 1:
+            # and com falso / or com verdadeiro: o resultado é a própria constante
+            return values[0]
+        values.pop(0)
+    if len(values) == 1:
+        return values[0]
+    if len(values) != len(node.values):
+        node.values = values
+    return node
+
+
+def _fold(node: ast.AST):
+    """Versão dobrada de ``node`` (cujos filhos já foram dobrados), ou o próprio nó"""
+    value = _NOT_FOLDED
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.left, ast.Constant) and isinstance(node.right, ast.Constant):
+            value = _fold_binop(node.op, node.left.value, node.right.value)
+    elif isinstance(node, ast.UnaryOp):
+        if isinstance(node.operand, ast.Constant):
+            value = _fold_unaryop(node.op, node.operand.value)
+    elif isinstance(node, ast.Compare):
+        value = _fold_compare(node)
+    elif isinstance(node, ast.BoolOp):
+        return _fold_boolop(node)
+    if value is _NOT_FOLDED:
+        return node
+    return ast.copy_location(ast.Constant(value), node)
+
+
+def fold_constants(tree: ast.AST) -> None:
+    """Substitui operações entre constantes pelo resultado"""
+    # Em ordem inversa de ast.walk (busca em largura) cada nó é processado
+    # depois de todos os seus descendentes
+    for node in reversed(list(ast.walk(tree))):
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                folded = _fold(value)
+                if folded is not value:
+                    setattr(node, field, folded)
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, ast.expr):
+                        value[i] = _fold(item)
+
+
+def _declares(statements: List[ast.stmt]) -> bool:
+    """Se o bloco declara nomes (let, function, class) no próprio escopo"""
+    for stmt in statements:
+        if isinstance(stmt, (ast.FunctionDef, ast.ClassDef)):
+            return True
+        if isinstance(stmt, ast.Assign) and not isinstance(stmt.targets[0], ast.Attribute):
+            return True
+    return False
+
+
+def _prune(statements: List[ast.stmt]) -> List[ast.stmt]:
+    result = []
+    pending = statements[::-1]
+    while pending:
+        stmt = pending.pop()
+        if isinstance(stmt, ast.If) and isinstance(stmt.test, ast.Constant):
+            live = stmt.body if stmt.test.value else stmt.orelse
+            if _declares(live):
+                # Mantém o bloco para não mudar o escopo das declarações
+                stmt.test = ast.copy_location(ast.Constant(True), stmt.test)
+                stmt.body, stmt.orelse = live, []
+            else:
+                pending.extend(live[::-1])
+                continue
+        elif isinstance(stmt, ast.While) and isinstance(stmt.test, ast.Constant) \
+                and not stmt.test.value:
+            pending.extend(stmt.orelse[::-1])
+            continue
+        result.append(stmt)
+    return result
+
+
+def eliminate_dead_branches(tree: ast.AST) -> None:
+    """Remove os ramos de if/while que nunca são executados"""
+    for node in ast.walk(tree):
+        for field in _STATEMENT_LISTS:
+            statements = getattr(node, field, None)
+            if statements and any(isinstance(s, (ast.If, ast.While)) for s in statements):
+                statements[:] = _prune(statements)
+
+
+def remove_unreachable(tree: ast.AST) -> None:
+    """Descarta os statements que seguem um return/break/continue/raise no mesmo bloco"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Module):
+            # O corpo do módulo fica intacto: transpile_iter e a transpilação
+            # paralela emitem os statements de nível superior separadamente
+            continue
+        for field in _STATEMENT_LISTS:
+            statements = getattr(node, field, None)
+            if not statements:
+                continue
+            for i, stmt in enumerate(statements[:-1]):
+                if isinstance(stmt, _TERMINATORS):
+                    del statements[i + 1:]
+                    break
+
+
+def native_pow(tree: ast.AST) -> None:
+    """Marca os operadores ** para emissão nativa (``a ** b``) em vez de Math.pow"""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.BinOp, ast.AugAssign)) and type(node.op) is ast.Pow:
+            node.op = NativePow()
+
+
+# Passes na ordem em que são aplicados
+PASSES: Dict[str, Callable[[ast.AST], None]] = {
+    'fold_constants': fold_constants,
+    'eliminate_dead_branches': eliminate_dead_branches,
+    'remove_unreachable': remove_unreachable,
+    'native_pow': native_pow,
+}
+
+
+def resolve_passes(optimize: Union[None, bool, str, Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Converte a opção ``optimize`` na lista de passes, na ordem de PASSES.
+
+    Aceita True (todos), False/None (nenhum), nomes separados por vírgula ou
+    uma lista de nomes; nomes desconhecidos levantam ValueError.
+    """
+    if not optimize:
+        return ()
+    if optimize is True:
+        return tuple(PASSES)
+    if isinstance(optimize, str):
+        optimize = [name.strip() for name in optimize.split(',') if name.strip()]
+
+    names = set(optimize)
+    unknown = names - set(PASSES)
+    if unknown:
+        raise ValueError(f"Pass de otimização desconhecido: {', '.join(sorted(unknown))} "
+                         f"(disponíveis: {', '.join(PASSES)})")
+    return tuple(name for name in PASSES if name in names)
+
+
+def run_passes(tree: ast.AST, passes: Iterable[str],
+               timings: Optional[Dict[str, float]] = None) -> None:
+    """Aplica os passes à árvore, somando o tempo de cada um em ``timings``"""
+    for name in passes:
+        start = time.perf_counter()
+        PASSES[name](tree)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
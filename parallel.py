@@ -0,0 +1,123 @@
+"""
+Transpilação paralela de um único módulo grande.
+
+As funções, classes e statements de nível superior são unidades de emissão
+independentes: o módulo é cortado entre elas em trechos de custo parecido,
+os trechos são transpilados em um pool de processos e as saídas são
+juntadas na ordem original. O resultado é idêntico, byte a byte, ao de
+``transpile_python_to_js``.
+
+- O custo de cada unidade é estimado pelo tamanho do código; os trechos têm
+  como alvo ``custo total / (jobs * CHUNKS_PER_JOB)``, e uma unidade maior
+  que o alvo (uma classe enorme) vira um trecho sozinha.
+- Os trechos são enviados ao pool do mais caro para o mais barato, para que
+  o maior não fique por último enquanto os outros processos esperam.
+- Se algum trecho não puder ser analisado isoladamente (erro de sintaxe ou
+  corte no meio de um statement), o módulo inteiro é transpilado no
+  processo atual, o que também produz a mensagem de erro correta.
+
+Uso:
+    transpile_parallel(codigo, jobs=8, minify=True)
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from runtime import with_runtime
+from transpiler import PythonToJSTranspiler, shared_transpiler, transpile_python_to_js
+
+# Abaixo deste número de linhas o custo do pool supera o ganho
+PARALLEL_MIN_LINES = 2000
+CHUNKS_PER_JOB = 4
+
+_CLAUSES = PythonToJSTranspiler._CLAUSES
+
+
+def unit_boundaries(lines: List[str]) -> List[int]:
+    """
+    Índices das linhas em que pode começar um statement de nível superior.
+
+    São as linhas na coluna 0 que não são comentário, fechamento de
+    parênteses, cláusula de bloco (else, except, ...) ou a definição logo
+    abaixo de um decorador.
+    """
+    boundaries = []
+    previous = ""
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        if (i and line[0] not in ' \t\r\n#)]}' and not line.startswith(_CLAUSES)
+                and not previous.startswith('@')):
+            boundaries.append(i)
+        if line[0] not in ' \t#':
+            previous = line
+    return boundaries
+
+
+def partition(lines: List[str], jobs: int) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) de linhas com custo (bytes) próximo do alvo"""
+    starts = [0] + unit_boundaries(lines)
+    ends = starts[1:] + [len(lines)]
+    # Custo acumulado em bytes até o início de cada linha
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    target = offsets[-1] / (jobs * CHUNKS_PER_JOB)
+
+    chunks = []
+    chunk_start = 0
+    for start, end in zip(starts, ends):
+        if start > chunk_start and offsets[end] - offsets[chunk_start] > target:
+            # A unidade atual estouraria o alvo: fecha o trecho antes dela
+            chunks.append((chunk_start, start))
+            chunk_start = start
+    chunks.append((chunk_start, len(lines)))
+    return chunks
+
+
+def transpile_segment(python_code: str, options: dict) -> Optional[str]:
+    """Transpila um trecho no processo do pool; None se ele não puder ser analisado"""
+    transpiler = shared_transpiler(**options)
+    try:
+        tree = transpiler.parse(python_code)
+    except SyntaxError:
+        return None
+    return transpiler.emit(tree)
+
+
+def transpile_parallel(python_code: str, jobs: Optional[int] = None,
+                       executor: Optional[Executor] = None, **options) -> str:
+    """
+    ``transpile_python_to_js`` distribuída entre ``jobs`` processos (padrão:
+    número de núcleos). Com ``executor``, usa o pool informado em vez de
+    criar um novo.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    lines = python_code.splitlines(keepends=True)
+    if (jobs == 1 and executor is None) or len(lines) < PARALLEL_MIN_LINES \
+            or options.get('profiler') is not None:
+        return transpile_python_to_js(python_code, **options)
+
+    chunks = partition(lines, jobs)
+    if len(chunks) == 1:
+        return transpile_python_to_js(python_code, **options)
+    segments = ["".join(lines[start:end]) for start, end in chunks]
+    order = sorted(range(len(segments)), key=lambda i: -len(segments[i]))
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(segments))) as pool:
+            results = _run(pool, segments, order, options)
+    else:
+        results = _run(executor, segments, order, options)
+
+    if any(result is None for result in results):
+        return transpile_python_to_js(python_code, **options)
+    transpiler = shared_transpiler(**options)
+    js_code = transpiler.writer_class.NEWLINE.join(result for result in results if result)
+    return with_runtime(js_code, transpiler.minify)
+
+
+def _run(executor: Executor, segments: List[str], order: List[int], options: dict) -> List[Optional[str]]:
+    futures = {i: executor.submit(transpile_segment, segments[i], options) for i in order}
+    return [futures[i].result() for i in range(len(segments))]
@@ -0,0 +1,104 @@
+"""
+Instrumentação opcional do transpilador.
+
+``TranspileProfile`` acumula, para cada visitante (tipo de nó da AST), o
+número de chamadas e os tempos cumulativo e próprio, além do número de nós
+visitados, bytes gerados e tempos de análise (``ast.parse``), emissão e
+montagem da string final.
+
+Uso:
+    profile = TranspileProfile()
+    PythonToJSTranspiler(profiler=profile).transpile(codigo)
+    print(profile.as_dict())
+"""
+
+import json
+import threading
+from typing import Dict, List
+
+
+class TranspileProfile:
+    """Métricas acumuladas de uma ou mais transpilações"""
+
+    def __init__(self):
+        # nome do visitante -> [chamadas, tempo cumulativo, tempo próprio]
+        self.visitors: Dict[str, List[float]] = {}
+        self.nodes = 0
+        self.transpilations = 0
+        self.output_bytes = 0
+        self.parse_time = 0.0
+        self.emit_time = 0.0
+        self.assembly_time = 0.0
+        # nome do pass de otimização -> tempo acumulado (incluído em emit_time)
+        self.pass_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def merge(self, other: 'TranspileProfile') -> None:
+        """Soma as métricas de ``other`` (seguro entre threads)"""
+        with self._lock:
+            for name, (calls, cumulative, own) in other.visitors.items():
+                stats = self.visitors.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += calls
+                stats[1] += cumulative
+                stats[2] += own
+            self.nodes += other.nodes
+            self.transpilations += other.transpilations
+            self.output_bytes += other.output_bytes
+            self.parse_time += other.parse_time
+            self.emit_time += other.emit_time
+            self.assembly_time += other.assembly_time
+            for name, seconds in other.pass_times.items():
+                self.pass_times[name] = self.pass_times.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                'transpilations': self.transpilations,
+                'nodes': self.nodes,
+                'output_bytes': self.output_bytes,
+                'parse_seconds': self.parse_time,
+                'emit_seconds': self.emit_time,
+                'assembly_seconds': self.assembly_time,
+                'passes': dict(self.pass_times),
+                'visitors': {
+                    name: {'calls': calls, 'cumulative_seconds': cumulative, 'self_seconds': own}
+                    for name, (calls, cumulative, own) in sorted(
+                        self.visitors.items(), key=lambda item: item[1][2], reverse=True)
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'transpiler') -> str:
+        """Métricas no formato texto do Prometheus"""
+        data = self.as_dict()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        metric('transpilations_total', 'counter', 'Transpilações instrumentadas',
+               [('', data['transpilations'])])
+        metric('nodes_visited_total', 'counter', 'Nós da AST visitados', [('', data['nodes'])])
+        metric('output_bytes_total', 'counter', 'Bytes de JavaScript gerados',
+               [('', data['output_bytes'])])
+        metric('phase_seconds_total', 'counter', 'Tempo por fase da transpilação', [
+            ('{phase="parse"}', data['parse_seconds']),
+            ('{phase="emit"}', data['emit_seconds']),
+            ('{phase="assembly"}', data['assembly_seconds']),
+        ])
+        metric('pass_seconds_total', 'counter', 'Tempo por pass de otimização',
+               [(f'{{pass="{name}"}}', seconds) for name, seconds in data['passes'].items()])
+        visitors = data['visitors'].items()
+        metric('visitor_calls_total', 'counter', 'Chamadas por visitante',
+               [(f'{{visitor="{name}"}}', stats['calls']) for name, stats in visitors])
+        metric('visitor_seconds_total', 'counter', 'Tempo por visitante (cumulativo e próprio)',
+               [(f'{{visitor="{name}",kind="cumulative"}}', stats['cumulative_seconds'])
+                for name, stats in visitors] +
+               [(f'{{visitor="{name}",kind="self"}}', stats['self_seconds'])
+                for name, stats in visitors])
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,249 @@
+"""
+Runtime JavaScript com a semântica do Python.
+
+Operações sem equivalente nativo exato em JavaScript são emitidas como
+chamadas a funções auxiliares com prefixo ``$py_`` (que nunca colide com
+nomes Python):
+
+- ``a // b`` e ``a % b``: divisão inteira e resto com o sinal do divisor,
+  com erro na divisão por zero;
+- ``len(x)`` de forma desconhecida: ``.length``, ``.size``, ``__len__`` ou
+  o número de chaves, conforme o valor;
+- ``range(...)`` usado como valor ou com passo: objeto preguiçoso que pode
+  ser percorrido várias vezes, com ``len``, índices (também negativos) e
+  ``start``/``stop``/``step``;
+- ``x in c`` de forma desconhecida: ``includes``, ``has``, iteração ou
+  chave de objeto, conforme o contêiner;
+- ``|``, ``&``, ``-`` e ``^`` entre conjuntos e ``get``/``pop``/
+  ``setdefault`` de dicionários (ver shapes.py).
+
+Só as funções usadas por uma saída são incluídas nela, uma única vez, no
+fim do arquivo (declarações de função são içadas, então valem no arquivo
+todo). O uso é detectado no próprio JavaScript gerado, de modo que a saída
+é a mesma quando o módulo é emitido inteiro, por statement ou em trechos
+paralelos; quem junta saídas parciais chama ``with_runtime`` no resultado.
+"""
+
+import re
+from typing import Iterable, List, Set
+
+from minifier import compact_line
+
+PREFIX = '$py_'
+
+# Funções do runtime, na ordem em que são emitidas
+HELPERS = {
+    'floordiv': """
+function $py_floordiv(a, b) {
+    if (b === 0) {
+        throw new RangeError("ZeroDivisionError: integer division or modulo by zero");
+    }
+    return Math.floor(a / b);
+}
+""",
+    'mod': """
+function $py_mod(a, b) {
+    const r = a % b;
+    if (r !== 0 && (r < 0) !== (b < 0)) {
+        return r + b;
+    }
+    if (b === 0) {
+        throw new RangeError("ZeroDivisionError: integer division or modulo by zero");
+    }
+    return r;
+}
+""",
+    'len': """
+function $py_len(x) {
+    const n = x.length;
+    if (typeof n === "number") {
+        return n;
+    }
+    if (x instanceof Set || x instanceof Map) {
+        return x.size;
+    }
+    if (typeof x.__len__ === "function") {
+        return x.__len__();
+    }
+    return Object.keys(x).length;
+}
+""",
+    'range': """
+function $py_range(start, stop, step = 1) {
+    if (stop === undefined) {
+        stop = start;
+        start = 0;
+    }
+    if (step === 0) {
+        throw new RangeError("ValueError: range() arg 3 must not be zero");
+    }
+    const length = Math.max(0, Math.ceil((stop - start) / step));
+    const r = {
+        start,
+        stop,
+        step,
+        length,
+        __len__() {
+            return length;
+        },
+        *[Symbol.iterator]() {
+            for (let i = 0; i < length; i++) {
+                yield start + i * step;
+            }
+        },
+    };
+    return new Proxy(r, {
+        get(target, key) {
+            const i = typeof key === "string" ? Number(key) : NaN;
+            if (!Number.isInteger(i) || String(i) !== key) {
+                return target[key];
+            }
+            const k = i < 0 ? i + length : i;
+            if (k < 0 || k >= length) {
+                throw new RangeError("IndexError: range object index out of range");
+            }
+            return start + k * step;
+        },
+    });
+}
+""",
+    'in': """
+function $py_in(x, c) {
+    if (typeof c === "string" || Array.isArray(c)) {
+        return c.includes(x);
+    }
+    if (c instanceof Set || c instanceof Map) {
+        return c.has(x);
+    }
+    if (typeof c[Symbol.iterator] === "function") {
+        for (const v of c) {
+            if (v === x) {
+                return true;
+            }
+        }
+        return false;
+    }
+    return Object.hasOwn(c, x);
+}
+""",
+    'union': """
+function $py_union(a, b) {
+    const r = new Set(a);
+    for (const v of b) {
+        r.add(v);
+    }
+    return r;
+}
+""",
+    'intersection': """
+function $py_intersection(a, b) {
+    b = b instanceof Set ? b : new Set(b);
+    const r = new Set();
+    for (const v of a) {
+        if (b.has(v)) {
+            r.add(v);
+        }
+    }
+    return r;
+}
+""",
+    'difference': """
+function $py_difference(a, b) {
+    b = b instanceof Set ? b : new Set(b);
+    const r = new Set();
+    for (const v of a) {
+        if (!b.has(v)) {
+            r.add(v);
+        }
+    }
+    return r;
+}
+""",
+    'symmetric_difference': """
+function $py_symmetric_difference(a, b) {
+    const r = $py_difference(a, b);
+    for (const v of b) {
+        if (!a.has(v)) {
+            r.add(v);
+        }
+    }
+    return r;
+}
+""",
+    'issubset': """
+function $py_issubset(a, b) {
+    b = b instanceof Set ? b : new Set(b);
+    for (const v of a) {
+        if (!b.has(v)) {
+            return false;
+        }
+    }
+    return true;
+}
+""",
+    'get': """
+function $py_get(d, k, fallback = null) {
+    return Object.hasOwn(d, k) ? d[k] : fallback;
+}
+""",
+    'pop': """
+function $py_pop(d, k, ...fallback) {
+    if (Object.hasOwn(d, k)) {
+        const v = d[k];
+        delete d[k];
+        return v;
+    }
+    if (fallback.length) {
+        return fallback[0];
+    }
+    throw new RangeError("KeyError: " + k);
+}
+""",
+    'setdefault': """
+function $py_setdefault(d, k, v = null) {
+    if (!Object.hasOwn(d, k)) {
+        d[k] = v;
+    }
+    return d[k];
+}
+""",
+}
+
+_USES = re.compile(r"\$py_(\w+)")
+
+
+def helper(name: str) -> str:
+    """Nome JavaScript de uma função do runtime"""
+    return PREFIX + name
+
+
+def used_helpers(js_code: str) -> Set[str]:
+    """Funções do runtime chamadas em ``js_code``, com as que elas usam"""
+    names = {name for name in _USES.findall(js_code) if name in HELPERS}
+    pending = list(names)
+    while pending:
+        for name in _USES.findall(HELPERS[pending.pop()]):
+            if name in HELPERS and name not in names:
+                names.add(name)
+                pending.append(name)
+    return names
+
+
+def runtime_code(names: Iterable[str], compact: bool = False) -> str:
+    """Definições das funções ``names`` (e dependências), na ordem de HELPERS"""
+    names = used_helpers(''.join(helper(name) for name in names))
+    lines: List[str] = []
+    for name, code in HELPERS.items():
+        if name in names:
+            lines.extend(code.strip().splitlines())
+    if compact:
+        return ''.join(compact_line(line.strip()) for line in lines)
+    return '\n'.join(["// Runtime Python (runtime.py)"] + lines)
+
+
+def with_runtime(js_code: str, compact: bool = False) -> str:
+    """``js_code`` seguido das funções do runtime que ele usa"""
+    names = used_helpers(js_code)
+    if not names:
+        return js_code
+    return ('' if compact else '\n').join((js_code, runtime_code(names, compact)))
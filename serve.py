@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Servidor de produção da interface web (gunicorn, modelo pre-fork).
+
+O módulo ``app`` (e com ele o transpilador) é carregado uma única vez no
+processo mestre antes do fork, de modo que os workers já nascem aquecidos.
+
+Uso:
+    python serve.py [--bind 0.0.0.0:8000] [--workers 4] [--timeout 30]
+    python serve.py --live [--threads 32]
+
+O modo ao vivo (/live) guarda as sessões na memória do processo e mantém
+conexões de server-sent events abertas; por isso só é habilitado com
+``--live``, que usa um único worker gthread (as conexões longas não contam
+para o ``--timeout``). Sem ``--live``, POST /live responde 404.
+
+Limites por requisição (variáveis de ambiente lidas por app.py):
+    TRANSPILER_MAX_BODY   tamanho máximo do corpo em bytes (padrão: 2 MiB)
+    TRANSPILER_CPU_LIMIT  tempo de CPU por transpilação em segundos (padrão: 5, 0 = sem limite);
+                          com mais de uma thread por worker só vale para o modo ao vivo
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+# Threads do worker único do modo ao vivo (uma por conexão de eventos aberta)
+LIVE_THREADS = 32
+
+
+class TranspilerServer(BaseApplication):
+    """Aplicação gunicorn configurada em código, sem arquivo de configuração"""
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        from transpiler import transpile_python_to_js
+
+        # Aquece o transpilador antes do fork dos workers
+        transpile_python_to_js("def f(x):\n    return x\n")
+        return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    workers = os.environ.get('TRANSPILER_WORKERS')
+    parser = argparse.ArgumentParser(description="Servidor de produção do transpilador")
+    parser.add_argument('--bind', default=os.environ.get('TRANSPILER_BIND', '0.0.0.0:8000'))
+    parser.add_argument('--workers', type=int, default=int(workers) if workers else None,
+                        help='processos worker (padrão: 2 × núcleos + 1; 1 com --live)')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='segundos até um worker travado ser reiniciado')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='segundos para concluir requisições em andamento ao encerrar')
+    parser.add_argument('--max-requests', type=int, default=1000,
+                        help='requisições por worker antes de reciclá-lo (0 = nunca)')
+    parser.add_argument('--keepalive', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('TRANSPILER_THREADS', 1)),
+                        help='threads por worker (> 1 usa o worker gthread, sem o limite de CPU '
+                             'por requisição do /transpile)')
+    parser.add_argument('--live', action='store_true', default=os.environ.get('TRANSPILER_LIVE') == '1',
+                        help=f'habilita o modo ao vivo (/live): um único worker gthread com '
+                             f'pelo menos {LIVE_THREADS} threads')
+    return parser
+
+
+def server_options(argv=None) -> dict:
+    """Configuração do gunicorn correspondente à linha de comando"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    workers, threads, max_requests = args.workers, args.threads, args.max_requests
+    if args.live:
+        # Sessões na memória do processo: todas as requisições de uma sessão
+        # precisam chegar ao mesmo worker, que não é reciclado
+        if workers not in (None, 1):
+            parser.error("--live exige um único worker: as sessões ficam na memória do processo")
+        workers, threads, max_requests = 1, max(threads, LIVE_THREADS), 0
+    elif workers is None:
+        workers = multiprocessing.cpu_count() * 2 + 1
+    # Lido por app.py (live.sessions_from_env) quando o app é carregado
+    os.environ['TRANSPILER_LIVE'] = '1' if args.live else '0'
+    if threads > 1:
+        print("Aviso: com mais de uma thread por worker o limite de CPU por requisição "
+              "(TRANSPILER_CPU_LIMIT) só é aplicado às edições do modo ao vivo", file=sys.stderr)
+
+    return {
+        'bind': args.bind,
+        'workers': workers,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10,
+        'keepalive': args.keepalive,
+        'threads': threads,
+        'limit_request_line': 8190,
+        'limit_request_fields': 100,
+        'limit_request_field_size': 8190,
+        'accesslog': '-',
+    }
+
+
+def main():
+    TranspilerServer(server_options()).run()
+
+
+if __name__ == '__main__':
+    main()
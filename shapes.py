@@ -0,0 +1,189 @@
+"""
+Análise local das formas (conjunto, dicionário, lista) das coleções.
+
+O emissor usa a forma para escolher a operação JavaScript certa:
+
+- ``x in s`` vira ``s.has(x)`` em conjuntos (``Set``) e
+  ``Object.hasOwn(d, x)`` em dicionários (objetos), ambos em tempo
+  constante; listas e valores de forma desconhecida continuam com
+  ``.includes``;
+- ``len`` vira ``.size`` em conjuntos e ``Object.keys(d).length`` em
+  dicionários, e ``for k in d`` percorre ``Object.keys(d)``.
+
+A forma de uma expressão vem da construção (literais, comprehensions e
+chamadas ``set()``/``frozenset()``/``dict()``/``list()``) ou, para nomes, de
+``scope_shapes``: um nome tem forma conhecida quando todas as suas ligações
+na função (atribuições simples) constroem a mesma forma. Qualquer outra
+ligação (parâmetro, ``for``, ``+=``, desempacotamento, ``import``,
+``global``/``nonlocal``...) torna a forma desconhecida.
+
+A análise só percorre os statements da função (não as expressões), então
+custa pouco e é feita apenas quando o emissor consulta a forma de um nome.
+Nomes do nível do módulo nunca têm forma conhecida, de modo que a saída é
+a mesma quando o módulo é emitido inteiro ou por partes (transpile_iter,
+transpilação incremental e paralela).
+"""
+
+import ast
+from typing import Callable, Dict, List, Optional, Set
+
+SET = 'set'
+DICT = 'dict'
+LIST = 'list'
+
+_CONSTRUCTORS = {'set': SET, 'frozenset': SET, 'dict': DICT, 'list': LIST}
+_LITERALS = {ast.Set: SET, ast.SetComp: SET, ast.Dict: DICT, ast.DictComp: DICT,
+             ast.List: LIST, ast.ListComp: LIST}
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_BODIES = ('body', 'orelse', 'finalbody')
+# Statements que não ligam nomes nem contêm outros statements
+_INERT = frozenset((ast.Expr, ast.Return, ast.Pass, ast.Break, ast.Continue, ast.Raise, ast.Assert))
+
+
+def value_shape(node: ast.AST) -> Optional[str]:
+    """Forma de uma expressão pela sua construção, ou None"""
+    kind = type(node)
+    if kind is ast.Call and type(node.func) is ast.Name:
+        return _CONSTRUCTORS.get(node.func.id)
+    return _LITERALS.get(kind)
+
+
+def _child_statements(stmt: ast.stmt) -> List[ast.stmt]:
+    """Statements aninhados em for/with/try/match (não em definições)"""
+    children = []
+    for field in _BODIES:
+        children.extend(getattr(stmt, field, ()))
+    for handler in getattr(stmt, 'handlers', ()):
+        children.extend(handler.body)
+    for case in getattr(stmt, 'cases', ()):
+        children.extend(case.body)
+    return children
+
+
+def _nonlocals(definition: ast.AST) -> Set[str]:
+    """Nomes declarados ``nonlocal`` em funções aninhadas numa definição"""
+    names: Set[str] = set()
+    stack = list(definition.body)
+    while stack:
+        stmt = stack.pop()
+        if isinstance(stmt, ast.Nonlocal):
+            names.update(stmt.names)
+        elif isinstance(stmt, _DEFINITIONS):
+            stack.extend(stmt.body)
+        else:
+            stack.extend(_child_statements(stmt))
+    return names
+
+
+def _bind_names(node: Optional[ast.AST], bind: Callable[[str], None]) -> None:
+    """Liga, com forma desconhecida, os nomes escritos num alvo ou padrão"""
+    if node is None:
+        return
+    if type(node) is ast.Name:
+        bind(node.id)
+        return
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            if not isinstance(child.ctx, ast.Load):
+                bind(child.id)
+        else:
+            # Capturas de match (MatchAs, MatchStar, MatchMapping)
+            name = getattr(child, 'name', None) or getattr(child, 'rest', None)
+            if isinstance(name, str):
+                bind(name)
+
+
+def comprehension_shapes(node: ast.AST) -> Dict[str, Optional[str]]:
+    """Nomes ligados pelos for de uma comprehension, todos de forma desconhecida"""
+    shapes: Dict[str, Optional[str]] = {}
+
+    def bind(name: str) -> None:
+        shapes[name] = None
+
+    for generator in node.generators:
+        _bind_names(generator.target, bind)
+    return shapes
+
+
+def parameter_names(scope: ast.AST) -> List[str]:
+    """Parâmetros de uma função, que nunca têm forma conhecida"""
+    args = getattr(scope, 'args', None)
+    if args is None:
+        return []
+    names = [arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs]
+    for arg in (args.vararg, args.kwarg):
+        if arg is not None:
+            names.append(arg.arg)
+    return names
+
+
+def scope_shapes(scope: ast.AST) -> Dict[str, Optional[str]]:
+    """
+    Forma de cada nome ligado no corpo de uma função (None quando
+    desconhecida). Nomes ausentes do resultado vêm de escopos externos.
+    """
+    shapes: Dict[str, Optional[str]] = {}
+
+    def bind(name: str, shape: Optional[str] = None) -> None:
+        shapes[name] = shape if shapes.get(name, shape) == shape else None
+
+    for name in parameter_names(scope):
+        bind(name)
+
+    escaped: Set[str] = set()
+    stack = list(scope.body)
+    while stack:
+        stmt = stack.pop()
+        kind = type(stmt)
+        if kind is ast.Assign:
+            # Caso mais comum: ``nome = valor``
+            shape = value_shape(stmt.value)
+            for target in stmt.targets:
+                if type(target) is ast.Name:
+                    name = target.id
+                    shapes[name] = shape if shapes.get(name, shape) == shape else None
+                else:
+                    _bind_names(target, bind)
+        elif kind in _INERT:
+            continue
+        elif kind is ast.If or kind is ast.While:
+            stack.extend(stmt.body)
+            stack.extend(stmt.orelse)
+        elif kind is ast.AugAssign:
+            _bind_names(stmt.target, bind)
+        elif kind is ast.For:
+            _bind_names(stmt.target, bind)
+            stack.extend(stmt.body)
+            stack.extend(stmt.orelse)
+        elif kind is ast.AnnAssign:
+            if stmt.value is None:
+                continue
+            if type(stmt.target) is ast.Name:
+                bind(stmt.target.id, value_shape(stmt.value))
+            else:
+                _bind_names(stmt.target, bind)
+        elif isinstance(stmt, _DEFINITIONS):
+            bind(stmt.name)
+            escaped |= _nonlocals(stmt)
+        elif kind is ast.Global or kind is ast.Nonlocal:
+            escaped.update(stmt.names)
+        elif kind is ast.Import or kind is ast.ImportFrom:
+            for alias in stmt.names:
+                bind((alias.asname or alias.name).split('.')[0])
+        else:
+            # async for, with, try, match, del
+            _bind_names(getattr(stmt, 'target', None), bind)
+            for target in getattr(stmt, 'targets', ()):
+                _bind_names(target, bind)
+            for item in getattr(stmt, 'items', ()):
+                _bind_names(item.optional_vars, bind)
+            for handler in getattr(stmt, 'handlers', ()):
+                if handler.name:
+                    bind(handler.name)
+            for case in getattr(stmt, 'cases', ()):
+                _bind_names(case.pattern, bind)
+            stack.extend(_child_statements(stmt))
+
+    for name in escaped:
+        shapes[name] = None
+    return shapes
@@ -0,0 +1,275 @@
+import gzip
+import json
+import time
+import unittest
+from unittest import mock
+
+import app as app_module
+from app import app, transpile_cache
+from profiling import TranspileProfile
+from transpiler import transpile_python_to_js
+
+class TestApp(unittest.TestCase):
+
+    def setUp(self):
+        """Cliente de teste com cache vazio"""
+        transpile_cache.clear()
+        self.client = app.test_client()
+
+    def test_transpile(self):
+        """Teste do endpoint /transpile"""
+        response = self.client.post('/transpile', json={'python_code': 'x = 1'})
+        self.assertEqual(response.get_json(), {'success': True, 'js_code': 'let x = 1;'})
+
+    def test_transpile_optimize(self):
+        """Teste do /transpile com passes de otimização"""
+        response = self.client.post('/transpile', json={'python_code': 'x = 2 ** 3', 'optimize': True})
+        self.assertEqual(response.get_json()['js_code'], 'let x = 8;')
+
+        response = self.client.post('/transpile', json={'python_code': 'x = 1', 'optimize': ['inexistente']})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.get_json()['success'])
+
+    def test_transpile_minify(self):
+        """Teste do /transpile no modo compacto"""
+        python_code = 'def f(valor):\n    return valor + 1\n'
+        response = self.client.post('/transpile', json={'python_code': python_code, 'minify': True})
+        self.assertEqual(response.get_json()['js_code'], 'function f(a){return a+1;}')
+
+        response = self.client.post('/transpile', json={'python_code': python_code})
+        self.assertEqual(response.get_json()['js_code'], transpile_python_to_js(python_code))
+
+    def test_transpile_etag(self):
+        """Teste de ETag determinístico e requisição condicional no /transpile"""
+        python_code = 'x = 2 ** 3\n'
+        response = self.client.post('/transpile', json={'python_code': python_code})
+        etag = response.headers['ETag']
+        self.assertIn('max-age', response.headers['Cache-Control'])
+        self.assertEqual(self.client.get('/transpile', query_string={'python_code': python_code}).headers['ETag'], etag)
+        other = self.client.post('/transpile', json={'python_code': python_code, 'optimize': True})
+        self.assertNotEqual(other.headers['ETag'], etag)
+
+        # No POST a condição é ignorada
+        response = self.client.post('/transpile', json={'python_code': python_code},
+                                    headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['js_code'], 'let x = Math.pow(2, 3);')
+
+        with mock.patch.object(transpile_cache, 'transpile') as transpile:
+            response = self.client.head('/transpile', query_string={'python_code': python_code},
+                                        headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get('/transpile', query_string={'python_code': python_code},
+                                       headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            transpile.assert_not_called()
+
+    def test_compression(self):
+        """Teste de compressão gzip só acima do limite de tamanho"""
+        python_code = ''.join(f'valor_{i} = {i}\n' for i in range(200))
+        response = self.client.post('/transpile', json={'python_code': python_code},
+                                    headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertTrue(response.headers['ETag'].endswith('-gzip"'))
+        body = json.loads(gzip.decompress(response.get_data()))
+        self.assertEqual(body['js_code'], transpile_python_to_js(python_code))
+
+        # O ETag da versão comprimida também vale na requisição condicional
+        response = self.client.get('/transpile', query_string={'python_code': python_code},
+                                   headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.post('/transpile', json={'python_code': 'x = 1'},
+                                    headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_json()['js_code'], 'let x = 1;')
+
+    def test_examples(self):
+        """Teste dos exemplos gerados pelo transpilador, com ETag e Cache-Control"""
+        response = self.client.get('/examples')
+        examples = response.get_json()
+        self.assertEqual(len(examples), len(app_module.EXAMPLE_SOURCES))
+        for example in examples:
+            self.assertEqual(example['javascript'], transpile_python_to_js(example['python']))
+        self.assertIn('public', response.headers['Cache-Control'])
+
+        response = self.client.get('/examples', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+
+    def test_transpile_stream(self):
+        """Teste do endpoint de streaming"""
+        python_code = 'def f(a):\n    return a\n\nprint(f(1))\n' * 3
+        response = self.client.post('/transpile/stream', json={'python_code': python_code})
+
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.get_data(as_text=True), transpile_python_to_js(python_code))
+
+    def test_transpile_stream_plain_body(self):
+        """Teste do endpoint de streaming com o código no corpo da requisição"""
+        response = self.client.post('/transpile/stream', data='x = 1', content_type='text/plain')
+        self.assertEqual(response.get_data(as_text=True), 'let x = 1;')
+
+    def test_body_size_limit(self):
+        """Teste do limite de tamanho do corpo"""
+        with mock.patch.dict(app.config, {'MAX_CONTENT_LENGTH': 100}):
+            response = self.client.post('/transpile', json={'python_code': 'x = 1\n' * 100})
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(response.get_json()['success'])
+
+    def test_cpu_time_limit(self):
+        """Teste do limite de tempo de CPU por requisição"""
+        python_code = 'def f(a):\n    return a + 1\n' * 5000
+        with mock.patch.object(app_module, 'CPU_TIME_LIMIT', 0.01):
+            response = self.client.post('/transpile', json={'python_code': python_code})
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('Tempo de CPU', response.get_json()['error'])
+
+            response = self.client.post('/transpile/stream', json={'python_code': python_code})
+            self.assertIn('// Tempo de CPU', response.get_data(as_text=True))
+
+    def test_transpile_batch(self):
+        """Teste do endpoint em lote com itens em cache, novos e inválidos"""
+        self.client.post('/transpile', json={'python_code': 'x = 1'})
+        items = [
+            {'id': 'a', 'python_code': 'x = 1'},
+            {'id': 'b', 'python_code': 'print("b")'},
+            {'id': 'c', 'python_code': ''},
+            {'id': 'd', 'python_code': 'def f(a):\n    return a'},
+            {'id': 'e', 'python_code': 'print("b")'},
+        ]
+        response = self.client.post('/transpile/batch', json={'items': items})
+        results = response.get_json()['results']
+
+        self.assertEqual([r['id'] for r in results], ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(results[0]['js_code'], 'let x = 1;')
+        self.assertEqual(results[1]['js_code'], 'console.log("b");')
+        self.assertFalse(results[2]['success'])
+        self.assertIn('function f(a)', results[3]['js_code'])
+        self.assertEqual(results[4], dict(results[1], id='e'))
+        self.assertEqual(transpile_cache.stats()['size'], 3)
+
+    def test_transpile_batch_ndjson(self):
+        """Teste do endpoint em lote com resposta NDJSON"""
+        items = [{'id': i, 'python_code': f'x = {i}'} for i in range(3)]
+        response = self.client.post('/transpile/batch?stream=1', json={'items': items})
+
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(sorted(r['id'] for r in lines), [0, 1, 2])
+        self.assertTrue(all(r['success'] for r in lines))
+
+    def test_transpile_batch_list_body(self):
+        """Teste do lote enviado como lista de itens, sem o objeto em volta"""
+        items = [{'id': i, 'python_code': f'x = {i}'} for i in range(2)]
+        response = self.client.post('/transpile/batch', json=items)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['js_code'] for r in response.get_json()['results']], ['let x = 0;', 'let x = 1;'])
+
+    def test_transpile_batch_item_limits(self):
+        """Teste do limite de CPU por item e da recriação do pool após a morte de um worker"""
+        python_code = 'def f(a):\n    return a + 1\n' * 5000
+        with mock.patch.object(app_module, 'CPU_TIME_LIMIT', 0.01):
+            with self.assertRaisesRegex(TimeoutError, 'Tempo de CPU'):
+                app_module.transpile_bounded(python_code)
+
+        items = [{'python_code': f'x = {i}'} for i in range(2)]
+        self.client.post('/transpile/batch', json=items)
+        pool = app_module.get_pool()
+        for process in list(pool._processes.values()):
+            process.kill()
+            process.join()
+        deadline = time.monotonic() + 10
+        while not pool._broken and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        transpile_cache.clear()
+        response = self.client.post('/transpile/batch', json=items)
+        self.assertTrue(all(r['success'] for r in response.get_json()['results']))
+        self.assertIsNot(app_module.get_pool(), pool)
+
+    def test_transpile_batch_validation(self):
+        """Teste de validação do corpo do lote"""
+        self.assertEqual(self.client.post('/transpile/batch', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/transpile/batch', json='x = 1').status_code, 400)
+        self.assertEqual(self.client.post('/transpile/batch', data='[', content_type='application/json').status_code, 400)
+        with mock.patch.object(app_module, 'BATCH_MAX_ITEMS', 2):
+            items = [{'python_code': 'x = 1'}] * 3
+            self.assertEqual(self.client.post('/transpile/batch', json={'items': items}).status_code, 413)
+
+    def test_jobs(self):
+        """Teste da fila assíncrona com long-poll"""
+        python_code = 'def f(a):\n    return a * 2\n' * 50
+        response = self.client.post('/jobs', json={'python_code': python_code})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()['job_id']
+
+        job = self.client.get(f'/jobs/{job_id}?wait=10').get_json()
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['js_code'], transpile_python_to_js(python_code))
+
+        # O resultado alimenta o cache: o mesmo código conclui na hora
+        response = self.client.post('/jobs', json={'python_code': python_code})
+        self.assertEqual(response.get_json()['status'], 'done')
+
+        self.assertEqual(self.client.get('/jobs/inexistente').status_code, 404)
+
+    def test_jobs_queue_full(self):
+        """Teste de rejeição com 429 quando a fila está cheia"""
+        with mock.patch.object(app_module.job_queue, 'max_pending', 0):
+            response = self.client.post('/jobs', json={'python_code': 'x = 1'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_live_disabled(self):
+        """Teste do modo ao vivo desativado (serve.py sem --live)"""
+        with mock.patch.object(app_module.live_sessions, 'enabled', False):
+            response = self.client.post('/live', json={})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('--live', response.get_json()['error'])
+
+    def test_live(self):
+        """Teste da sessão ao vivo: edição, canal de eventos e encerramento"""
+        response = self.client.post('/live', json={'minify': True})
+        self.assertEqual(response.status_code, 201)
+        session_id = response.get_json()['session_id']
+
+        response = self.client.post(f'/live/{session_id}/edit', json={'version': 1, 'python_code': 'x = 1'})
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.get_json()['accepted'])
+        self.assertEqual(self.client.post(f'/live/{session_id}/edit', json={'version': 'a'}).status_code, 400)
+
+        response = self.client.get(f'/live/{session_id}/events', buffered=False)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        messages = iter(response.response)
+        next(messages), next(messages)
+        self.assertIn(b'"lines": ["let x=1;"]', next(messages))
+
+        self.assertEqual(self.client.delete(f'/live/{session_id}').status_code, 200)
+        self.assertEqual(list(messages), [])
+        response.close()
+        self.assertEqual(self.client.get(f'/live/{session_id}/events').status_code, 404)
+        self.assertEqual(self.client.post(f'/live/{session_id}/edit', json={}).status_code, 404)
+
+    def test_metrics(self):
+        """Teste do endpoint de métricas no formato do Prometheus"""
+        self.client.post('/transpile', json={'python_code': 'x = 1'})
+        self.client.post('/transpile', json={'python_code': 'x = 1'})
+        
+        profile = TranspileProfile()
+        with mock.patch.object(transpile_cache, 'profiler', profile):
+            self.client.post('/transpile', json={'python_code': 'y = 2'})
+            response = self.client.get('/metrics')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        body = response.get_data(as_text=True)
+        self.assertIn(f"transpiler_cache_hits_total {transpile_cache.stats()['hits']}", body)
+        self.assertIn('transpiler_jobs_pending 0', body)
+        self.assertIn('transpiler_visitor_calls_total{visitor="Assign"} 1', body)
+        
+        self.assertNotIn('visitor_calls_total', self.client.get('/metrics').get_data(as_text=True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+from batch import MANIFEST_NAME, collect_sources, run_batch
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Cria uma árvore de arquivos .py temporária"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'src')
+        self.out = os.path.join(self.tmp.name, 'build')
+        self.write('a.py', 'x = 1')
+        self.write('pacote/b.py', 'print("b")')
+        self.write('pacote/sub/c.py', 'def c():\n    return 3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relpath, content):
+        path = os.path.join(self.src, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def read_output(self, relpath):
+        with open(os.path.join(self.out, relpath), encoding='utf-8') as f:
+            return f.read()
+
+    def test_collect_directory_and_glob(self):
+        """Teste de expansão de diretórios e globs"""
+        relpaths = [rel for _, rel in collect_sources([self.src])]
+        self.assertEqual(relpaths, ['a.py', os.path.join('pacote', 'b.py'),
+                                    os.path.join('pacote', 'sub', 'c.py')])
+
+        pattern = os.path.join(self.src, 'pacote', '**', '*.py')
+        relpaths = [rel for _, rel in collect_sources([pattern])]
+        self.assertEqual(relpaths, ['b.py', os.path.join('sub', 'c.py')])
+
+    def test_mirrors_tree_in_parallel(self):
+        """Teste de espelhamento da árvore com pool de processos"""
+        results = run_batch([self.src], self.out, jobs=2)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r.error is None for r in results))
+        self.assertEqual(self.read_output('a.js'), 'let x = 1;')
+        self.assertIn('function c()', self.read_output(os.path.join('pacote', 'sub', 'c.js')))
+        self.assertTrue(os.path.exists(os.path.join(self.out, MANIFEST_NAME)))
+
+    def test_manifest_skips_unchanged(self):
+        """Teste de arquivos sem alteração pulados pelo manifesto"""
+        run_batch([self.src], self.out, jobs=1)
+        self.write('a.py', 'x = 2')
+
+        results = {os.path.basename(r.source): r for r in run_batch([self.src], self.out, jobs=1)}
+        self.assertFalse(results['a.py'].skipped)
+        self.assertTrue(results['b.py'].skipped)
+        self.assertTrue(results['c.py'].skipped)
+        self.assertEqual(self.read_output('a.js'), 'let x = 2;')
+
+    def test_minify_options(self):
+        """Teste do modo compacto: opções no manifesto e bytes economizados"""
+        run_batch([self.src], self.out, jobs=1)
+        results = run_batch([self.src], self.out, jobs=1, options={'minify': True})
+
+        self.assertFalse(any(r.skipped for r in results))
+        self.assertEqual(self.read_output(os.path.join('pacote', 'sub', 'c.js')),
+                         'function c(){return 3;}')
+        saved = {os.path.basename(r.source): r.saved_bytes for r in results}
+        self.assertEqual(saved['a.py'], 2)
+        self.assertEqual(saved['c.py'], len('function c() {\n    return 3;\n}') - len('function c(){return 3;}'))
+
+    def test_syntax_error_is_failure(self):
+        """Teste de arquivo inválido reportado como falha e refeito na próxima execução"""
+        self.write('ruim.py', 'def (')
+        results = {os.path.basename(r.source): r for r in run_batch([self.src], self.out, jobs=1)}
+        self.assertIn('Erro de sintaxe', results['ruim.py'].error)
+        self.assertFalse(os.path.exists(os.path.join(self.out, 'ruim.js')))
+
+        results = {os.path.basename(r.source): r for r in run_batch([self.src], self.out, jobs=1)}
+        self.assertFalse(results['ruim.py'].skipped)
+
+    def test_standalone_files_common_root(self):
+        """Teste de arquivos avulsos com o mesmo nome: caminhos a partir da raiz comum"""
+        self.write('outro/a.py', 'x = 3')
+        files = [os.path.join(self.src, 'a.py'), os.path.join(self.src, 'outro', 'a.py')]
+        self.assertEqual([rel for _, rel in collect_sources(files)], ['a.py', os.path.join('outro', 'a.py')])
+        self.assertEqual([rel for _, rel in collect_sources(files[1:])], ['a.py'])
+
+        run_batch(files, self.out, jobs=1)
+        self.assertEqual(self.read_output('a.js'), 'let x = 1;')
+        self.assertEqual(self.read_output(os.path.join('outro', 'a.js')), 'let x = 3;')
+
+        # Diretório e arquivo avulso que gerariam o mesmo .js
+        with self.assertRaisesRegex(ValueError, 'mesmo arquivo a.js'):
+            collect_sources([os.path.join(self.src, 'outro'), files[0]])
+
+if __name__ == '__main__':
+    unittest.main()
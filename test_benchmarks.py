@@ -0,0 +1,45 @@
+import ast
+import unittest
+
+from benchmarks.corpus import WORKLOADS, generate
+from benchmarks.run import compare, percentile, run_suite
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_corpus_deterministic(self):
+        """Teste de geração determinística do corpus"""
+        for name in WORKLOADS:
+            documents = generate(name, scale=0.05, seed=3)
+            self.assertEqual(documents, generate(name, scale=0.05, seed=3))
+            for doc in documents:
+                ast.parse(doc)
+        
+        self.assertNotEqual(generate('wide_module', 0.05, seed=3), generate('wide_module', 0.05, seed=4))
+    
+    def test_percentile(self):
+        """Teste do cálculo de percentis"""
+        samples = [float(n) for n in range(1, 101)]
+        self.assertEqual(percentile(samples, 0.5), 50.5)
+        self.assertEqual(percentile(samples, 1.0), 100.0)
+        self.assertEqual(percentile([7.0], 0.95), 7.0)
+    
+    def test_regression_gate(self):
+        """Teste da verificação de regressão contra a linha de base"""
+        results = run_suite(['small_snippets'], scale=0.02, repeat=1)
+        stats = results['workloads']['small_snippets']
+        self.assertGreater(stats['throughput_bytes_per_s'], 0)
+        self.assertGreater(stats['peak_memory_bytes'], 0)
+        self.assertEqual(compare(results, results, threshold=0.15), [])
+        
+        baseline = dict(results, workloads={'small_snippets': dict(
+            stats, latency_p50_ms=stats['latency_p50_ms'] / 2,
+            throughput_bytes_per_s=stats['throughput_bytes_per_s'] * 2)})
+        regressions = compare(results, baseline, threshold=0.15)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('small_snippets.throughput_bytes_per_s'))
+        
+        with self.assertRaises(ValueError):
+            compare(results, dict(baseline, seed=1), threshold=0.15)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from bundle import BundleError, Bundler
+from cli import main as cli_main
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        """Cria um projeto temporário com pacote, subpacote e importações relativas"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.write('pacote/__init__.py', 'from .util import dobro\n\nVERSAO = "1.0"')
+        self.write('pacote/util.py',
+                   'def dobro(x):\n    return x * 2\n\n'
+                   'def triplo(x):\n    return x * 3\n\n'
+                   'def nunca_usada():\n    return 0')
+        self.write('pacote/sub/__init__.py', '')
+        self.write('pacote/sub/mat.py',
+                   'from ..util import triplo\nimport math\n\n'
+                   'def soma(a, b):\n    return triplo(a) + b\n\n'
+                   'class Contador:\n    def __init__(self):\n        self.total = 0\n\n'
+                   'class Sobra:\n    pass')
+        self.write('main.py',
+                   'import os\nimport pacote\nimport pacote.sub.mat\n'
+                   'from pacote.sub.mat import Contador as C\nfrom pacote import util as u\n\n'
+                   'def calcular(n):\n'
+                   '    return pacote.dobro(n) + pacote.sub.mat.soma(n, 1) + u.dobro(1)\n\n'
+                   'def _interna():\n    return 1\n\n'
+                   "if __name__ == '__main__':\n"
+                   '    c = C()\n    print(calcular(2), pacote.VERSAO, c.total)')
+        self.entry = self.path('main.py')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, relpath):
+        return os.path.join(self.tmp.name, relpath)
+
+    def write(self, relpath, content):
+        os.makedirs(os.path.dirname(self.path(relpath)), exist_ok=True)
+        with open(self.path(relpath), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_graph_order_and_external(self):
+        """Teste de resolução das importações, ordem topológica e módulos externos"""
+        result = Bundler(jobs=1).build(self.entry)
+
+        self.assertEqual(result.modules, ['pacote.util', 'pacote', 'pacote.sub', 'pacote.sub.mat', 'main'])
+        self.assertEqual(result.external, ['os', 'math'])
+        self.assertIn('const {triplo} = $pacote$util;', result.code)
+        self.assertIn('const pacote = {...$pacote, sub: {mat: $pacote$sub$mat}};', result.code)
+        self.assertIn('const {Contador: C} = $pacote$sub$mat;', result.code)
+        self.assertIn('const u = $pacote$util;', result.code)
+        self.assertTrue(result.code.endswith('export {calcular};'))
+
+    def test_tree_shaking(self):
+        """Teste de remoção das funções e classes inalcançáveis"""
+        result = Bundler(jobs=1).build(self.entry)
+
+        self.assertEqual(result.removed, ['main._interna', 'pacote.sub.mat.Sobra', 'pacote.util.nunca_usada'])
+        self.assertNotIn('nunca_usada', result.code)
+        self.assertNotIn('class Sobra', result.code)
+        self.assertIn('function triplo', result.code)
+        self.assertLess(result.size_after, result.size_before)
+        self.assertEqual(result.size_after, len(result.code.encode('utf-8')))
+        # Subpacote vazio não gera closure
+        self.assertNotIn('$pacote$sub =', result.code)
+
+    def test_module_used_as_value_keeps_everything(self):
+        """Teste de módulo passado como valor: nenhuma definição removida"""
+        self.write('main.py', 'from pacote import util\n\nprint(len(dir(util)))')
+        result = Bundler(jobs=1).build(self.entry)
+        self.assertIn('function nunca_usada', result.code)
+        self.assertNotIn('pacote.util.nunca_usada', result.removed)
+
+    def test_star_import(self):
+        """Teste de from ... import * resolvido pelos nomes usados"""
+        self.write('main.py', 'from pacote.util import *\n\nprint(triplo(2))')
+        result = Bundler(jobs=1).build(self.entry)
+        self.assertIn('function triplo', result.code)
+        self.assertNotIn('function dobro', result.code)
+
+    def test_rebuild_uses_cache(self):
+        """Teste de nova montagem transpilando só os módulos alterados"""
+        bundler = Bundler(jobs=2)
+        first = bundler.build(self.entry)
+        self.assertEqual(first.cached, [])
+
+        self.write('pacote/util.py', 'def dobro(x):\n    return x + x\n\ndef triplo(x):\n    return 3 * x')
+        second = bundler.build(self.entry)
+        self.assertEqual(second.transpiled, ['pacote.util'])
+        self.assertEqual(second.cached, ['main', 'pacote', 'pacote.sub', 'pacote.sub.mat'])
+        self.assertIn('return x + x;', second.code)
+
+    def test_circular_import(self):
+        """Teste de importação circular reportada com o ciclo"""
+        self.write('a.py', 'from b import g\n\ndef f():\n    return g()')
+        self.write('b.py', 'from a import f\n\ndef g():\n    return f()')
+        self.write('main.py', 'from a import f\n\nprint(f())')
+        with self.assertRaisesRegex(BundleError, 'Importação circular: a -> b -> a'):
+            Bundler(jobs=1).build(self.entry)
+
+    def test_sibling_import_inside_package(self):
+        """Teste de from . import entre módulos de um pacote cujo __init__ os importa"""
+        self.write('pacote/__init__.py', 'from .util import dobro')
+        self.write('pacote/util.py', 'from . import base\n\ndef dobro(x):\n    return base.fator * x')
+        self.write('pacote/base.py', 'fator = 2')
+        self.write('main.py', 'from pacote import dobro\n\nprint(dobro(21))')
+        result = Bundler(jobs=1).build(self.entry)
+        self.assertEqual(result.modules, ['pacote.base', 'pacote.util', 'pacote', 'main'])
+        self.assertIn('const base = $pacote$base;', result.code)
+
+    def test_single_runtime_copy(self):
+        """Teste de uma só cópia das funções do runtime usadas pelos módulos"""
+        self.write('pacote/util.py', 'def dobro(x):\n    return x % 7 * 2\n\ndef triplo(x):\n    return len(x)')
+        self.write('main.py', 'from pacote.util import dobro\n\nprint(dobro(-3) % 5)')
+        result = Bundler(jobs=1).build(self.entry)
+        self.assertEqual(result.code.count("function $py_mod("), 1)
+        self.assertNotIn("$py_len", result.code)
+
+    def test_errors(self):
+        """Teste de entrada ausente e erro de sintaxe em um módulo importado"""
+        with self.assertRaisesRegex(BundleError, 'não encontrado'):
+            Bundler().build(self.path('nada.py'))
+        self.write('pacote/util.py', 'def (')
+        with self.assertRaisesRegex(BundleError, 'Erro de sintaxe'):
+            Bundler().build(self.entry)
+
+    def test_cli_bundle(self):
+        """Teste do --bundle na linha de comando com cache em disco"""
+        output = self.path('build/app.mjs')
+        os.makedirs(os.path.dirname(output))
+        self.assertEqual(cli_main([self.entry, output, '--bundle', '--minify', '-j', '1']), 0)
+        with open(output, encoding='utf-8') as f:
+            self.assertIn('function soma(a,b){return triplo(a)+b;}', f.read())
+        self.assertTrue(os.path.exists(self.path('build/.transpile-bundle-cache.sqlite')))
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_bundle_runs_in_node(self):
+        """Teste de execução do módulo ES gerado no node, com e sem compactação"""
+        for options in ({}, {'minify': True}):
+            with self.subTest(**options):
+                output = self.path('app.mjs')
+                with open(output, 'w', encoding='utf-8') as f:
+                    f.write(Bundler(jobs=1, **options).build(self.entry).code)
+                result = subprocess.run(['node', output], capture_output=True, text=True, timeout=30)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.strip(), '13 1.0 0')
+
+if __name__ == '__main__':
+    unittest.main()
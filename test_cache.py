@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import cache
+from cache import MemoryBackend, SQLiteBackend, TranspileCache, make_key
+from transpiler import transpile_python_to_js
+
+class TestCache(unittest.TestCase):
+
+    def test_key_depends_on_source_and_options(self):
+        """Teste da chave endereçada por conteúdo"""
+        self.assertEqual(make_key("x = 1"), make_key("x = 1", {}))
+        self.assertNotEqual(make_key("x = 1"), make_key("x = 2"))
+        self.assertNotEqual(make_key("x = 1"), make_key("x = 1", {'opcao': True}))
+
+    def test_version_covers_emission_modules(self):
+        """Teste da versão do transpilador: muda com qualquer módulo de emissão"""
+        directory = os.path.dirname(os.path.abspath(cache.__file__))
+        self.assertEqual(cache._versao_transpilador(directory), cache.TRANSPILER_VERSION)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in cache.EMISSION_MODULES:
+                with open(os.path.join(directory, name + '.py'), 'rb') as f:
+                    source = f.read()
+                with open(os.path.join(tmp, name + '.py'), 'wb') as f:
+                    f.write(source)
+            self.assertEqual(cache._versao_transpilador(tmp), cache.TRANSPILER_VERSION)
+
+            for name in ('optimizer', 'minifier', 'literals', 'shapes'):
+                with self.subTest(module=name):
+                    before = cache._versao_transpilador(tmp)
+                    with open(os.path.join(tmp, name + '.py'), 'ab') as f:
+                        f.write(b'\n')
+                    self.assertNotEqual(cache._versao_transpilador(tmp), before)
+
+    def test_hit_skips_transpilation(self):
+        """Teste de acerto sem nova transpilação"""
+        tc = TranspileCache(MemoryBackend())
+        first = tc.transpile("x = 42")
+
+        with mock.patch.object(cache.transpiler, 'transpile_python_to_js') as transpile:
+            second = tc.transpile("x = 42")
+            transpile.assert_not_called()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, transpile_python_to_js("x = 42"))
+        stats = tc.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_lru_eviction(self):
+        """Teste de remoção LRU ao exceder o limite"""
+        tc = TranspileCache(MemoryBackend(max_entries=2))
+        tc.transpile("a = 1")
+        tc.transpile("b = 2")
+        tc.transpile("a = 1")
+        tc.transpile("c = 3")
+
+        stats = tc.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['size'], 2)
+        self.assertIsNotNone(tc.backend.get(make_key("a = 1")))
+        self.assertIsNone(tc.backend.get(make_key("b = 2")))
+
+    def test_ttl_expiration(self):
+        """Teste de expiração por TTL"""
+        backend = MemoryBackend(ttl=10)
+        with mock.patch('cache.time.time', return_value=1000.0):
+            backend.set("k", "valor")
+        with mock.patch('cache.time.time', return_value=1011.0):
+            self.assertIsNone(backend.get("k"))
+
+    def test_sqlite_backend_shared(self):
+        """Teste do backend SQLite compartilhado entre instâncias"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            TranspileCache(SQLiteBackend(path)).transpile("x = 1")
+
+            other = TranspileCache(SQLiteBackend(path, max_entries=1))
+            self.assertEqual(other.transpile("x = 1"), "let x = 1;")
+            other.transpile("y = 2")
+
+            stats = other.stats()
+            self.assertEqual(stats['hits'], 1)
+            self.assertEqual(stats['misses'], 2)
+            self.assertEqual(stats['evictions'], 1)
+            self.assertEqual(stats['size'], 1)
+
+    def test_sqlite_hit_is_read_only(self):
+        """Teste de acerto no SQLite sem escrita: acessos e contadores gravados depois"""
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteBackend(os.path.join(tmp, 'cache.db'), max_entries=2)
+            backend.set('a', '1')
+            backend.set('b', '2')
+            conn = backend._connect()
+            changes = conn.total_changes
+            self.assertEqual(backend.get('a'), '1')
+            self.assertIsNone(backend.get('c'))
+            self.assertEqual(conn.total_changes, changes)
+            self.assertFalse(conn.in_transaction)
+
+            # O acesso pendente a 'a' conta na remoção LRU do próximo set
+            backend.set('c', '3')
+            self.assertEqual(backend.get('b'), None)
+            self.assertEqual(backend.get('a'), '1')
+            stats = backend.stats()
+            self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 2, 1))
+
+            with mock.patch.object(SQLiteBackend, 'FLUSH_INTERVAL', 0):
+                backend.get('a')
+            self.assertEqual(dict(conn.execute("SELECT name, value FROM counters"))['hits'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
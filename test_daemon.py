@@ -0,0 +1,208 @@
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import cli
+import daemon
+import daemon_server
+from transpiler import transpile_python_to_js
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "sockets Unix não suportados")
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        """Socket em um diretório temporário"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, 'transpiler.sock')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def start_daemon(self, idle_timeout=60):
+        server = daemon_server.TranspilerDaemon(self.socket_path, idle_timeout)
+        thread = threading.Thread(target=server.serve, daemon=True)
+        thread.start()
+        return server, thread
+
+    def test_transpile_status_stop(self):
+        """Teste de transpilação, status e encerramento pelo socket"""
+        server, thread = self.start_daemon()
+        python_code = 'def f(valor):\n    return valor + 1\n'
+
+        response = daemon.transpile(python_code, self.socket_path)
+        self.assertEqual(response['js_code'], transpile_python_to_js(python_code))
+        response = daemon.transpile(python_code, self.socket_path, minify=True)
+        self.assertEqual(response['js_code'], 'function f(a){return a+1;}')
+        self.assertEqual(response['saved_bytes'],
+                         len(transpile_python_to_js(python_code)) - len(response['js_code']))
+
+        status = daemon.request({'command': 'status'}, self.socket_path)
+        self.assertEqual(status['pid'], os.getpid())
+        self.assertEqual(status['requests'], 3)
+        self.assertEqual(status['cache']['misses'], 2)
+
+        self.assertFalse(daemon.request({'command': 'outro'}, self.socket_path)['success'])
+        daemon.request({'command': 'stop'}, self.socket_path)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request({'command': 'status'}, self.socket_path)
+
+    def test_idle_timeout(self):
+        """Teste de encerramento por ociosidade"""
+        server, thread = self.start_daemon(idle_timeout=0.2)
+        self.assertTrue(daemon.is_running(self.socket_path))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(daemon.is_running(self.socket_path))
+
+    def test_stale_socket(self):
+        """Teste de socket abandonado por um daemon que não está mais rodando"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        server, thread = self.start_daemon()
+        self.assertTrue(daemon.is_running(self.socket_path))
+        with self.assertRaises(RuntimeError):
+            daemon_server.TranspilerDaemon(self.socket_path)
+        daemon.request({'command': 'stop'}, self.socket_path)
+        thread.join(5)
+
+    def test_cli_uses_daemon_or_falls_back(self):
+        """Teste da CLI com e sem daemon rodando"""
+        source = os.path.join(self.tmp.name, 'entrada.py')
+        output = os.path.join(self.tmp.name, 'saida.js')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('x = 1\n')
+
+        with mock.patch.dict(os.environ, {'TRANSPILER_DAEMON_SOCKET': self.socket_path}):
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main([source, output])
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'let x = 1;')
+
+            server, thread = self.start_daemon()
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main([source, output, '--minify'])
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'let x=1;')
+            self.assertEqual(server.status()['cache']['misses'], 2)
+
+            daemon.request({'command': 'stop'})
+            thread.join(5)
+
+    def test_client_options(self):
+        """Teste das linhas de comando atendidas pelo caminho rápido do cliente"""
+        self.assertEqual(daemon.client_options(['a.py', 'a.js']), ('a.py', 'a.js', {}))
+        self.assertEqual(daemon.client_options(['a.py', 'a.js', '--minify', '-O', '--json-parse', '100']),
+                         ('a.py', 'a.js', {'optimize': True, 'minify': True, 'json_parse_min': 100}))
+        self.assertEqual(daemon.client_options(['a.py', '--passes=native_pow', 'a.js', '-O']),
+                         ('a.py', 'a.js', {'optimize': 'native_pow'}))
+        for argv in (['src/', '-o', 'build/'], ['a.py', 'a.js', '--watch'], ['a.py', 'a.js', '-j', '4'],
+                     ['@lista.txt'], ['a.py', 'a.js', '--passes'], ['a.py', 'a.js', '--json-parse', 'x']):
+            self.assertIsNone(daemon.client_options(argv), argv)
+
+    def test_thin_client_skips_transpiler_import(self):
+        """Teste da linha de comando pelo daemon sem importar o transpilador"""
+        source = os.path.join(self.tmp.name, 'entrada.py')
+        output = os.path.join(self.tmp.name, 'saida.js')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('def f(valor):\n    return valor + 1\n')
+        env = dict(os.environ, TRANSPILER_DAEMON_SOCKET=self.socket_path)
+        check = ("import sys, daemon; code = daemon.run_client(sys.argv[1:]); "
+                 "print(code, sorted(m for m in ('transpiler', 'cli', 'cache') if m in sys.modules))")
+
+        result = subprocess.run([sys.executable, '-c', check, source, output, '--minify'],
+                                capture_output=True, text=True, env=env, cwd=os.path.dirname(cli.__file__))
+        self.assertEqual(result.stdout.strip(), "None []")
+
+        minified = 'function f(a){return a+1;}'
+        saved = len(transpile_python_to_js('def f(valor):\n    return valor + 1\n')) - len(minified)
+        server, thread = self.start_daemon()
+        try:
+            result = subprocess.run([sys.executable, '-c', check, source, output, '--minify'],
+                                    capture_output=True, text=True, env=env, cwd=os.path.dirname(cli.__file__))
+            self.assertEqual(result.stdout.splitlines(), [
+                f"Código transpilado com sucesso: {source} -> {output}",
+                f"Modo compacto: {len(minified)} bytes ({saved} bytes economizados)",
+                "0 []",
+            ])
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual(f.read(), minified)
+        finally:
+            daemon.request({'command': 'stop'}, self.socket_path)
+            thread.join(5)
+
+    def test_socket_owner_checked(self):
+        """Teste do socket de outro usuário (ou que não é socket): a CLI transpila no próprio processo"""
+        source = os.path.join(self.tmp.name, 'entrada.py')
+        output = os.path.join(self.tmp.name, 'saida.js')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('x = 1\n')
+        with open(self.socket_path, 'w') as f:
+            f.write('')
+        with self.assertRaises(daemon.DaemonUnavailable):
+            daemon.request({'command': 'status'}, self.socket_path)
+        os.unlink(self.socket_path)
+
+        server, thread = self.start_daemon()
+        try:
+            with mock.patch('daemon.os.getuid', return_value=os.getuid() + 1), \
+                    mock.patch.object(daemon, 'unreachable_socket', None):
+                with self.assertRaises(daemon.DaemonUnavailable) as raised:
+                    daemon.request({'command': 'status'}, self.socket_path)
+                self.assertIn("não é um socket do usuário atual", str(raised.exception))
+                self.assertIsNone(daemon.run_client([source, output], self.socket_path))
+                self.assertEqual(daemon.unreachable_socket, self.socket_path)
+            self.assertEqual(server.requests, 0)
+        finally:
+            daemon.request({'command': 'stop'}, self.socket_path)
+            thread.join(5)
+
+    def test_private_default_directory(self):
+        """Teste do socket padrão fora do XDG_RUNTIME_DIR: subdiretório privado (0700)"""
+        environ = {k: v for k, v in os.environ.items()
+                   if k not in ('XDG_RUNTIME_DIR', 'TRANSPILER_DAEMON_SOCKET')}
+        with mock.patch.dict(os.environ, environ, clear=True), \
+                mock.patch('tempfile.tempdir', self.tmp.name):
+            path = daemon.default_socket_path()
+        directory = os.path.join(self.tmp.name, f"transpiler-{os.getuid()}")
+        self.assertEqual(path, os.path.join(directory, 'daemon.sock'))
+
+        self.socket_path = path
+        self.start_daemon()
+        self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+        daemon.request({'command': 'stop'}, path)
+
+    def test_client_fallback(self):
+        """Teste do caminho rápido: saída que não pode ser gravada e daemon consultado uma só vez"""
+        source = os.path.join(self.tmp.name, 'entrada.py')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('x = 1\n')
+        unwritable = os.path.join(self.tmp.name, 'nao', 'existe.js')
+
+        server, thread = self.start_daemon()
+        try:
+            self.assertIsNone(daemon.run_client([source, unwritable], self.socket_path))
+        finally:
+            daemon.request({'command': 'stop'}, self.socket_path)
+            thread.join(5)
+
+        with mock.patch.dict(os.environ, {'TRANSPILER_DAEMON_SOCKET': self.socket_path}), \
+                mock.patch.object(daemon, 'unreachable_socket', None):
+            self.assertIsNone(daemon.run_client([source, os.path.join(self.tmp.name, 'saida.js')]))
+            with mock.patch('daemon.request') as request:
+                self.assertIsNone(cli.transpile_via_daemon('x = 1\n'))
+            request.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
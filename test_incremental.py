@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from incremental import IncrementalTranspiler
+from transpiler import transpile_python_to_js
+
+MODULO = '''import_count = 0
+
+def soma(a, b):
+    return a + b
+
+@decorador
+def dobro(x):
+    if x > 0:
+        return x * 2
+    return 0
+
+class Conta:
+    def __init__(self, saldo):
+        self.saldo = saldo
+
+    def depositar(self, valor):
+        self.saldo += valor
+
+a = 1; b = 2
+for i in range(3):
+    print(soma(i, a))
+'''
+
+class TestIncremental(unittest.TestCase):
+
+    def test_same_output_as_full_transpile(self):
+        """Teste de saída idêntica à transpilação completa"""
+        inc = IncrementalTranspiler()
+        self.assertEqual(inc.transpile(MODULO), transpile_python_to_js(MODULO))
+
+    def test_only_changed_statement_is_emitted(self):
+        """Teste de reemissão apenas do statement alterado"""
+        inc = IncrementalTranspiler()
+        inc.transpile(MODULO)
+
+        editado = MODULO.replace("return x * 2", "return x * 3")
+        self.assertEqual(inc.transpile(editado), transpile_python_to_js(editado))
+        self.assertEqual(inc.stats['emitted'], 1)
+        self.assertEqual(inc.stats['reused'], 6)
+        self.assertFalse(inc.stats['full_parse'])
+
+    def test_body_extension_falls_back_to_full_parse(self):
+        """Teste de linha indentada acrescentada ao corpo da função anterior"""
+        inc = IncrementalTranspiler()
+        inc.transpile(MODULO)
+
+        editado = MODULO.replace("    return a + b\n", "    return a + b\n    print(a)\n")
+        self.assertEqual(inc.transpile(editado), transpile_python_to_js(editado))
+        self.assertTrue(inc.stats['full_parse'])
+        self.assertEqual(inc.stats['emitted'], 1)
+
+    def test_random_edits(self):
+        """Teste de sequência aleatória de edições linha a linha"""
+        rng = random.Random(1234)
+        candidatas = ["x = 1\n", "    y = 2\n", "print(x)\n", "\n", "def f():\n",
+                      "if x:\n", "        pass\n", "# comentario\n", "z = [1,\n", "2]\n"]
+        inc = IncrementalTranspiler()
+        lines = MODULO.splitlines(keepends=True)
+        validas = 0
+
+        for _ in range(500):
+            anterior = list(lines)
+            position = rng.randrange(len(lines) + 1)
+            operation = rng.random()
+            if operation < 0.4 and lines:
+                del lines[min(position, len(lines) - 1)]
+            elif operation < 0.7:
+                lines.insert(position, rng.choice(candidatas))
+            elif lines:
+                lines[min(position, len(lines) - 1)] = rng.choice(candidatas)
+
+            codigo = "".join(lines)
+            resultado = inc.transpile(codigo)
+            self.assertEqual(resultado, transpile_python_to_js(codigo))
+
+            # Desfaz as edições inválidas para continuar em código válido
+            if resultado.startswith("// Erro"):
+                lines = anterior
+            else:
+                validas += 1
+
+        self.assertGreater(validas, 100)
+
+if __name__ == '__main__':
+    unittest.main()
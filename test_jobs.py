@@ -0,0 +1,84 @@
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from jobs import FileJobStore, JobQueue, MemoryJobStore, QueueFull
+
+class TestJobs(unittest.TestCase):
+
+    def test_file_store_shared(self):
+        """Teste do armazenamento em arquivos visto por outra fila"""
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = JobQueue(workers=1, store=FileJobStore(tmp))
+            try:
+                job = queue.submit("x = 1")
+                other = JobQueue(store=FileJobStore(tmp))
+                result = other.get(job['job_id'], wait=10)
+            finally:
+                queue.shutdown()
+
+        self.assertEqual(result['status'], 'done')
+        self.assertEqual(result['js_code'], 'let x = 1;')
+
+    def test_backpressure(self):
+        """Teste do limite de jobs pendentes"""
+        queue = JobQueue(workers=1, max_pending=1)
+        try:
+            job = queue.submit("x = 1")
+            with self.assertRaises(QueueFull):
+                queue.submit("y = 2")
+            queue.get(job['job_id'], wait=10)
+            queue.submit("y = 2")
+        finally:
+            queue.shutdown()
+
+    def test_timeout_releases_slot(self):
+        """Teste do prazo do job: marcado como falho e vaga liberada"""
+        queue = JobQueue(workers=1, max_pending=1, timeout=0.05)
+        try:
+            job = queue.submit('def f(a):\n    return a + 1\n' * 20000)
+            result = queue.get(job['job_id'], wait=10)
+            self.assertEqual(result['status'], 'failed')
+            self.assertIn('Tempo limite', result['error'])
+            self.assertEqual(queue.stats()['pending'], 0)
+
+            # O processo do pool também para e atende o job seguinte
+            queue.timeout = 10
+            job = queue.submit("x = 1")
+            self.assertEqual(queue.get(job['job_id'], wait=10)['status'], 'done')
+        finally:
+            queue.shutdown()
+
+    def test_broken_pool_recreated(self):
+        """Teste de recriação do pool depois da morte de um processo"""
+        queue = JobQueue(workers=1)
+        try:
+            job = queue.submit("x = 1")
+            queue.get(job['job_id'], wait=10)
+            executor = queue._executor
+            for process in list(executor._processes.values()):
+                process.kill()
+                process.join()
+            deadline = time.monotonic() + 10
+            while not executor._broken and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            job = queue.submit("y = 2")
+            self.assertEqual(queue.get(job['job_id'], wait=10)['js_code'], 'let y = 2;')
+            self.assertIsNot(queue._executor, executor)
+        finally:
+            queue.shutdown()
+
+    def test_ttl_expiration(self):
+        """Teste de expiração dos resultados"""
+        store = MemoryJobStore()
+        queue = JobQueue(store=store, ttl=60)
+        job = queue.complete("let x = 1;")
+
+        with mock.patch('jobs.time.time', return_value=time.time() + 61):
+            queue._last_purge = 0
+            self.assertIsNone(queue.get(job['job_id']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from live import LiveSession, LiveSessions, SessionLimit, diff_lines, sessions_from_env, split_lines
+from transpiler import transpile_python_to_js
+
+CODIGO = '''def soma(a, b):
+    return a + b
+
+def dobro(x):
+    return x * 2
+
+print(soma(1, 2))
+'''
+
+def parse_event(message):
+    """Nome e dados de uma mensagem SSE"""
+    fields = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    return fields['event'], json.loads(fields['data'])
+
+def apply_patch(lines, patch):
+    return lines[:patch['start']] + patch['lines'] + lines[patch['end']:]
+
+class TestLive(unittest.TestCase):
+
+    def test_diff_lines(self):
+        """Teste do menor trecho alterado entre duas saídas"""
+        self.assertEqual(diff_lines(['a', 'b', 'c'], ['a', 'x', 'c']), (1, 2, ['x']))
+        self.assertEqual(diff_lines(['a', 'b'], ['a', 'b', 'c']), (2, 2, ['c']))
+        self.assertEqual(diff_lines(['a', 'a'], ['a']), (1, 2, []))
+        self.assertEqual(diff_lines(['a'], ['a']), (1, 1, []))
+        self.assertEqual(diff_lines([], ['a']), (0, 0, ['a']))
+
+    def test_patches_rebuild_output(self):
+        """Teste de patches que reconstroem a saída completa a cada edição"""
+        session = LiveSession('s')
+        events = session.events(keepalive=0.01)
+        self.assertTrue(next(events).startswith('retry:'))
+        self.assertEqual(parse_event(next(events)), ('snapshot', {'version': 0, 'lines': []}))
+
+        lines = []
+        edits = [CODIGO, CODIGO.replace('x * 2', 'x * 3'), CODIGO + 'print(dobro(4))\n', 'x = 1\n']
+        for version, code in enumerate(edits, 1):
+            session.submit(version, code)
+            event, patch = parse_event(next(events))
+            self.assertEqual((event, patch['version']), ('patch', version))
+            lines = apply_patch(lines, patch)
+            self.assertEqual('\n'.join(lines), transpile_python_to_js(code))
+
+        # Só a linha alterada é enviada
+        session.submit(5, 'x = 2\n')
+        self.assertEqual(parse_event(next(events))[1]['lines'], ['let x = 2;'])
+
+        session.submit(6, 'def f(:\n')
+        event, data = parse_event(next(events))
+        self.assertEqual(event, 'syntax-error')
+        self.assertEqual(session.lines, ['let x = 2;'])
+
+        self.assertEqual(next(events), ': keepalive\n\n')
+        session.close()
+        self.assertEqual(list(events), [])
+
+    def test_only_latest_edit(self):
+        """Teste de edições substituídas antes de transpilar e versões antigas ignoradas"""
+        session = LiveSession('s')
+        events = session.events(keepalive=0.01)
+        next(events), next(events)
+
+        for version in range(1, 6):
+            self.assertTrue(session.submit(version, f'x = {version}\n'))
+        self.assertFalse(session.submit(3, 'x = 3\n'))
+
+        event, patch = parse_event(next(events))
+        self.assertEqual((patch['version'], patch['lines']), (5, ['let x = 5;']))
+        self.assertEqual(session.stats['superseded'], 4)
+        self.assertEqual(session.stats['transpiled'], 1)
+
+    def test_cancel_obsolete_work(self):
+        """Teste de transpilação cancelada quando chega uma versão mais nova"""
+        session = LiveSession('s')
+        emit = session.incremental.transpiler.emit_statement
+
+        def newer_edit(stmt):
+            session.submit(2, 'y = 2\n')
+            return emit(stmt)
+
+        session.submit(1, CODIGO)
+        with mock.patch.object(session.incremental.transpiler, 'emit_statement', side_effect=newer_edit):
+            self.assertIsNone(session.process(1, CODIGO))
+        self.assertEqual(session.stats['cancelled'], 1)
+        self.assertEqual(session.lines, [])
+
+        self.assertEqual(session.process(2, 'y = 2\n')[1]['lines'], ['let y = 2;'])
+
+    def test_new_connection_replaces_old(self):
+        """Teste de reconexão: a conexão anterior é encerrada e a nova recebe o snapshot"""
+        session = LiveSession('s')
+        session.submit(1, 'x = 1\n')
+        session.process(1, 'x = 1\n')
+        first = session.events(keepalive=0.01)
+        next(first), next(first)
+
+        second = session.events(keepalive=0.01)
+        next(second)
+        self.assertEqual(parse_event(next(second)), ('snapshot', {'version': 1, 'lines': split_lines('let x = 1;')}))
+        self.assertEqual(list(first), [])
+        self.assertTrue(session.connected)
+
+    def test_sessions_limit_and_expiry(self):
+        """Teste do limite de sessões e da expiração das sessões ociosas"""
+        sessions = LiveSessions(max_sessions=2, ttl=60)
+        first = sessions.create()
+        second = sessions.create(minify=True)
+        with self.assertRaises(SessionLimit):
+            sessions.create()
+
+        self.assertTrue(sessions.close(second.session_id))
+        self.assertIsNone(sessions.get(second.session_id))
+        self.assertIs(sessions.get(first.session_id), first)
+
+        first.last_activity = time.monotonic() - 120
+        sessions.create()
+        self.assertIsNone(sessions.get(first.session_id))
+        self.assertEqual(sessions.stats()['sessions'], 1)
+
+    def test_cpu_limit_in_thread(self):
+        """Teste do limite de CPU por edição, aplicado também fora da thread principal"""
+        session = LiveSession('s', cpu_limit=0.01)
+        python_code = 'def f(a):\n    return a + 1\n' * 5000
+        session.submit(1, python_code)
+        outcome = []
+        thread = threading.Thread(target=lambda: outcome.append(session.process(1, python_code)))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(outcome, [('cpu-limit', {'version': 1, 'error': 'Tempo de CPU da edição excedido'})])
+        self.assertEqual(session.stats['cpu_limited'], 1)
+        self.assertEqual(session.lines, [])
+        session.submit(2, 'x = 1\n')
+        self.assertEqual(session.process(2, 'x = 1\n')[1]['lines'], ['let x = 1;'])
+
+        sessions = LiveSessions(cpu_limit=0.5)
+        self.assertEqual(sessions.create().cpu_limit, 0.5)
+
+    @unittest.skipIf(importlib.util.find_spec('gunicorn') is None, "gunicorn não instalado")
+    def test_serve_live_single_worker(self):
+        """Teste do serve.py: modo ao vivo só com um único worker gthread"""
+        import serve
+
+        with mock.patch.dict(os.environ), contextlib.redirect_stderr(io.StringIO()):
+            options = serve.server_options(['--live'])
+            self.assertEqual((options['workers'], options['worker_class'], options['max_requests']),
+                             (1, 'gthread', 0))
+            self.assertGreaterEqual(options['threads'], serve.LIVE_THREADS)
+            self.assertEqual(os.environ['TRANSPILER_LIVE'], '1')
+            with self.assertRaises(SystemExit):
+                serve.server_options(['--live', '--workers', '4'])
+
+            os.environ.pop('TRANSPILER_LIVE')
+            options = serve.server_options(['--workers', '4'])
+            self.assertEqual((options['workers'], options['worker_class']), (4, 'sync'))
+            self.assertEqual(os.environ['TRANSPILER_LIVE'], '0')
+            self.assertEqual(sessions_from_env().enabled, False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import parallel
+from benchmarks.corpus import generate
+from parallel import partition, transpile_parallel, unit_boundaries
+from transpiler import transpile_python_to_js
+
+class TestParallel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Pool compartilhado pelos testes"""
+        cls.pool = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_unit_boundaries(self):
+        """Teste dos pontos de corte entre statements de nível superior"""
+        lines = ['@dec\n', 'def f():\n', '    pass\n', '\n', 'try:\n', '    x = 1\n',
+                 'except E:\n', '    pass\n', 'y = f(1,\n', ')\n', '# comentário\n', 'z = 2\n']
+        self.assertEqual(unit_boundaries(lines), [4, 8, 11])
+
+    def test_partition_cost_aware(self):
+        """Teste de classe enorme isolada em um trecho e trechos cobrindo o módulo"""
+        huge = ['class Grande:\n'] + [f'    def m{i}(self):\n        return {i}\n' for i in range(500)]
+        small = [f'def f{i}():\n    return {i}\n' for i in range(200)]
+        lines = "".join(small[:100] + huge + small[100:]).splitlines(keepends=True)
+
+        chunks = partition(lines, jobs=2)
+        self.assertEqual(chunks, [(0, 200), (200, 1201), (1201, 1401)])
+
+    def test_byte_identical(self):
+        """Teste de saída idêntica à sequencial, com e sem opções"""
+        source = generate('wide_module', 0.2)[0] + generate('class_heavy', 0.3)[0]
+        for options in ({}, {'minify': True}, {'optimize': True}):
+            with self.subTest(options=options):
+                self.assertEqual(transpile_parallel(source, executor=self.pool, **options),
+                                 transpile_python_to_js(source, **options))
+
+    def test_fallback(self):
+        """Teste de trechos que não podem ser analisados isoladamente"""
+        block = ('@dec\ndef f(a):\n    return a\n\nx = """\nlinha = 1\n"""\n'
+                 'if False:\n    pass\nfoo(1,\n2)\n')
+        with mock.patch.object(parallel, 'PARALLEL_MIN_LINES', 1):
+            source = block * 40
+            self.assertEqual(transpile_parallel(source, executor=self.pool),
+                             transpile_python_to_js(source))
+
+            source = block * 20 + 'def g(:\n    pass\n' + block * 20
+            self.assertEqual(transpile_parallel(source, executor=self.pool),
+                             transpile_python_to_js(source))
+            self.assertIn("line 221", transpile_parallel(source, executor=self.pool))
+
+if __name__ == '__main__':
+    unittest.main()
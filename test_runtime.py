@@ -0,0 +1,195 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from incremental import IncrementalTranspiler
+from runtime import runtime_code, used_helpers, with_runtime
+from transpiler import PythonToJSTranspiler, transpile_iter, transpile_python_to_js
+
+# Operações cuja semântica no Python difere da tradução nativa em JavaScript
+SEMANTICS = """
+def f(dados, n):
+    s = {1, 2, 3}
+    t = {3, 4}
+    d = {"a": 1}
+    lista = [1, 2]
+    print(-7 % 3, 7 % -3, -7 // 2, (n + 1) % 3, (n + 1) // 2, -(n - 10), not n == 4)
+    print(1 < n < 10, 1 < n > 10, n - (n - 1), 2 ** 3 ** 2, (2 ** 3) ** 2, (n & 1) == 1)
+    print(len(dados), len(s), len(d), len("abc"), len(list(range(1, 10, 3))), sum_(range(5, 0, -2)))
+    print(3 in dados, 9 in dados, "b" in "abc", "a" in d, 2 in range(4))
+    print(len(s | t), len(s & t), len(s - t), len(s ^ t), len(s.union([9])), s.issubset({1, 2, 3, 4}))
+    print(d.get("a"), d.get("z", 0), d.setdefault("b", 5), d.pop("a"), len(d), d.pop("q", 7))
+    print(len(lista + [3]), (n or 0) and (n or 1), n is None, None is not n)
+    total = 10
+    total //= 3
+    total %= 2
+    print(total, sum_(x % 4 for x in range(-6, 6)))
+
+def sum_(valores):
+    r = 0
+    for x in valores:
+        r += x
+    return r
+
+f([1, 2, 3], 5)
+"""
+
+class TestRuntime(unittest.TestCase):
+
+    def test_only_used_helpers(self):
+        """Teste de inclusão só das funções do runtime usadas, uma vez cada"""
+        js_code = transpile_python_to_js("x = a % b\ny = c % d")
+        self.assertTrue(js_code.startswith("let x = $py_mod(a, b);\nlet y = $py_mod(c, d);\n"
+                                           "// Runtime Python (runtime.py)\nfunction $py_mod(a, b) {"))
+        self.assertEqual(js_code.count("function $py_"), 1)
+        # Sem operações que precisem do runtime a saída não muda
+        self.assertEqual(transpile_python_to_js("x = a + b * 2"), "let x = a + b * 2;")
+
+        # Dependências entre funções do runtime
+        self.assertEqual(used_helpers("$py_symmetric_difference(a, b)"), {'symmetric_difference', 'difference'})
+        self.assertEqual(with_runtime("let x = 1;"), "let x = 1;")
+        self.assertIn("function $py_difference(a, b)", runtime_code(['symmetric_difference']))
+
+    def test_compact_runtime(self):
+        """Teste do runtime no modo compacto"""
+        js_code = transpile_python_to_js("x = len(a)", minify=True)
+        self.assertTrue(js_code.startswith("let x=$py_len(a);function $py_len(x){const n=x.length;"))
+        self.assertNotIn("\n", js_code)
+        self.assertNotIn("//", js_code)
+
+    def test_partial_outputs_identical(self):
+        """Teste de saída idêntica emitida inteira, em streaming e de forma incremental"""
+        for options in ({}, {'minify': True}):
+            with self.subTest(**options):
+                js_code = transpile_python_to_js(SEMANTICS, **options)
+                self.assertEqual(''.join(transpile_iter(SEMANTICS, **options)), js_code)
+                incremental = IncrementalTranspiler(PythonToJSTranspiler(**options))
+                self.assertEqual(incremental.transpile(SEMANTICS), js_code)
+                self.assertEqual(incremental.transpile(SEMANTICS + "\nf([], 0)\n"),
+                                 transpile_python_to_js(SEMANTICS + "\nf([], 0)\n", **options))
+
+    def test_lowering(self):
+        """Teste das operações convertidas conforme a forma dos operandos"""
+        js_code = transpile_python_to_js("""
+def f(a, n):
+    s = {1}
+    d = {}
+    lista = []
+    return [n // 2, n // a, n // -2, len(lista), len(a), a in lista, a in "xy", a in n,
+            s | {2}, d | {"k": 1}, lista + [1], n | 1, d.get(a), d.items(), s.union(lista), range(n)]
+""")
+        self.assertIn("return [Math.floor(n / 2), $py_floordiv(n, a), Math.floor(n / -2), lista.length, "
+                      "$py_len(a), lista.includes(a), \"xy\".includes(a), $py_in(a, n), "
+                      "$py_union(s, new Set([2])), {...d, ...{\"k\": 1}}, [...lista, ...[1]], n | 1, "
+                      "$py_get(d, a), Object.entries(d), $py_union(s, lista), $py_range(n)];", js_code)
+
+        # range com passo constante continua um laço com contador
+        js_code = transpile_python_to_js("for i in range(9, 0, -3):\n    f(i)\nfor i in range(0, n, k):\n    f(i)")
+        self.assertTrue(js_code.startswith("for (let i = 9; i > 0; i += -3) {\n    f(i);\n}\n"
+                                           "for (let i of $py_range(0, n, k)) {"))
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_node_matches_python(self):
+        """Teste no Node.js: mesmos resultados do Python, com e sem compactação"""
+        expected = subprocess.run([sys.executable, '-c', SEMANTICS], capture_output=True,
+                                  text=True, check=True).stdout
+        # Só a escrita de booleanos difere entre print e console.log
+        expected = expected.replace("True", "true").replace("False", "false")
+        for options in ({}, {'minify': True}):
+            with self.subTest(**options), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'semantica.js')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(transpile_python_to_js(SEMANTICS, **options))
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout, expected)
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_node_floordiv_mod_helpers(self):
+        """Teste no Node.js de $py_floordiv e $py_mod contra // e % do Python"""
+        values = [-7, -6, -3.5, -1, 0, 1, 2.5, 3, 7, 10]
+        divisors = [-4, -3, -2.5, -1, 1, 2, 2.5, 3, 4]
+        pairs = [(a, b) for a in values for b in divisors]
+        script = runtime_code(['floordiv', 'mod']) + (
+            f"\nfor (const [a, b] of {json.dumps(pairs)}) {{ console.log($py_floordiv(a, b), $py_mod(a, b)); }}\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'divisao.js')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(script)
+            result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        for (a, b), line in zip(pairs, result.stdout.splitlines()):
+            with self.subTest(a=a, b=b):
+                floordiv, mod = (float(x) for x in line.split())
+                self.assertEqual((floordiv, mod), (a // b, a % b))
+        self.assertEqual(len(result.stdout.splitlines()), len(pairs))
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_node_range_value(self):
+        """Teste no Node.js do range como valor: percorrido duas vezes, len e índices"""
+        python_code = ("r = range(4)\ntotal = 0\nfor i in r:\n    total += i\nfor i in r:\n    total += i\n"
+                       "print(total, len(range(5)), range(5)[2], r[-1], len(range(10, 0, -3)), 3 in r)")
+        for options in ({}, {'minify': True}):
+            with self.subTest(**options), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'range.js')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(transpile_python_to_js(python_code, **options))
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout, "12 5 2 3 4 true\n")
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_node_augassign_single_evaluation(self):
+        """Teste no Node.js de //=, %= e **= com objeto e índice avaliados uma só vez"""
+        python_code = """
+chamadas = [0]
+def indice():
+    chamadas[0] += 1
+    return 0
+def objeto():
+    chamadas[0] += 1
+    return caixa
+class Caixa:
+    pass
+caixa = Caixa()
+caixa.v = 9
+a = [-7]
+a[indice()] //= 2
+a[indice()] %= 3
+objeto().v **= 2
+a[0] //= 1
+print(a[0], caixa.v, chamadas[0])
+"""
+        js_code = transpile_python_to_js(python_code)
+        self.assertIn("{\n    const $key = indice();\n    a[$key] = Math.floor(a[$key] / 2);\n}\n", js_code)
+        self.assertIn("a[0] = Math.floor(a[0] / 1);", js_code)
+        expected = subprocess.run([sys.executable, '-c', python_code], capture_output=True,
+                                  text=True, check=True).stdout
+        for options in ({}, {'minify': True}):
+            with self.subTest(**options), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'aumentada.js')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(transpile_python_to_js(python_code, **options))
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout, expected)
+
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_node_errors(self):
+        """Teste no Node.js de divisão por zero e range com passo zero"""
+        for python_code in ("print(1 // 0)", "print(1 % 0)", "for i in range(1, 2, 0):\n    print(i)",
+                            "print(range(3)[3])"):
+            with self.subTest(python_code=python_code), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'erro.js')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(transpile_python_to_js(python_code))
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+                self.assertNotEqual(result.returncode, 0)
+                self.assertIn("RangeError", result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,18 @@
+import ast
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
-from transpiler import transpile_python_to_js
+from unittest import mock
+
+import transpiler
+from benchmarks.corpus import generate
+from profiling import TranspileProfile
+from transpiler import PythonToJSTranspiler, _deep_gate, _DeepGate, transpile_iter, transpile_python_to_js
 
 class TestTranspiler(unittest.TestCase):
     
@@ -108,7 +121,9 @@ while x < 10:
         """Teste da função len"""
         python_code = "tamanho = len(lista)"
         result = transpile_python_to_js(python_code)
-        self.assertIn("lista.length", result)
+        self.assertIn("let tamanho = $py_len(lista);", result)
+        result = transpile_python_to_js("def f():\n    lista = []\n    return len(lista) + len('abc')")
+        self.assertIn('return lista.length + "abc".length;', result)
     
     def test_multiple_statements(self):
         """Teste de múltiplas declarações"""
@@ -134,6 +149,721 @@ if x > 0:
         result = transpile_python_to_js(python_code)
         self.assertIn("if (x > 0)", result)
         self.assertIn("if (x < 10)", result)
+    
+    def test_nested_block_indentation(self):
+        """Teste da indentação de blocos aninhados"""
+        python_code = """
+def f(x):
+    if x > 0:
+        for i in range(x):
+            print(i)
+    elif x < 0:
+        return -1
+    else:
+        return 0
+"""
+        expected = """function f(x) {
+    if (x > 0) {
+        for (let i = 0; i < x; i++) {
+            console.log(i);
+        }
+    } else if (x < 0) {
+        return -1;
+    } else {
+        return 0;
+    }
+}"""
+        self.assertEqual(transpile_python_to_js(python_code), expected)
+    
+    def test_transpile_iter(self):
+        """Teste de transpilação em streaming"""
+        with open('exemplo.py', encoding='utf-8') as f:
+            python_code = f.read()
+        
+        chunks = list(transpile_iter(python_code))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), transpile_python_to_js(python_code))
+        self.assertEqual(list(transpile_iter("def (")), [transpile_python_to_js("def (")])
+    
+    def test_transpile_iter_small_blocks(self):
+        """Teste de streaming com cortes no meio de strings, parênteses e decoradores"""
+        class SmallBlocks(PythonToJSTranspiler):
+            STREAM_BLOCK_LINES = 1
+        
+        python_code = '''texto = """
+x = 1
+"""
+lista = [
+1,
+2]
+@decorador
+def f(a):
+    return a
+if lista:
+    print(1)
+else:
+    print(2)
+'''
+        chunks = list(SmallBlocks().transpile_iter(python_code))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual("".join(chunks), transpile_python_to_js(python_code))
+        
+        chunks = list(SmallBlocks().transpile_iter(python_code + "def (\n"))
+        self.assertEqual(chunks[:-1], list(SmallBlocks().transpile_iter(python_code)))
+        self.assertIn("line 14", chunks[-1])
+    
+    def test_register_handler(self):
+        """Teste de registro de visitante por decorador"""
+        class Plugin(PythonToJSTranspiler):
+            pass
+        
+        @Plugin.register(ast.Pass)
+        def visit_pass(transpiler, node):
+            transpiler.writer.line("// pass")
+        
+        self.assertEqual(Plugin().transpile("pass"), "// pass")
+        self.assertEqual(transpile_python_to_js("pass"), "// Não implementado: Pass")
+    
+    def test_profile(self):
+        """Teste de instrumentação por visitante"""
+        python_code = "x = 1\nif x > 0:\n    print(x)"
+        profile = TranspileProfile()
+        js_code = PythonToJSTranspiler(profiler=profile).transpile(python_code)
+        
+        self.assertEqual(js_code, transpile_python_to_js(python_code))
+        data = profile.as_dict()
+        self.assertEqual(data['transpilations'], 1)
+        self.assertEqual(data['output_bytes'], len(js_code.encode('utf-8')))
+        self.assertEqual(data['visitors']['Name']['calls'], 4)
+        self.assertEqual(data['visitors']['If']['calls'], 1)
+        self.assertEqual(data['nodes'], sum(v['calls'] for v in data['visitors'].values()))
+        self.assertIn('transpiler_visitor_calls_total{visitor="Assign"} 1', profile.to_prometheus())
+        
+        # Sem instrumentação o método da classe não é substituído
+        self.assertNotIn('visit_node', vars(PythonToJSTranspiler()))
+    
+    def test_long_binop_chain(self):
+        """Teste de expressão com 100 mil termos"""
+        python_code = "x = " + " + ".join(f"a{i}" for i in range(100000)) + "\nprint(x // 2 - 1)"
+        limit = sys.getrecursionlimit()
+        js_code = transpile_python_to_js(python_code)
+        
+        self.assertTrue(js_code.startswith("let x = a0 + a1 + a2"))
+        self.assertTrue(js_code.endswith(" + a99999;\nconsole.log(Math.floor(x / 2) - 1);"))
+        self.assertEqual(sys.getrecursionlimit(), limit)
+    
+    def test_deep_runs_isolated(self):
+        """Teste de transpilação normal em outra thread sem o limite de recursão elevado"""
+        python_code = "x = " + " + ".join(f"a{i}" for i in range(50000))
+        limit = sys.getrecursionlimit()
+        seen = set()
+        done = threading.Event()
+        
+        def normal():
+            while not done.is_set():
+                with _deep_gate.shared():
+                    seen.add(sys.getrecursionlimit())
+                transpile_python_to_js("y = 1")
+        
+        thread = threading.Thread(target=normal)
+        thread.start()
+        try:
+            for _ in range(3):
+                transpile_python_to_js(python_code)
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(seen, {limit})
+    
+    def test_deep_emit_retry_clean_state(self):
+        """Teste da emissão refeita com run_deep: sem escopos nem medições da tentativa que estourou"""
+        python_code = ("def f():\n    s = {1, 2}\n    y = " + "-" * 600 + "a\n    return y\n"
+                       "s = [1, 2]\nprint(3 in s)\n")
+        self.assertIn("console.log($py_in(3, s));", transpile_python_to_js(python_code))
+        
+        profile = TranspileProfile()
+        js_code = PythonToJSTranspiler(profiler=profile, optimize=True).transpile(python_code)
+        self.assertEqual(js_code, transpile_python_to_js(python_code, optimize=True))
+        data = profile.as_dict()
+        self.assertTrue(data['passes'])
+        self.assertEqual(data['visitors']['FunctionDef']['calls'], 1)
+        self.assertEqual(data['nodes'], sum(v['calls'] for v in data['visitors'].values()))
+    
+    def test_deep_gate_async_exception(self):
+        """Teste do portão de run_deep depois de uma exceção assíncrona (SIGPROF) ao entrar"""
+        class InterruptedSet(set):
+            def add(self, item):
+                super().add(item)
+                raise TimeoutError("SIGPROF")
+        
+        gate = _DeepGate()
+        gate._shared = InterruptedSet()
+        with self.assertRaises(TimeoutError):
+            with gate.shared():
+                pass
+        self.assertEqual(gate._shared, set())
+        
+        # Espera por exclusive() interrompida: os demais não ficam segurados
+        gate = _DeepGate()
+        with mock.patch.object(gate._condition, 'wait', side_effect=TimeoutError("SIGPROF")):
+            with gate.shared():
+                with self.assertRaises(TimeoutError):
+                    with gate.exclusive():
+                        pass
+        self.assertEqual((gate._waiting, gate._exclusive), (0, None))
+        
+        entered = []
+        
+        def exclusive():
+            with gate.exclusive():
+                entered.append(True)
+        
+        thread = threading.Thread(target=exclusive)
+        thread.start()
+        thread.join(5)
+        self.assertEqual(entered, [True])
+    
+    def test_long_elif_chain(self):
+        """Teste de cadeia com 10 mil elifs"""
+        python_code = "def f(a):\n    if a == 0:\n        x = 0\n"
+        python_code += "".join(f"    elif a == {i}:\n        x = {i}\n" for i in range(1, 10000))
+        python_code += "    else:\n        x = -1\n    return x"
+        js_code = transpile_python_to_js(python_code)
+        
+        self.assertEqual(js_code.count("} else if (a === "), 9999)
+        self.assertIn("} else if (a === 9999) {\n        let x = 9999;\n    } else {", js_code)
+        self.assertTrue(js_code.endswith("    }\n    return x;\n}"))
+    
+    def test_split_elif_chain_ast(self):
+        """Teste de AST idêntica (inclusive posições) ao dividir cadeias de elif"""
+        python_code = 'def f(a):\n    """doc\nstring"""\n    if a == 0:\n        x = 0\n'
+        python_code += "".join(
+            f'    elif a == {i}:\n        s = """a\n  b""" + g(1,\n  2)\n\n        # c\n'
+            f'        if b:\n            y = 1\n        elif c:\n            y = 2\n'
+            for i in range(1, 30))
+        python_code += "    else:\n        x = -1\n    return x\nprint(f(3))\n"
+        
+        parse = ast.parse
+        def limited_parse(code, *args, **kwargs):
+            # Simula o limite do parser com cadeias de mais de 7 elifs
+            if len(re.findall(r"(?m)^\s*elif a ==", code)) > 7:
+                raise MemoryError
+            return parse(code, *args, **kwargs)
+        
+        with mock.patch.object(transpiler, 'LADDER_CHUNK', 7), \
+             mock.patch.object(ast, 'parse', limited_parse):
+            tree = PythonToJSTranspiler().parse(python_code)
+        
+        self.assertEqual(ast.dump(tree, include_attributes=True),
+                         ast.dump(parse(python_code), include_attributes=True))
+    
+    def test_fold_constants(self):
+        """Teste de dobra de constantes só quando o resultado é o mesmo em JavaScript"""
+        python_code = 'a = 2 * 60 + 1\nb = 7 // 2\nc = -7 % 3\nd = 2 ** 60 + 1\ne = "a" + "b"\nf = not 0'
+        js_code = transpile_python_to_js(python_code, optimize=['fold_constants'])
+        
+        self.assertIn("let a = 121;", js_code)
+        self.assertIn("let b = 3;", js_code)
+        self.assertIn("let c = $py_mod(-7, 3);", js_code)
+        self.assertIn("let d = Math.pow(2, 60) + 1;", js_code)
+        self.assertIn('let e = "ab";', js_code)
+        self.assertIn("let f = true;", js_code)
+    
+    def test_dead_code(self):
+        """Teste de remoção de ramos mortos e de código inalcançável"""
+        python_code = """
+def f(x):
+    if 1 > 2:
+        print("nunca")
+    elif True:
+        print("sempre")
+    else:
+        print("outro")
+    while False:
+        x += 1
+    if True:
+        y = x
+    return y
+    print("morto")
+"""
+        js_code = transpile_python_to_js(python_code, optimize=True)
+        
+        self.assertNotIn("nunca", js_code)
+        self.assertNotIn("outro", js_code)
+        self.assertNotIn("while", js_code)
+        self.assertNotIn("morto", js_code)
+        self.assertIn('    console.log("sempre");', js_code)
+        # O bloco é mantido para não mudar o escopo do let
+        self.assertIn("    if (true) {\n        let y = x;\n    }", js_code)
+    
+    def test_native_pow(self):
+        """Teste de ** nativo com parênteses onde a precedência exige"""
+        python_code = "a = x ** 2\nb = -x ** 2\nc = (x + 1) ** (y - 1)\nd = (-2) ** x\nx **= 3"
+        js_code = transpile_python_to_js(python_code, optimize=['native_pow'])
+        
+        self.assertIn("let a = x ** 2;", js_code)
+        self.assertIn("let b = -(x ** 2);", js_code)
+        self.assertIn("let c = (x + 1) ** (y - 1);", js_code)
+        self.assertIn("let d = (-2) ** x;", js_code)
+        self.assertIn("x **= 3;", js_code)
+        self.assertNotIn("Math.pow", js_code)
+    
+    def test_optimize_options(self):
+        """Teste das opções de otimização"""
+        python_code = "if False:\n    a = 2 ** 3\nb = 2 ** 3"
+        
+        self.assertEqual(transpile_python_to_js(python_code),
+                         transpile_python_to_js(python_code, optimize=False))
+        self.assertIn("if (false)", transpile_python_to_js(python_code))
+        self.assertEqual(transpile_python_to_js(python_code, optimize=True), "let b = 8;")
+        self.assertEqual("".join(transpile_iter(python_code, optimize=True)), "let b = 8;")
+        with self.assertRaises(ValueError):
+            PythonToJSTranspiler(optimize="fold_constants,inexistente")
+    
+    def test_minify(self):
+        """Teste do modo compacto"""
+        python_code = """
+def calcular(valor, limite):
+    total = valor - -limite
+    if total >= limite:
+        print("total alto", total)
+    return total
+
+class Conta:
+    def __init__(self, saldo):
+        self.saldo = saldo
+
+print(calcular(1, 2))
+"""
+        js_code = transpile_python_to_js(python_code, minify=True)
+        
+        self.assertNotIn("\n", js_code)
+        self.assertEqual(
+            js_code,
+            'function calcular(c,b){let a=c- -b;if(a>=b){console.log("total alto",a);}return a;}'
+            'class Conta{constructor(a){this.saldo=a;}}console.log(calcular(1,2));'
+        )
+        self.assertEqual("".join(transpile_iter(python_code, minify=True)), js_code)
+    
+    def test_minify_keeps_visible_names(self):
+        """Teste de nomes que não podem ser renomeados no modo compacto"""
+        python_code = """
+def externa(a):
+    valor = a
+    def interna():
+        return valor
+    return interna
+
+def usa_global(x):
+    global contador
+    contador = x
+
+def outra(a, len):
+    str = a
+    base = str
+    return base
+"""
+        js_code = transpile_python_to_js(python_code, minify=True)
+        
+        # Funções com escopos aninhados ou global ficam intactas
+        self.assertIn("function externa(a){let valor=a;function interna(){return valor;}", js_code)
+        self.assertIn("function usa_global(x){", js_code)
+        # Nomes especiais (len, str) não são renomeados; os novos não colidem com a
+        self.assertIn("function outra(a,len){let str=a;let b=str;return b;}", js_code)
+        self.assertIn("/* Não implementado: Global */", js_code)
+    
+    def test_shared_instance_threads(self):
+        """Teste de uma instância compartilhada por muitas threads com entradas variadas"""
+        documents = (generate('small_snippets', 0.1) + generate('class_heavy', 0.02)
+                     + generate('deep_nesting', 0.05) + ["def f(:\n    pass\n"])
+        profile = TranspileProfile()
+        transpilers = [PythonToJSTranspiler(), PythonToJSTranspiler(minify=True),
+                       PythonToJSTranspiler(optimize=True), PythonToJSTranspiler(profiler=profile)]
+        expected = [[transpiler.transpile(doc) for doc in documents] for transpiler in transpilers]
+        
+        results = {}
+        barrier = threading.Barrier(16)
+        def worker(n):
+            barrier.wait()
+            outputs = []
+            for i in range(len(documents)):
+                # Cada thread percorre as entradas e as configurações em outra ordem
+                index = (i * 7 + n) % len(documents)
+                which = (i + n) % len(transpilers)
+                outputs.append((which, index, transpilers[which].transpile(documents[index])))
+                outputs.append((which, index, "".join(transpilers[which].transpile_iter(documents[index]))))
+            results[n] = outputs
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(results), 16)
+        for outputs in results.values():
+            for which, index, js_code in outputs:
+                self.assertEqual(js_code, expected[which][index])
+        # Chamadas serial e das threads (transpile_iter não registra no profiler)
+        self.assertEqual(profile.transpilations, len(documents) + 4 * len(documents))
+    
+    def test_shared_transpiler(self):
+        """Teste do reaproveitamento de instâncias por opções"""
+        self.assertIs(transpiler.shared_transpiler(optimize=['native_pow'], minify=True),
+                      transpiler.shared_transpiler(minify=True, optimize=['native_pow']))
+        self.assertIsNot(transpiler.shared_transpiler(), transpiler.shared_transpiler(minify=True))
+        profile = TranspileProfile()
+        self.assertIsNot(transpiler.shared_transpiler(profiler=profile),
+                         transpiler.shared_transpiler(profiler=profile))
+    
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_minify_same_behavior(self):
+        """Teste de mesmo comportamento no Node.js das saídas formatada e compacta"""
+        python_code = """
+def fatorial(numero):
+    resultado = 1
+    for indice in range(1, numero + 1):
+        resultado *= indice
+    return resultado
+
+def classificar(valores, limite):
+    pequenos = 0
+    grandes = 0
+    for valor in valores:
+        if valor < limite and valor != 0:
+            pequenos += 1
+        elif valor >= limite or valor == -1:
+            grandes += valor - -1
+        else:
+            print("zero")
+    return [pequenos, grandes, len(valores)]
+
+class Contador:
+    def __init__(self, inicio):
+        self.total = inicio
+    def somar(self, quantidade):
+        self.total += quantidade
+        return f"Total: {self.total}"
 
+contador = Contador(10)
+i = 0
+while i < 3:
+    print(contador.somar(i))
+    i += 1
+print(fatorial(6), classificar([1, 5, 0, 9, -1], 4))
+print("a  b", 2 ** 10, 7 // 2, -3 - -5)
+"""
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for minify in (False, True):
+                path = os.path.join(tmp, f"saida_{minify}.js")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(transpile_python_to_js(python_code, minify=minify))
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                outputs.append(result.stdout)
+        
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn("720 [ 2, 16, 5 ]\na  b 1024 3 2", outputs[0])
+
+    def test_string_escaping(self):
+        """Teste de strings com aspas, barras e quebras de linha escapadas"""
+        js_code = transpile_python_to_js('x = "diz \\"oi\\"\\n\\\\ fim"')
+        self.assertEqual(js_code, 'let x = "diz \\"oi\\"\\n\\\\ fim";')
+    
+    def test_bulk_literals(self):
+        """Teste de listas e dicionários só de constantes emitidos em bloco"""
+        python_code = 'dados = [1, -2, 3.5, "a", None, True, {"k": [1, 2]}, []]'
+        expected = 'let dados = [1, -2, 3.5, "a", null, true, {"k": [1, 2]}, []];'
+        self.assertEqual(transpile_python_to_js(python_code), expected)
+        
+        class PerNode(PythonToJSTranspiler):
+            def _bulk_literal(self, node):
+                return None
+        self.assertEqual(PerNode().transpile(python_code), expected)
+        
+        # Elementos que não são constantes seguem pelo visitante normal
+        self.assertEqual(transpile_python_to_js('x = [1, y, {"a": 1}, {2: 3}]'),
+                         'let x = [1, y, {"a": 1}, {2: 3}];')
+    
+    def test_json_parse_literals(self):
+        """Teste de literais grandes emitidos como JSON.parse"""
+        python_code = 'x = [1, 2, "it\'s \\\\"]\ny = [1]'
+        js_code = transpile_python_to_js(python_code, json_parse_min=10)
+        self.assertEqual(js_code, 'let x = JSON.parse(\'[1,2,"it\\\'s \\\\\\\\"]\');\nlet y = [1];')
+        
+        if shutil.which('node'):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'dados.js')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(js_code + "\nconsole.log(JSON.stringify(x));")
+                result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+            self.assertEqual(result.stdout.strip(), '[1,2,"it\'s \\\\"]')
+
+    def test_set_and_dict_membership(self):
+        """Teste de 'in' em conjuntos e dicionários locais com Set.has e Object.hasOwn"""
+        python_code = """
+def contar(valores, chave):
+    vistos = set()
+    cores = {"azul", "verde"}
+    idades = {"ana": 3}
+    lista = [1, 2]
+    if chave in cores and chave not in idades and chave in lista and chave in valores:
+        vistos.add(chave)
+    vistos.discard(1)
+    for nome in idades:
+        print(nome, idades[nome])
+    return len(vistos) + len(idades) + len(lista)
+"""
+        js_code = transpile_python_to_js(python_code)
+        self.assertIn("let vistos = new Set();", js_code)
+        self.assertIn('let cores = new Set(["azul", "verde"]);', js_code)
+        self.assertIn('if (cores.has(chave) && !Object.hasOwn(idades, chave) && '
+                      'lista.includes(chave) && $py_in(chave, valores)) {', js_code)
+        self.assertIn("vistos.delete(1);", js_code)
+        self.assertIn("for (let nome of Object.keys(idades)) {", js_code)
+        self.assertIn("console.log(nome, idades[nome]);", js_code)
+        self.assertIn("return vistos.size + Object.keys(idades).length + lista.length;", js_code)
+    
+    def test_unknown_shapes_use_runtime(self):
+        """Teste de formas desconhecidas (módulo, ligações mistas, nonlocal) com $py_in"""
+        python_code = """
+itens = {1, 2}
+def f(x):
+    s = set()
+    if x:
+        s = [1]
+    t = set()
+    def g():
+        nonlocal t
+        t = []
+    return [1 in s, 2 in t, 3 in itens, 4 in {5}]
+"""
+        js_code = transpile_python_to_js(python_code)
+        self.assertIn("return [$py_in(1, s), $py_in(2, t), $py_in(3, itens), new Set([5]).has(4)];",
+                      js_code)
+        self.assertIn("function $py_in(x, c) {", js_code)
+        # A forma não depende de a saída ser emitida inteira ou por statement
+        self.assertEqual(''.join(transpile_iter(python_code)), js_code)
+    
+    def test_subscripts_and_slices(self):
+        """Teste de acesso a itens, atribuição a itens e fatias"""
+        js_code = transpile_python_to_js("d[k] = v[0]\nx = v[1:]\ny = v[:n]\ndict(a=1)")
+        self.assertEqual(js_code, 'd[k] = v[0];\nlet x = v.slice(1);\nlet y = v.slice(0, n);\n{"a": 1};')
+    
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_membership_node_behavior(self):
+        """Teste no Node.js de conjuntos e dicionários com o resultado do Python"""
+        python_code = """
+def resumo(valores):
+    vistos = set()
+    repetidos = 0
+    contagem = {}
+    for v in valores:
+        if v in vistos:
+            repetidos += 1
+        vistos.add(v)
+        contagem[v] = 1
+    vistos.remove(3)
+    return [repetidos, len(vistos), len(contagem), 2 in contagem, 3 not in vistos]
+
+print(resumo([1, 2, 2, 3, 3, 3]))
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'membros.js')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(transpile_python_to_js(python_code))
+            result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[ 3, 2, 3, true, true ]")
+
+    def test_generators(self):
+        """Teste de funções e métodos com yield emitidos como function*"""
+        python_code = """
+def contar(n):
+    i = 0
+    while i < n:
+        recebido = yield i
+        i += 1
+
+def encadear(a, b):
+    yield from a
+    yield from b
+
+class Arvore:
+    def folhas(self):
+        yield self.raiz
+"""
+        js_code = transpile_python_to_js(python_code)
+        self.assertIn("function* contar(n) {", js_code)
+        self.assertIn("let recebido = (yield i);", js_code)
+        self.assertIn("function* encadear(a, b) {\n    yield* a;\n    yield* b;\n}", js_code)
+        self.assertIn("    *folhas() {\n        yield this.raiz;", js_code)
+        self.assertIn("function f() {", transpile_python_to_js("def f():\n    return 1"))
+        
+        # O cabeçalho é preenchido depois do corpo, mesmo com o buffer já dividido em blocos
+        body = "\n".join(f"    x{i} = {i}" for i in range(600))
+        js_code = transpile_python_to_js(f"def longa():\n{body}\n    yield x0\nz = 1")
+        self.assertTrue(js_code.startswith("function* longa() {\n    let x0 = 0;"))
+        self.assertTrue(js_code.endswith("    yield x0;\n}\nlet z = 1;"))
+        self.assertEqual(transpile_python_to_js(f"def longa():\n{body}\n    yield x0", minify=True)[:17],
+                         "function*longa(){")
+    
+    def test_generator_expressions(self):
+        """Teste de generator expressions como geradores JavaScript criados na hora"""
+        js_code = transpile_python_to_js("g = (x * 2 for x in dados if x > 0 if x < 9)")
+        self.assertEqual(js_code, "let g = (function* ($iter) { for (let x of $iter) "
+                                  "{ if (x > 0) { if (x < 9) { yield x * 2; } } } })(dados);")
+        
+        js_code = transpile_python_to_js("g = ([i, j] for i in range(n) for [j, k] in pares[i])")
+        self.assertEqual(js_code, "let g = (function* () { for (let i = 0; i < n; i++) "
+                                  "{ for (let [j, k] of pares[i]) { yield [i, j]; } } })();")
+        
+        js_code = transpile_python_to_js("class A:\n    def f(self):\n        return list(self.k + v for v in self.v)")
+        self.assertIn("return Array.from((function* ($iter) { for (let v of $iter) "
+                      "{ yield this.k + v; } }).call(this, this.v));", js_code)
+    
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_generators_node_lazy(self):
+        """Teste no Node.js de geradores encadeados sobre uma fonte infinita"""
+        python_code = """
+def naturais():
+    n = 0
+    while True:
+        yield n
+        n += 1
+
+def pares(fonte):
+    for x in fonte:
+        if x % 2 == 0:
+            yield x
+
+def primeiros(fonte, limite):
+    for x in fonte:
+        if limite == 0:
+            return
+        limite -= 1
+        yield x
+
+def encadear(a, b):
+    yield from a
+    yield from b
+
+total = 0
+for v in primeiros((x // 2 for x in pares(naturais()) if x % 3 == 0), 2000000):
+    total += v
+print(total)
+print(list(encadear(primeiros(naturais(), 3), (c for c in "ab"))))
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'geradores.js')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(transpile_python_to_js(python_code))
+            # Com as listas intermediárias materializadas a fonte infinita nunca terminaria
+            result = subprocess.run(['node', '--max-old-space-size=64', path],
+                                    capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split("\n")[:2],
+                         [str(sum(3 * i for i in range(2000000))), "[ 0, 1, 2, 'a', 'b' ]"])
+
+    def test_operator_precedence(self):
+        """Teste de parênteses mantidos onde a precedência do JavaScript difere"""
+        cases = {
+            "(a + b) * c": "(a + b) * c",
+            "a - (b - c)": "a - (b - c)",
+            "a * b + c * d": "a * b + c * d",
+            "(a + b) // 2": "Math.floor((a + b) / 2)",
+            "-(a + b)": "-(a + b)",
+            "-(-a)": "-(-a)",
+            "not a == b": "!(a === b)",
+            "a and (b or c)": "a && (b || c)",
+            "(a & b) == c": "(a & b) === c",
+            "1 < x < 10": "1 < x && x < 10",
+            "x is None": "x == null",
+        }
+        for python_code, expected in cases.items():
+            with self.subTest(python_code=python_code):
+                self.assertEqual(transpile_python_to_js(f"r = {python_code}"), f"let r = {expected};")
+        # Cadeias longas continuam montadas sem recursão por termo
+        js_code = transpile_python_to_js("r = (" + " + ".join(f"a{i}" for i in range(5000)) + ") * 2")
+        self.assertTrue(js_code.startswith("let r = (a0 + a1 + ") and js_code.endswith(" + a4999) * 2;"))
+    
+    def test_comprehensions_fused_loops(self):
+        """Teste de comprehensions convertidas em um único laço, sem arrays intermediários"""
+        js_code = transpile_python_to_js("r = [x * 2 for x in dados if x > 0 if x < 9]")
+        self.assertEqual(js_code, "let r = (() => { const $r = []; for (let x of dados) "
+                                  "{ if (x > 0) { if (x < 9) { $r.push(x * 2); } } } return $r; })();")
+        
+        js_code = transpile_python_to_js("r = [i * j for i in range(n) for [j, k] in pares]")
+        self.assertEqual(js_code, "let r = (() => { const $r = []; for (let i = 0; i < n; i++) "
+                                  "{ for (let [j, k] of pares) { $r.push(i * j); } } return $r; })();")
+        
+        # Tamanho conhecido: resultado alocado de uma vez e preenchido por índice
+        js_code = transpile_python_to_js("r = [i * i for i in range(2, n)]")
+        self.assertEqual(js_code, "let r = (() => { const $r = new Array(Math.max(0, n - 2)); let $i = 0; "
+                                  "for (let i = 2; i < n; i++) { $r[$i++] = i * i; } return $r; })();")
+        js_code = transpile_python_to_js("def f():\n    v = [1, 2]\n    return [x + 1 for x in v]")
+        self.assertIn("return (($iter) => { const $r = new Array($iter.length); "
+                      "for (let $i = 0; $i < $iter.length; $i++) { let x = $iter[$i]; $r[$i] = x + 1; } "
+                      "return $r; })(v);", js_code)
+        
+        self.assertTrue(transpile_python_to_js("s = {x % 3 for x in dados}").startswith(
+                        "let s = (() => { const $r = new Set(); for (let x of dados) "
+                        "{ $r.add($py_mod(x, 3)); } return $r; })();\n"))
+        self.assertEqual(transpile_python_to_js("d = {k: v for k in chaves if k for v in valores}"),
+                         "let d = (() => { const $r = {}; for (let k of chaves) { if (k) "
+                         "{ for (let v of valores) { $r[k] = v; } } } return $r; })();")
+    
+    def test_comprehension_shapes(self):
+        """Teste de formas nas comprehensions: resultados conhecidos e alvos que escondem nomes"""
+        python_code = """
+def f(dados):
+    vistos = {x for x in dados}
+    idades = {x: 1 for x in dados}
+    s = set()
+    return [len(vistos), 2 in idades, [k for k in idades], [1 in s for s in dados]]
+"""
+        js_code = transpile_python_to_js(python_code)
+        self.assertIn("vistos.size", js_code)
+        self.assertIn("Object.hasOwn(idades, 2)", js_code)
+        self.assertIn("for (let k of Object.keys(idades))", js_code)
+        self.assertIn("for (let s of dados) { $r.push($py_in(1, s)); }", js_code)
+        self.assertEqual(''.join(transpile_iter(python_code)), js_code)
+    
+    @unittest.skipUnless(shutil.which('node'), "node não disponível")
+    def test_comprehensions_node_behavior(self):
+        """Teste no Node.js de comprehensions com o resultado do Python"""
+        python_code = """
+def resumo(dados, n):
+    lista = [3, 1, 2]
+    vistos = {1, 2}
+    print([x * 2 for x in lista], [i for i in range(5, 2)], [i for i in range(2, 5)])
+    print([i * j for i in range(n) for j in range(1, i) if i % 2 == 0])
+    print([[a, b] for [a, b] in [[1, 2], [3, 4]]], {str(x): x * x for x in dados if x in vistos})
+    print(len({x % 3 for x in dados}))
+
+class Escala:
+    def __init__(self, fator):
+        self.fator = fator
+    def aplicar(self, valores):
+        return [self.fator * v for v in valores]
+
+resumo([1, 2, 3, 4, 5], 5)
+print(Escala(10).aplicar([1, 2]))
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'comprehensions.js')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(transpile_python_to_js(python_code))
+            result = subprocess.run(['node', path], capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split("\n")[:5], [
+            "[ 6, 2, 4 ] [] [ 2, 3, 4 ]",
+            "[ 2, 4, 8, 12 ]",
+            "[ [ 1, 2 ], [ 3, 4 ] ] { '1': 1, '2': 4 }",
+            "3",
+            "[ 10, 20 ]",
+        ])
+    
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,54 +1,865 @@
+if __name__ == "__main__":
+    # Linha de comando: com o daemon rodando, transpila por ele sem importar
+    # o restante do pacote (daemon.run_client); senão, a CLI completa (cli.py)
+    import sys
+    import daemon
+    
+    exit_code = daemon.run_client(sys.argv[1:])
+    if exit_code is None:
+        from cli import main
+        exit_code = main()
+    sys.exit(exit_code)
+
 import ast
+import bisect
+import copy
+import io
 import re
-from typing import List, Dict, Any
+import sys
+import threading
+import time
+import tokenize
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-class PythonToJSTranspiler:
+from literals import NOT_LITERAL, js_literal, js_string, literal_value
+from minifier import compact_line, rename_locals
+from optimizer import NativePow, resolve_passes, run_passes
+from profiling import TranspileProfile
+from runtime import helper, runtime_code, used_helpers, with_runtime
+from shapes import DICT, LIST, SET, comprehension_shapes, parameter_names, scope_shapes, value_shape
+
+SYNTAX_ERROR_PREFIX = "// Erro de sintaxe Python:"
+
+# Limite de recursão e tamanho de pilha usados para entradas muito profundas
+DEEP_RECURSION_LIMIT = 200_000
+DEEP_STACK_SIZE = 512 * 1024 * 1024
+
+
+class _DeepGate:
+    """
+    Isola as execuções de run_deep das demais transpilações.
+    
+    O limite de recursão é global ao processo: enquanto ele está elevado,
+    uma recursão profunda em outra thread (com a pilha normal) derrubaria o
+    processo em vez de levantar RecursionError. Por isso a análise e a
+    emissão normais entram com ``shared()`` e run_deep, com ``exclusive()``,
+    espera as que estão em andamento e segura as novas até restaurar o
+    limite. Entradas aninhadas na mesma thread (e a própria thread de
+    run_deep) passam direto.
+    
+    As threads em ``shared()`` ficam em um conjunto e o dono de
+    ``exclusive()`` é guardado pela identidade da thread; a saída, sempre em
+    ``finally``, é idempotente, então uma exceção assíncrona (o SIGPROF do
+    limite de CPU do app) em qualquer ponto não deixa o portão fechado.
+    """
+    
     def __init__(self):
-        self.indentation_level = 0
+        self._condition = threading.Condition()
+        self._shared: set = set()
+        self._exclusive: Optional[int] = None
+        self._waiting = 0
+        self._local = threading.local()
+    
+    @contextmanager
+    def shared(self):
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            try:
+                yield
+            finally:
+                local.depth -= 1
+            return
+        ident = threading.get_ident()
+        try:
+            with self._condition:
+                while self._exclusive is not None or self._waiting:
+                    self._condition.wait()
+                self._shared.add(ident)
+            local.depth = 1
+            yield
+        finally:
+            local.depth = 0
+            with self._condition:
+                self._shared.discard(ident)
+                if not self._shared:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def exclusive(self):
+        ident = threading.get_ident()
+        try:
+            with self._condition:
+                self._waiting += 1
+                try:
+                    while self._exclusive is not None or self._shared:
+                        self._condition.wait()
+                finally:
+                    self._waiting -= 1
+                self._exclusive = ident
+            yield
+        finally:
+            with self._condition:
+                if self._exclusive == ident:
+                    self._exclusive = None
+                self._condition.notify_all()
+    
+    def enter_deep_thread(self) -> None:
+        self._local.depth = 1
+        self._local.deep = True
+    
+    def in_deep_thread(self) -> bool:
+        return getattr(self._local, 'deep', False)
+
+
+_deep_gate = _DeepGate()
+
+
+def run_deep(func: Callable[..., Any], *args) -> Any:
+    """
+    Executa ``func(*args)`` em uma thread com pilha de DEEP_STACK_SIZE bytes
+    e limite de recursão DEEP_RECURSION_LIMIT.
+
+    Usado só quando o caminho normal estoura a recursão (``ast.parse`` ou a
+    emissão de ASTs com milhares de níveis). O limite de recursão é global:
+    as execuções são exclusivas (ver ``_DeepGate``), então outras
+    transpilações esperam enquanto o limite está elevado, e ele é restaurado
+    em seguida. Cada execução reserva DEEP_STACK_SIZE (512 MiB) de espaço de
+    endereçamento para a pilha da thread; só as páginas de fato usadas pela
+    recursão ocupam memória, mas ambientes com ``ulimit -v`` ou overcommit
+    desligado precisam comportar essa reserva.
+    
+    Não deve ser chamado de dentro de ``_deep_gate.shared()``.
+    """
+    if _deep_gate.in_deep_thread():
+        # Já na thread de run_deep, com o limite elevado
+        return func(*args)
+    outcome = {}
+    
+    def target():
+        _deep_gate.enter_deep_thread()
+        try:
+            outcome['result'] = func(*args)
+        except BaseException as e:
+            outcome['error'] = e
+    
+    with _deep_gate.exclusive():
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, DEEP_RECURSION_LIMIT))
+        try:
+            stack_size = threading.stack_size(DEEP_STACK_SIZE)
+            try:
+                thread = threading.Thread(target=target, name='transpiler-deep')
+                thread.start()
+            finally:
+                threading.stack_size(stack_size)
+            thread.join()
+        finally:
+            sys.setrecursionlimit(limit)
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+# Número de elifs por trecho ao dividir cadeias longas demais para o parser
+LADDER_CHUNK = 1000
+
+
+def _find_long_ladder(python_code: str):
+    """
+    Localiza a primeira cadeia if/elif com mais de LADDER_CHUNK elifs.
+
+    Devolve ``(linha do if, coluna, linhas dos cortes, linha final, linhas
+    internas de strings)`` ou None; os cortes são os elifs em que a cadeia
+    é dividida e a linha final é a primeira linha depois da cadeia.
+    """
+    lines = python_code.count("\n") + 1
+    
+    # Primeiro token de cada linha lógica e linhas internas de strings multilinha
+    logical = []
+    string_rows = set()
+    at_start = True
+    for token in tokenize.generate_tokens(io.StringIO(python_code).readline):
+        if token.type == tokenize.NEWLINE:
+            at_start = True
+        elif token.type == tokenize.STRING and token.end[0] > token.start[0]:
+            string_rows.update(range(token.start[0] + 1, token.end[0] + 1))
+        if at_start and token.type not in (tokenize.NEWLINE, tokenize.NL, tokenize.COMMENT,
+                                            tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER):
+            logical.append((token.start[0], token.start[1], token.string))
+            at_start = False
+    
+    for i, (row, col, word) in enumerate(logical):
+        if word != 'if':
+            continue
+        elifs = []
+        j = i + 1
+        while j < len(logical):
+            _, clause_col, clause_word = logical[j]
+            if clause_col < col or (clause_col == col and clause_word not in ('elif', 'else')):
+                break
+            if clause_col == col and clause_word == 'elif':
+                elifs.append(logical[j][0])
+            j += 1
+        if len(elifs) > LADDER_CHUNK:
+            end = logical[j][0] if j < len(logical) else lines + 1
+            return row, col, elifs[LADDER_CHUNK::LADDER_CHUNK], end, string_rows
+    return None
+
+
+def _shift_positions(tree: ast.AST, first_row: int, rows: int,
+                     col_deltas: Optional[List[int]] = None) -> None:
+    """
+    Soma ``rows`` às linhas a partir de ``first_row``; com ``col_deltas``,
+    soma também às colunas o deslocamento da linha correspondente (indexado
+    pela linha antes do ajuste).
+    """
+    for node in ast.walk(tree):
+        if not hasattr(node, 'lineno'):
+            continue
+        if col_deltas is not None:
+            node.col_offset += col_deltas[node.lineno - 1]
+            if node.end_lineno is not None:
+                node.end_col_offset += col_deltas[node.end_lineno - 1]
+        if node.lineno >= first_row:
+            node.lineno += rows
+        if node.end_lineno is not None and node.end_lineno >= first_row:
+            node.end_lineno += rows
+
+
+def _parse_deep(python_code: str) -> ast.Module:
+    """
+    ``ast.parse`` para entradas profundas; executado dentro de run_deep.
+
+    O parser do CPython recusa cadeias com milhares de elifs (MemoryError)
+    independentemente do limite de recursão. Nesse caso a cadeia é cortada a
+    cada LADDER_CHUNK elifs: o restante do código e cada trecho (com o
+    ``elif`` inicial trocado por ``if``) são analisados separadamente e os
+    trechos são encadeados no ``orelse`` do último if, que é exatamente a AST
+    da cadeia original.
+    """
+    try:
+        return ast.parse(python_code)
+    except MemoryError:
+        ladder = _find_long_ladder(python_code)
+        if ladder is None:
+            raise
+    
+    row, col, cuts, end, string_rows = ladder
+    lines = python_code.splitlines(keepends=True)
+    indent = lines[row - 1][:col]
+    
+    tree = _parse_deep("".join(lines[:cuts[0] - 1] + lines[end - 1:]))
+    _shift_positions(tree, cuts[0], end - cuts[0])
+    tail = next(node for node in ast.walk(tree)
+                if isinstance(node, ast.If) and node.lineno == row and node.col_offset == col)
+    chain = [tail]
+    
+    for start, stop in zip(cuts, cuts[1:] + [end]):
+        segment = []
+        col_deltas = []
+        for r in range(start, stop):
+            line = lines[r - 1]
+            if r in string_rows:
+                segment.append(line)
+            elif line.startswith(indent):
+                segment.append(line[col:])
+            else:
+                segment.append(line.lstrip(" \t"))
+            col_deltas.append(len(line) - len(segment[-1]))
+        segment[0] = "if" + segment[0][len("elif"):]
+        col_deltas[0] += len("elif") - len("if")
+        
+        while tail.orelse:
+            tail = tail.orelse[0]
+            chain.append(tail)
+        part = _parse_deep("".join(segment))
+        _shift_positions(part, 1, start - 1, col_deltas)
+        part.body[0].col_offset = col
+        tail.orelse = part.body
+    
+    # Cada if da cadeia termina onde termina a cadeia inteira
+    for node in chain:
+        node.end_lineno = tail.orelse[0].end_lineno
+        node.end_col_offset = tail.orelse[0].end_col_offset
+    return tree
+
+
+def _is_plain(node: ast.expr) -> bool:
+    """Nome, constante ou cadeia de atributos de um nome: avaliar de novo não tem efeitos"""
+    while isinstance(node, ast.Attribute):
+        node = node.value
+    return isinstance(node, (ast.Name, ast.Constant))
+
+
+class CodeWriter:
+    """
+    Buffer único de saída do transpilador.
+
+    Os visitantes de statements acrescentam linhas ao mesmo buffer em vez de
+    devolver strings que o nó pai concatena de novo; assim cada linha é
+    copiada uma única vez, independentemente da profundidade de aninhamento.
+    """
+
+    CHUNK_LINES = 256
+    # Separador entre linhas (e entre statements em transpile_iter)
+    NEWLINE = "\n"
+
+    def __init__(self, indent_size: int = 4):
+        self.indent_size = indent_size
+        self.level = 0
+        self._prefix = ""
+        self._lines: List[str] = []
+        self._chunks: List[str] = []
+        # Linhas reservadas ainda não preenchidas (ver reserve)
+        self._held = 0
+
+    def line(self, text: str) -> None:
+        """Acrescenta uma linha com a indentação atual"""
+        lines = self._lines
+        lines.append(self._prefix + text)
+        if len(lines) >= self.CHUNK_LINES:
+            self._flush()
+
+    def _flush(self) -> None:
+        # Agrupa as linhas pendentes em um único bloco de texto, para não
+        # manter um objeto str por linha até o fim da transpilação
+        if self._lines and not self._held:
+            self._chunks.append(self.NEWLINE.join(self._lines))
+            self._lines = []
+
+    def reserve(self) -> int:
+        """
+        Reserva uma linha com a indentação atual, preenchida depois por
+        ``fill`` (cabeçalhos que dependem do corpo já emitido).
+        """
+        self._held += 1
+        self._lines.append(self._prefix)
+        return len(self._lines) - 1
+
+    def fill(self, index: int, text: str) -> None:
+        self._lines[index] += text
+        self._held -= 1
+
+    def indent(self) -> None:
+        self.level += 1
+        self._prefix = " " * (self.level * self.indent_size)
+
+    def dedent(self) -> None:
+        self.level -= 1
+        self._prefix = " " * (self.level * self.indent_size)
+
+    def indented(self) -> 'CodeWriter':
+        """Uso: ``with writer.indented(): ...`` indenta as linhas do bloco"""
+        return self
+
+    def __enter__(self) -> 'CodeWriter':
+        self.indent()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.dedent()
+
+    def comment(self, text: str) -> str:
+        return f"// {text}"
+
+    def getvalue(self) -> str:
+        self._flush()
+        return self.NEWLINE.join(self._chunks)
+
+
+class CompactWriter(CodeWriter):
+    """
+    Buffer do modo compacto: sem indentação, quebras de linha nem espaços
+    desnecessários. Todo statement gerado termina em ``;`` ou ``}``, então as
+    linhas podem ser concatenadas diretamente.
+    """
+
+    NEWLINE = ""
+
+    def line(self, text: str) -> None:
+        if text.startswith("//"):
+            text = self.comment(text[2:].strip())
+        lines = self._lines
+        lines.append(compact_line(text))
+        if len(lines) >= self.CHUNK_LINES:
+            self._flush()
+
+    def fill(self, index: int, text: str) -> None:
+        self._lines[index] = compact_line(text)
+        self._held -= 1
+
+    def indent(self) -> None:
+        self.level += 1
+
+    def dedent(self) -> None:
+        self.level -= 1
+
+    def comment(self, text: str) -> str:
+        # Comentário de linha engoliria o resto da saída
+        return f"/* {text.replace('*/', '* /')} */"
+
+
+class PythonToJSTranspiler:
+    # Tabelas de mapeamento, montadas uma única vez na definição da classe
+    AUGASSIGN_OPERATORS = {
+        ast.Add: '+=',
+        ast.Sub: '-=',
+        ast.Mult: '*=',
+        ast.Div: '/=',
+        ast.Mod: '%=',
+        ast.Pow: '**=',
+        ast.BitOr: '|=',
+        ast.BitAnd: '&=',
+        ast.BitXor: '^=',
+        ast.LShift: '<<=',
+        ast.RShift: '>>='
+    }
+    
+    BINOP_OPERATORS = {
+        ast.Add: '+',
+        ast.Sub: '-',
+        ast.Mult: '*',
+        ast.Div: '/',
+        ast.FloorDiv: '/',
+        ast.Mod: '%',
+        ast.Pow: '**',
+        ast.BitOr: '|',
+        ast.BitAnd: '&',
+        ast.BitXor: '^',
+        ast.LShift: '<<',
+        ast.RShift: '>>'
+    }
+    
+    # Precedência dos operadores infixos em JavaScript (maior liga mais forte)
+    BINOP_PRECEDENCE = {
+        '**': 14, '*': 13, '/': 13, '%': 13, '+': 12, '-': 12,
+        '<<': 11, '>>': 11, '&': 8, '^': 7, '|': 6
+    }
+    
+    # Operadores entre conjuntos (shapes.py) convertidos em funções do runtime
+    SET_OPERATIONS = {
+        ast.BitOr: 'union',
+        ast.BitAnd: 'intersection',
+        ast.Sub: 'difference',
+        ast.BitXor: 'symmetric_difference'
+    }
+    
+    # Métodos de conjuntos e dicionários convertidos em funções do runtime
+    SET_METHODS = frozenset(('union', 'intersection', 'difference', 'symmetric_difference', 'issubset'))
+    DICT_METHODS = frozenset(('get', 'pop', 'setdefault'))
+    DICT_VIEWS = {'keys': 'keys', 'values': 'values', 'items': 'entries'}
+    COLLECTION_METHODS = SET_METHODS | DICT_METHODS | set(DICT_VIEWS) | {'discard', 'remove', 'update'}
+    
+    UNARYOP_OPERATORS = {
+        ast.UAdd: '+',
+        ast.USub: '-',
+        ast.Not: '!',
+        ast.Invert: '~'
+    }
+    
+    COMPARE_OPERATORS = {
+        ast.Eq: '===',
+        ast.NotEq: '!==',
+        ast.Lt: '<',
+        ast.LtE: '<=',
+        ast.Gt: '>',
+        ast.GtE: '>=',
+        ast.Is: '===',
+        ast.IsNot: '!==',
+        ast.In: 'in',
+        ast.NotIn: '!in'
+    }
+    
+    # Mapeamento de funções Python para JavaScript
+    FUNCTION_MAPPING = {
+        'print': 'console.log',
+        'len': 'length',
+        'str': 'String',
+        'int': 'parseInt',
+        'float': 'parseFloat'
+    }
+    
+    # Tabela de despacho: tipo do nó da AST -> função visitante.
+    # Preenchida por _build_dispatch a partir dos métodos visit_* e
+    # estendida por register().
+    _dispatch: Dict[type, Callable[..., Any]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch()
+    
+    @classmethod
+    def _build_dispatch(cls) -> None:
+        """Monta a tabela de despacho da classe a partir dos métodos visit_*"""
+        dispatch = dict(cls._dispatch)
+        for name in dir(cls):
+            if name.startswith('visit_'):
+                node_type = getattr(ast, name[len('visit_'):], None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    dispatch[node_type] = getattr(cls, name)
+        cls._dispatch = dispatch
+    
+    @classmethod
+    def register(cls, node_type: type):
+        """
+        Decorador que registra um visitante para um tipo de nó da AST.
+        
+        O visitante recebe ``(transpiler, node)``; subclasses que herdaram o
+        visitante anterior passam a usar o novo.
+        
+        Exemplo:
+            @PythonToJSTranspiler.register(ast.Pass)
+            def visit_pass(transpiler, node):
+                transpiler.writer.line("// pass")
+        """
+        def decorator(handler):
+            previous = cls._dispatch.get(node_type)
+            pending = [cls]
+            while pending:
+                klass = pending.pop()
+                if klass is cls or klass._dispatch.get(node_type) is previous:
+                    klass._dispatch[node_type] = handler
+                    pending.extend(klass.__subclasses__())
+            return handler
+        return decorator
+    
+    # Tamanho mínimo, em linhas, dos blocos analisados por transpile_iter
+    STREAM_BLOCK_LINES = 256
+    _CLAUSES = ('else', 'elif', 'except', 'finally')
+    
+    # Nomes tratados de forma especial pelos visitantes, nunca renomeados no
+    # modo compacto
+    SPECIAL_NAMES = frozenset(('self', 'range'))
+    
+    def __init__(self, profiler: Optional[TranspileProfile] = None, optimize=None,
+                 minify: bool = False, json_parse_min: Optional[int] = None):
+        """
+        A instância guarda só a configuração e pode ser compartilhada entre
+        threads: cada chamada de transpile/emit trabalha em um contexto
+        próprio (ver _context), com seu buffer de saída e suas medições.
+        """
         self.indent_size = 4
+        # Modo compacto: saída sem espaços e variáveis locais com nomes curtos
+        self.minify = minify
+        self.writer_class = CompactWriter if minify else CodeWriter
+        # Buffer usado apenas por quem chama visit_node diretamente
+        self.writer = self.writer_class(self.indent_size)
+        # Funções em emissão, da externa à interna, com as formas dos nomes
+        # de cada uma (calculadas na primeira consulta, ver _shape)
+        self._scopes: List[List[Any]] = []
+        # Listas e dicionários só de constantes com JSON a partir deste
+        # tamanho (em bytes) são emitidos como JSON.parse('...')
+        self.json_parse_min = json_parse_min
+        
+        # Passes de otimização aplicados à AST antes da emissão (optimizer.py)
+        # e o tempo acumulado de cada um, somado por todas as chamadas
+        self.passes = resolve_passes(optimize)
+        self.pass_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
         
-    def get_indent(self) -> str:
-        return " " * (self.indentation_level * self.indent_size)
+        # Instrumentação opcional: sem profiler, visit_node continua sendo o
+        # método da classe e nada é medido
+        self.profiler = profiler
+    
+    def _context(self) -> 'PythonToJSTranspiler':
+        """
+        Cópia rasa da instância com o estado de uma única chamada.
+        
+        Os visitantes escrevem em ``self.writer`` e o modo instrumentado
+        acumula em ``self._profile``; como esse estado fica na cópia, a
+        instância configurada nunca é alterada e pode atender chamadas
+        simultâneas. Configuração, tabelas e ``pass_times`` são compartilhados.
+        """
+        context = copy.copy(self)
+        context.writer = self.writer_class(self.indent_size)
+        context._scopes = []
+        if self.profiler is not None:
+            context._profile = TranspileProfile()
+            context._child_times: List[float] = []
+            context._active: Dict[str, int] = {}
+            context.visit_node = context._visit_node_profiled
+        return context
     
     def transpile(self, python_code: str) -> str:
         """Converte código Python para JavaScript"""
+        context = self._context()
+        if self.profiler is not None:
+            return context._transpile_profiled(python_code)
+        
+        try:
+            tree = context.parse(python_code)
+        except SyntaxError as e:
+            return f"{SYNTAX_ERROR_PREFIX} {e}"
+        
+        context._emit(tree)
+        return with_runtime(context.writer.getvalue(), self.minify)
+    
+    def parse(self, python_code: str) -> ast.Module:
+        """
+        ``ast.parse`` que aceita entradas muito profundas.
+        
+        Expressões com dezenas de milhares de termos e cadeias de milhares de
+        elifs estouram o limite de recursão ou a pilha do parser; nesses casos
+        a análise é refeita por ``run_deep`` e as cadeias de elif longas são
+        divididas por ``_find_long_ladder``/``_parse_deep``.
+        """
+        with _deep_gate.shared():
+            try:
+                return ast.parse(python_code)
+            except (RecursionError, MemoryError):
+                pass
+        return run_deep(_parse_deep, python_code)
+    
+    def _emit(self, node: ast.AST) -> None:
+        """
+        Otimiza e visita ``node`` em um buffer novo, refazendo com run_deep se
+        a recursão estourar.
+        """
+        with _deep_gate.shared():
+            if self.passes:
+                if not isinstance(node, ast.Module):
+                    # Os passes podem remover ou desdobrar o próprio statement
+                    node = ast.Module(body=[node], type_ignores=[])
+                timings: Dict[str, float] = {}
+                run_passes(node, self.passes, timings)
+                totals = self._profile.pass_times if self.profiler is not None else self.pass_times
+                with self._lock:
+                    for name, seconds in timings.items():
+                        totals[name] = totals.get(name, 0.0) + seconds
+            if self.minify:
+                rename_locals(node, self.SPECIAL_NAMES | set(self.FUNCTION_MAPPING))
+            
+            self.writer = self.writer_class(self.indent_size)
+            self._scopes = []
+            if self.profiler is not None:
+                visitors = {name: list(stats) for name, stats in self._profile.visitors.items()}
+                nodes = self._profile.nodes
+            try:
+                self.visit_node(node)
+                return
+            except RecursionError:
+                pass
+        # A tentativa que estourou não deixa saída, escopos nem medições dos
+        # visitantes; os tempos dos passes já medidos são mantidos
+        self.writer = self.writer_class(self.indent_size)
+        self._scopes = []
+        if self.profiler is not None:
+            self._profile.visitors = visitors
+            self._profile.nodes = nodes
+            self._child_times.clear()
+            self._active.clear()
+        run_deep(self.visit_node, node)
+    
+    def _transpile_profiled(self, python_code: str) -> str:
+        """transpile() com medição de cada fase; as métricas vão para self.profiler"""
+        self._profile = TranspileProfile()
+        
+        start = time.perf_counter()
+        try:
+            tree = self.parse(python_code)
+        except SyntaxError as e:
+            js_code = f"{SYNTAX_ERROR_PREFIX} {e}"
+            parse_time = time.perf_counter() - start
+        else:
+            parse_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            self._emit(tree)
+            self._profile.emit_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            js_code = with_runtime(self.writer.getvalue(), self.minify)
+            self._profile.assembly_time = time.perf_counter() - start
+        
+        profile = self._profile
+        profile.parse_time = parse_time
+        profile.transpilations = 1
+        profile.output_bytes = len(js_code.encode('utf-8'))
+        self.profiler.merge(profile)
+        return js_code
+    
+    def _visit_node_profiled(self, node: ast.AST) -> str:
+        """visit_node instrumentado: conta chamadas e mede tempo cumulativo e próprio"""
+        name = type(node).__name__
+        child_times = self._child_times
+        active = self._active
+        child_times.append(0.0)
+        active[name] = active.get(name, 0) + 1
+        start = time.perf_counter()
+        try:
+            return type(self).visit_node(self, node)
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - child_times.pop()
+            if child_times:
+                child_times[-1] += elapsed
+            
+            stats = self._profile.visitors.get(name)
+            if stats is None:
+                stats = self._profile.visitors[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[2] += own
+            # O tempo cumulativo conta só a chamada mais externa de cada tipo
+            # (BinOp dentro de BinOp não é somado duas vezes)
+            active[name] -= 1
+            if not active[name]:
+                stats[1] += elapsed
+            self._profile.nodes += 1
+    
+    def transpile_iter(self, python_code: str) -> Iterator[str]:
+        """
+        Converte código Python para JavaScript, gerando a saída statement a
+        statement (nível superior).
+        
+        O código é analisado em blocos de statements de nível superior, de
+        modo que a primeira parte sai sem esperar a análise do arquivo
+        inteiro e só a AST do bloco atual fica em memória. Para código
+        válido, ``"".join(transpile_iter(codigo))`` é igual a
+        ``transpile(codigo)``; se houver erro de sintaxe depois do primeiro
+        bloco, as partes já geradas são seguidas do comentário de erro.
+        As funções do runtime usadas (runtime.py) vêm na última parte.
+        """
+        separator = ""
+        newline = self.writer_class.NEWLINE
+        helpers = set()
         try:
-            tree = ast.parse(python_code)
-            js_code = self.visit_node(tree)
-            return js_code
+            for tree in self._parse_blocks(python_code):
+                # Libera cada statement da AST assim que ele é emitido
+                pending = tree.body[::-1]
+                del tree
+                while pending:
+                    js_code = self.emit_statement(pending.pop())
+                    if js_code:
+                        helpers |= used_helpers(js_code)
+                        yield separator + js_code
+                        separator = newline
         except SyntaxError as e:
-            return f"// Erro de sintaxe Python: {e}"
+            yield f"{separator}{SYNTAX_ERROR_PREFIX} {e}"
+            return
+        if helpers:
+            yield separator + runtime_code(helpers, self.minify)
+    
+    def _parse_blocks(self, python_code: str) -> Iterator[ast.Module]:
+        """Analisa o código em blocos de ao menos STREAM_BLOCK_LINES linhas"""
+        lines = python_code.splitlines(keepends=True)
+        
+        # Candidatos a início de statement de nível superior: linhas na coluna 0
+        # que não são comentário, fechamento de parênteses ou cláusula de bloco
+        boundaries = [
+            i for i, line in enumerate(lines)
+            if i and line[0] not in ' \t\r\n#)]}' and not line.startswith(self._CLAUSES)
+        ]
+        boundaries.append(len(lines))
+        
+        start = 0
+        size = self.STREAM_BLOCK_LINES
+        while start < len(lines):
+            end = boundaries[bisect.bisect_left(boundaries, min(start + size, len(lines)))]
+            try:
+                tree = self.parse("".join(lines[start:end]))
+            except SyntaxError:
+                if end >= len(lines):
+                    # Erro real: reanalisa o arquivo inteiro para a mensagem
+                    # trazer a linha correta
+                    self.parse(python_code)
+                    raise
+                # O corte caiu no meio de um statement (string ou parênteses
+                # com linhas na coluna 0): tenta de novo com um bloco maior
+                size *= 2
+                continue
+            yield tree
+            start = end
+            size = self.STREAM_BLOCK_LINES
+    
+    def emit(self, node: ast.AST) -> str:
+        """Transpila uma AST já analisada (módulo ou statement) e devolve o JavaScript"""
+        context = self._context()
+        context._emit(node)
+        return context.writer.getvalue()
+    
+    def emit_statement(self, node: ast.stmt) -> str:
+        """Transpila um único statement em um buffer próprio e devolve o JavaScript"""
+        return self.emit(node)
     
     def visit_node(self, node: ast.AST) -> str:
-        """Visita um nó da AST e retorna o código JavaScript correspondente"""
-        method_name = f"visit_{type(node).__name__}"
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        """
+        Visita um nó da AST.
+        
+        Expressões devolvem o código JavaScript correspondente; statements
+        escrevem suas linhas em ``self.writer``.
+        """
+        visitor = self._dispatch.get(type(node))
+        if visitor is None:
+            return self.generic_visit(node)
+        return visitor(self, node)
+    
+    def visit_body(self, statements: List[ast.stmt]) -> None:
+        """Escreve um bloco de statements um nível de indentação abaixo"""
+        self.writer.indent()
+        for stmt in statements:
+            self.visit_node(stmt)
+        self.writer.dedent()
     
     def generic_visit(self, node: ast.AST) -> str:
         """Visitante genérico para nós não implementados"""
-        return f"// Não implementado: {type(node).__name__}"
+        comment = self.writer.comment(f"Não implementado: {type(node).__name__}")
+        if isinstance(node, ast.stmt):
+            self.writer.line(comment)
+        return comment
     
-    def visit_AugAssign(self, node: ast.AugAssign) -> str:
-        """Converte atribuição aumentada (+=, -=, etc.)"""
-        target = self.visit_node(node.target)
-        value = self.visit_node(node.value)
-        
-        op_mapping = {
-            ast.Add: '+=',
-            ast.Sub: '-=',
-            ast.Mult: '*=',
-            ast.Div: '/=',
-            ast.Mod: '%=',
-            ast.Pow: '**='
-        }
-        
-        operator = op_mapping.get(type(node.op), '+=')
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        """
+        Converte atribuição aumentada (+=, -=, etc.). ``//=``, ``%=`` e
+        ``**=`` sem operador nativo leem e escrevem o alvo separadamente; se
+        o objeto ou o índice do alvo não forem nomes (``a[f()] //= b``), eles
+        são guardados antes em temporários de um bloco próprio, para serem
+        avaliados uma só vez, como no Python.
+        """
+        operator = self.AUGASSIGN_OPERATORS.get(type(node.op), '+=')
+        if type(node.op) is NativePow or not isinstance(node.op, (ast.FloorDiv, ast.Mod, ast.Pow)):
+            target = self.visit_node(node.target)
+            value = self.visit_node(node.value)
+            self.writer.line(f"{target} {'**=' if type(node.op) is NativePow else operator} {value};")
+            return
         
+        temporaries, target_node = self._hoist_target(node.target)
+        if temporaries:
+            self.writer.line("{")
+            self.writer.indent()
+            self.writer.line(f"const {', '.join(temporaries)};")
+        target = self.visit_node(target_node)
+        value = self.visit_node(node.value)
         if isinstance(node.op, ast.Pow):
-            return f"{target} = Math.pow({target}, {value});"
-        
-        return f"{target} {operator} {value};"
+            self.writer.line(f"{target} = Math.pow({target}, {value});")
+        else:
+            operation = ast.BinOp(left=node.target, op=node.op, right=node.value)
+            self.writer.line(f"{target} = {self._binop(operation, target, value)};")
+        if temporaries:
+            self.writer.dedent()
+            self.writer.line("}")
+    
+    def _hoist_target(self, target: ast.expr) -> Tuple[List[str], ast.expr]:
+        """
+        Declarações dos temporários ``$obj``/``$key`` para o objeto e o
+        índice de um alvo que não são nomes, e o alvo reescrito com eles
+        """
+        if not isinstance(target, (ast.Attribute, ast.Subscript)):
+            return [], target
+        temporaries = []
+        value = target.value
+        if not _is_plain(value):
+            temporaries.append(f"$obj = {self.visit_node(value)}")
+            value = ast.Name(id='$obj', ctx=ast.Load())
+        if isinstance(target, ast.Attribute):
+            return temporaries, ast.Attribute(value=value, attr=target.attr, ctx=target.ctx)
+        index = target.slice
+        if not isinstance(index, ast.Slice) and not _is_plain(index):
+            temporaries.append(f"$key = {self.visit_node(index)}")
+            index = ast.Name(id='$key', ctx=ast.Load())
+        return temporaries, ast.Subscript(value=value, slice=index, ctx=target.ctx)
     
     def visit_Attribute(self, node: ast.Attribute) -> str:
         """Converte acesso a atributos (obj.attr)"""
@@ -60,50 +871,76 @@ class PythonToJSTranspiler:
         
         return f"{value}.{node.attr}"
     
-    def visit_Module(self, node: ast.Module) -> str:
+    def visit_Subscript(self, node: ast.Subscript) -> str:
+        """Converte acesso a itens (lista[i], dicionario[chave]) e fatias sem passo"""
+        value = self.visit_node(node.value)
+        if isinstance(node.slice, ast.Slice):
+            if node.slice.step is not None:
+                return self.generic_visit(node)
+            lower = self.visit_node(node.slice.lower) if node.slice.lower else "0"
+            if node.slice.upper is None:
+                return f"{value}.slice({lower})"
+            return f"{value}.slice({lower}, {self.visit_node(node.slice.upper)})"
+        return f"{value}[{self.visit_node(node.slice)}]"
+    
+    def visit_Module(self, node: ast.Module) -> None:
         """Visita o módulo principal"""
-        statements = []
         for stmt in node.body:
-            result = self.visit_node(stmt)
-            if result.strip():
-                statements.append(result)
-        return "\n".join(statements)
+            self.visit_node(stmt)
+    
+    def _shape(self, node: ast.expr) -> Optional[str]:
+        """Forma da coleção (shapes.py); nomes são procurados nas funções em emissão"""
+        shape = value_shape(node)
+        if shape is None and isinstance(node, ast.Name):
+            for scope in reversed(self._scopes):
+                if scope[1] is None:
+                    # Parâmetros nunca têm forma conhecida: dispensa analisar a função
+                    if node.id in parameter_names(scope[0]):
+                        return None
+                    scope[1] = scope_shapes(scope[0])
+                if node.id in scope[1]:
+                    return scope[1][node.id]
+        return shape
     
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> str:
-        """Converte definição de função"""
+    def _function_body(self, node: ast.FunctionDef) -> bool:
+        """Emite o corpo de uma função; devolve True se ele tiver yield (gerador)"""
+        # [função, formas dos nomes, é gerador]
+        scope = [node, None, False]
+        self._scopes.append(scope)
+        try:
+            self.visit_body(node.body)
+        finally:
+            self._scopes.pop()
+        return scope[2]
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """Converte definição de função (function* quando o corpo tem yield)"""
         args = [arg.arg for arg in node.args.args]
         args_str = ", ".join(args)
         
-        function_body = []
-        self.indentation_level += 1
-        
-        for stmt in node.body:
-            result = self.visit_node(stmt)
-            if result.strip():
-                function_body.append(self.get_indent() + result)
-        
-        self.indentation_level -= 1
-        
-        body_str = "\n".join(function_body)
-        return f"function {node.name}({args_str}) {{\n{body_str}\n}}"
+        header = self.writer.reserve()
+        star = "*" if self._function_body(node) else ""
+        self.writer.fill(header, f"function{star} {node.name}({args_str}) {{")
+        self.writer.line("}")
     
-    def visit_Return(self, node: ast.Return) -> str:
+    def visit_Return(self, node: ast.Return) -> None:
         """Converte statement de return"""
         if node.value:
             value = self.visit_node(node.value)
-            return f"return {value};"
-        return "return;"
+            self.writer.line(f"return {value};")
+        else:
+            self.writer.line("return;")
     
-    def visit_Assign(self, node: ast.Assign) -> str:
+    def visit_Assign(self, node: ast.Assign) -> None:
         """Converte atribuição de variável"""
         target = self.visit_node(node.targets[0])
         value = self.visit_node(node.value)
         
-        # Se o target é um atributo (self.x), não usar 'let'
-        if isinstance(node.targets[0], ast.Attribute):
-            return f"{target} = {value};"
-        
-        return f"let {target} = {value};"
+        # Se o target é um atributo (self.x) ou item (d[k]), não usar 'let'
+        if isinstance(node.targets[0], (ast.Attribute, ast.Subscript)):
+            self.writer.line(f"{target} = {value};")
+        else:
+            self.writer.line(f"let {target} = {value};")
     
     def visit_Name(self, node: ast.Name) -> str:
         """Converte nome de variável"""
@@ -115,7 +952,7 @@ class PythonToJSTranspiler:
             # Converte f-strings para template literals
             if hasattr(node, 'kind') and node.kind == 'f':
                 return self.convert_fstring(node.value)
-            return f'"{node.value}"'
+            return js_string(node.value)
         elif isinstance(node.value, bool):
             return str(node.value).lower()
         elif node.value is None:
@@ -137,206 +974,464 @@ class PythonToJSTranspiler:
     
     def visit_Call(self, node: ast.Call) -> str:
         """Converte chamadas de função"""
-        func_name = self.visit_node(node.func)
         args = [self.visit_node(arg) for arg in node.args]
         args_str = ", ".join(args)
         
-        # Mapeamento de funções Python para JavaScript
-        function_mapping = {
-            'print': 'console.log',
-            'len': 'length',
-            'str': 'String',
-            'int': 'parseInt',
-            'float': 'parseFloat'
-        }
-        
-        if func_name in function_mapping:
-            if func_name == 'len':
-                return f"{args[0]}.length"
-            func_name = function_mapping[func_name]
-        
-        # Tratar chamadas de método (obj.method())
+        # Tratar chamadas de método (obj.method()); o objeto é visitado uma vez só
         if isinstance(node.func, ast.Attribute):
-            obj = self.visit_node(node.func.value)
             method = node.func.attr
             
             # Tratar casos especiais
             if isinstance(node.func.value, ast.Name) and node.func.value.id == 'self':
                 return f"this.{method}({args_str})"
             
+            obj = self.visit_node(node.func.value)
+            if method in self.COLLECTION_METHODS:
+                shape = self._shape(node.func.value)
+                if shape == SET:
+                    if method in ('discard', 'remove'):
+                        method = 'delete'
+                    elif method in self.SET_METHODS and len(args) == 1:
+                        return f"{helper(method)}({obj}, {args_str})"
+                elif shape == DICT:
+                    if method in self.DICT_METHODS:
+                        return f"{helper(method)}({obj}, {args_str})"
+                    if method in self.DICT_VIEWS:
+                        return f"Object.{self.DICT_VIEWS[method]}({obj})"
+                    if method == 'update' and len(args) == 1:
+                        return f"Object.assign({obj}, {args_str})"
             return f"{obj}.{method}({args_str})"
         
+        func_name = self.visit_node(node.func)
+        if func_name in ('set', 'frozenset'):
+            return f"new Set({args_str})"
+        if func_name == 'list':
+            # Materializa qualquer iterável (inclusive geradores)
+            return f"Array.from({args_str})" if args else "[]"
+        if func_name == 'dict' and not node.args:
+            pairs = [f"{js_string(kw.arg)}: {self.visit_node(kw.value)}" for kw in node.keywords if kw.arg]
+            if len(pairs) == len(node.keywords):
+                return f"{{{', '.join(pairs)}}}"
+        if func_name == 'range':
+            # range fora de for (ou com passo) é um iterador preguiçoso
+            return f"{helper('range')}({args_str})"
+        if func_name in self.FUNCTION_MAPPING:
+            if func_name == 'len':
+                shape = self._shape(node.args[0])
+                if shape == SET:
+                    return f"{self._operand(node.args[0], args[0], 17)}.size"
+                if shape == DICT:
+                    return f"Object.keys({args[0]}).length"
+                if shape == LIST or self._is_string(node.args[0]):
+                    return f"{self._operand(node.args[0], args[0], 17)}.length"
+                return f"{helper('len')}({args[0]})"
+            func_name = self.FUNCTION_MAPPING[func_name]
+        
         # Chamada de construtor de classe (sem new)
         if func_name[0].isupper():
             return f"new {func_name}({args_str})"
         
         return f"{func_name}({args_str})"
     
-    def visit_If(self, node: ast.If) -> str:
-        """Converte estrutura if/else"""
+    def visit_If(self, node: ast.If) -> None:
+        """Converte estrutura if/elif/else"""
         test = self.visit_node(node.test)
+        self.writer.line(f"if ({test}) {{")
+        self.visit_body(node.body)
         
-        # Corpo do if
-        if_body = []
-        self.indentation_level += 1
-        for stmt in node.body:
-            result = self.visit_node(stmt)
-            if result.strip():
-                if_body.append(self.get_indent() + result)
-        self.indentation_level -= 1
-        
-        result = f"if ({test}) {{\n" + "\n".join(if_body) + "\n}"
+        # Cadeia de elif
+        while len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            node = node.orelse[0]
+            test = self.visit_node(node.test)
+            self.writer.line(f"}} else if ({test}) {{")
+            self.visit_body(node.body)
         
-        # Else if ou else
+        # else
         if node.orelse:
-            if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
-                # elif
-                else_part = self.visit_node(node.orelse[0])
-                result += f" else {else_part}"
-            else:
-                # else
-                else_body = []
-                self.indentation_level += 1
-                for stmt in node.orelse:
-                    else_result = self.visit_node(stmt)
-                    if else_result.strip():
-                        else_body.append(self.get_indent() + else_result)
-                self.indentation_level -= 1
-                result += f" else {{\n" + "\n".join(else_body) + "\n}"
-        
-        return result
-    
-    def visit_For(self, node: ast.For) -> str:
+            self.writer.line("} else {")
+            self.visit_body(node.orelse)
+        
+        self.writer.line("}")
+    
+    def visit_For(self, node: ast.For) -> None:
         """Converte loop for"""
         target = self.visit_node(node.target)
-        iter_obj = self.visit_node(node.iter)
+        self.writer.line(f"{self._loop_header(target, node.iter)} {{")
+        self.visit_body(node.body)
+        self.writer.line("}")
+    
+    @classmethod
+    def _range_args(cls, node: ast.expr) -> Optional[List[ast.expr]]:
+        """
+        Argumentos de range(fim), range(início, fim) ou range(início, fim,
+        passo constante), convertidos em laço com contador; com passo variável
+        (que pode ser zero ou mudar de sinal) o laço usa ``$py_range``.
+        """
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'range' \
+                and (len(node.args) in (1, 2) or len(node.args) == 3 and cls._nonzero_constant(node.args[2])):
+            return node.args
+        return None
+    
+    def _iterable(self, node: ast.expr) -> str:
+        """Valor percorrido por um for...of: dicionários percorrem as chaves"""
+        iterable = self.visit_node(node)
+        if self._shape(node) == DICT:
+            return f"Object.keys({iterable})"
+        return iterable
+    
+    def _loop_header(self, target: str, node: ast.expr, iterable: Optional[str] = None) -> str:
+        """
+        Cabeçalho ``for (...)`` que percorre ``node``: laço com contador para
+        range e for...of nos demais casos (sobre ``iterable``, se informado).
+        """
+        range_args = self._range_args(node) if iterable is None else None
+        if range_args is not None:
+            args = [self.visit_node(arg) for arg in range_args]
+            if len(args) == 3:
+                start, stop, step = args
+                negative = type(range_args[2]) is ast.UnaryOp or range_args[2].value < 0
+                return (f"for (let {target} = {start}; {target} {'>' if negative else '<'} {stop}; "
+                        f"{target} += {step})")
+            start, stop = ("0", args[0]) if len(args) == 1 else args
+            return f"for (let {target} = {start}; {target} < {stop}; {target}++)"
+        if iterable is None:
+            iterable = self._iterable(node)
+        return f"for (let {target} of {iterable})"
+    
+    def _target(self, node: ast.expr) -> str:
+        """Alvo de um laço de comprehension; tuplas viram desestruturação"""
+        if isinstance(node, (ast.Tuple, ast.List)):
+            return f"[{', '.join(self._target(elt) for elt in node.elts)}]"
+        return self.visit_node(node)
+    
+    def _yield_expression(self, node: ast.expr) -> str:
+        # Marca a função em emissão como geradora (ver _function_body)
+        if self._scopes:
+            self._scopes[-1][2] = True
+        if isinstance(node, ast.YieldFrom):
+            return f"yield* {self.visit_node(node.value)}"
+        if node.value is None:
+            return "yield"
+        return f"yield {self.visit_node(node.value)}"
+    
+    def visit_Yield(self, node: ast.Yield) -> str:
+        """Converte yield e yield from (yield*) usados como expressão"""
+        return f"({self._yield_expression(node)})"
+    
+    visit_YieldFrom = visit_Yield
+    
+    def _fused_loops(self, node: ast.expr, body: str, first_iterable: Optional[str]) -> str:
+        """
+        Laços aninhados (com os filtros if) de uma comprehension em volta de
+        ``body``. O primeiro iterável chega já convertido, pois é avaliado no
+        escopo de fora; None indica range, convertido em laço com contador.
+        """
+        first = node.generators[0]
+        for generator in reversed(node.generators):
+            for condition in reversed(generator.ifs):
+                body = f"if ({self.visit_node(condition)}) {{ {body} }}"
+            iterable = first_iterable if generator is first else None
+            header = self._loop_header(self._target(generator.target), generator.iter, iterable)
+            body = f"{header} {{ {body} }}"
+        return body
+    
+    def _first_iterable(self, node: ast.expr) -> Optional[str]:
+        first = node.generators[0].iter
+        return None if self._range_args(first) is not None else self._iterable(first)
+    
+    @contextmanager
+    def _comprehension_scope(self, node: ast.expr):
+        # Os alvos dos for escondem nomes de fora com a mesma grafia (ver _shape)
+        self._scopes.append([node, comprehension_shapes(node), False])
+        try:
+            yield
+        finally:
+            self._scopes.pop()
+    
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> str:
+        """
+        Converte generator expression em um gerador JavaScript criado na hora:
+        ``(function* ($iter) { for (...) { if (...) { yield ...; } } })(iterável)``.
         
-        # Corpo do for
-        for_body = []
-        self.indentation_level += 1
-        for stmt in node.body:
-            result = self.visit_node(stmt)
-            if result.strip():
-                for_body.append(self.get_indent() + result)
-        self.indentation_level -= 1
-        
-        body_str = "\n".join(for_body)
-        
-        # Diferentes tipos de iteração
-        if isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name):
-            if node.iter.func.id == 'range':
-                args = [self.visit_node(arg) for arg in node.iter.args]
-                if len(args) == 1:
-                    return f"for (let {target} = 0; {target} < {args[0]}; {target}++) {{\n{body_str}\n}}"
-                elif len(args) == 2:
-                    return f"for (let {target} = {args[0]}; {target} < {args[1]}; {target}++) {{\n{body_str}\n}}"
-        
-        # Iteração sobre array/objeto
-        return f"for (let {target} of {iter_obj}) {{\n{body_str}\n}}"
-    
-    def visit_While(self, node: ast.While) -> str:
+        Como no Python, só o primeiro iterável é avaliado na criação; o resto
+        é preguiçoso e nenhuma lista intermediária é montada.
+        """
+        if any(generator.is_async for generator in node.generators):
+            return self.generic_visit(node)
+        argument = self._first_iterable(node) or ""
+        
+        with self._comprehension_scope(node):
+            body = f"yield {self.visit_node(node.elt)};"
+            body = self._fused_loops(node, body, "$iter" if argument else None)
+        
+        function = f"function* ({'$iter' if argument else ''}) {{ {body} }}"
+        # Dentro de métodos o gerador precisa do mesmo this
+        if any(isinstance(child, ast.Name) and child.id == 'self' for child in ast.walk(node)):
+            return f"({function}).call(this{', ' if argument else ''}{argument})"
+        return f"({function})({argument})"
+    
+    def visit_ListComp(self, node: ast.ListComp) -> str:
+        """
+        Converte list comprehension em um único laço, sem arrays intermediários
+        por cláusula: ``(() => { const $r = []; for (...) { if (...) {
+        $r.push(...); } } return $r; })()``.
+        
+        Com um só for e sem filtros, sobre range ou sobre uma lista conhecida
+        (shapes.py), o resultado é alocado com o tamanho final e preenchido
+        por índice; listas são percorridas por índice, sem iterador.
+        """
+        if any(generator.is_async for generator in node.generators):
+            return self.generic_visit(node)
+        first = node.generators[0]
+        size = None
+        argument = ""
+        if len(node.generators) == 1 and not first.ifs:
+            range_args = self._range_args(first.iter)
+            if range_args is not None and len(range_args) < 3:
+                bounds = [self.visit_node(arg) for arg in range_args]
+                size = f"Math.max(0, {bounds[0] if len(bounds) == 1 else f'{bounds[1]} - {bounds[0]}'})"
+            elif self._shape(first.iter) == LIST:
+                argument = self.visit_node(first.iter)
+                size = "$iter.length"
+        first_iterable = self._first_iterable(node) if size is None else None
+        
+        with self._comprehension_scope(node):
+            elt = self.visit_node(node.elt)
+            if size is None:
+                body = f"const $r = []; {self._fused_loops(node, f'$r.push({elt});', first_iterable)}"
+            elif argument:
+                body = (f"const $r = new Array({size}); for (let $i = 0; $i < $iter.length; $i++) "
+                        f"{{ let {self._target(first.target)} = $iter[$i]; $r[$i] = {elt}; }}")
+            else:
+                loops = self._fused_loops(node, f"$r[$i++] = {elt};", None)
+                body = f"const $r = new Array({size}); let $i = 0; {loops}"
+        return f"(({'$iter' if argument else ''}) => {{ {body} return $r; }})({argument})"
+    
+    def visit_SetComp(self, node: ast.SetComp) -> str:
+        """Converte set comprehension em um laço que preenche um Set"""
+        if any(generator.is_async for generator in node.generators):
+            return self.generic_visit(node)
+        first_iterable = self._first_iterable(node)
+        with self._comprehension_scope(node):
+            loops = self._fused_loops(node, f"$r.add({self.visit_node(node.elt)});", first_iterable)
+        return f"(() => {{ const $r = new Set(); {loops} return $r; }})()"
+    
+    def visit_DictComp(self, node: ast.DictComp) -> str:
+        """Converte dict comprehension em um laço que preenche um objeto"""
+        if any(generator.is_async for generator in node.generators):
+            return self.generic_visit(node)
+        first_iterable = self._first_iterable(node)
+        with self._comprehension_scope(node):
+            key = self.visit_node(node.key)
+            loops = self._fused_loops(node, f"$r[{key}] = {self.visit_node(node.value)};", first_iterable)
+        return f"(() => {{ const $r = {{}}; {loops} return $r; }})()"
+    
+    def visit_While(self, node: ast.While) -> None:
         """Converte loop while"""
         test = self.visit_node(node.test)
         
-        while_body = []
-        self.indentation_level += 1
-        for stmt in node.body:
-            result = self.visit_node(stmt)
-            if result.strip():
-                while_body.append(self.get_indent() + result)
-        self.indentation_level -= 1
-        
-        body_str = "\n".join(while_body)
-        return f"while ({test}) {{\n{body_str}\n}}"
+        self.writer.line(f"while ({test}) {{")
+        self.visit_body(node.body)
+        self.writer.line("}")
     
     def visit_Compare(self, node: ast.Compare) -> str:
-        """Converte operações de comparação"""
-        left = self.visit_node(node.left)
-        
-        # Mapeamento de operadores
-        op_mapping = {
-            ast.Eq: '===',
-            ast.NotEq: '!==',
-            ast.Lt: '<',
-            ast.LtE: '<=',
-            ast.Gt: '>',
-            ast.GtE: '>=',
-            ast.Is: '===',
-            ast.IsNot: '!==',
-            ast.In: 'in',
-            ast.NotIn: '!in'
-        }
-        
-        result = left
-        for op, comparator in zip(node.ops, node.comparators):
-            operator = op_mapping.get(type(op), str(type(op).__name__))
-            right = self.visit_node(comparator)
-            
-            if isinstance(op, ast.In):
-                result = f"{right}.includes({result})"
-            elif isinstance(op, ast.NotIn):
-                result = f"!{right}.includes({result})"
-            else:
-                result = f"{result} {operator} {right}"
+        """
+        Converte operações de comparação. Comparações encadeadas
+        (``a < b < c``) viram ``a < b && b < c``, repetindo os operandos do
+        meio.
+        """
+        operands = [node.left] + node.comparators
+        codes = [self.visit_node(operand) for operand in operands]
         
-        return result
+        results = []
+        for index, op in enumerate(node.ops):
+            results.append(self._comparison(op, operands[index], codes[index],
+                                            operands[index + 1], codes[index + 1]))
+        return " && ".join(results)
     
-    def visit_BinOp(self, node: ast.BinOp) -> str:
-        """Converte operações binárias"""
-        left = self.visit_node(node.left)
-        right = self.visit_node(node.right)
-        
-        op_mapping = {
-            ast.Add: '+',
-            ast.Sub: '-',
-            ast.Mult: '*',
-            ast.Div: '/',
-            ast.FloorDiv: '/',
-            ast.Mod: '%',
-            ast.Pow: '**'
-        }
-        
-        operator = op_mapping.get(type(node.op), str(type(node.op).__name__))
-        
-        if isinstance(node.op, ast.FloorDiv):
-            return f"Math.floor({left} / {right})"
-        elif isinstance(node.op, ast.Pow):
+    def _comparison(self, op: ast.cmpop, left: ast.expr, left_code: str,
+                    right: ast.expr, right_code: str) -> str:
+        kind = type(op)
+        if kind is ast.In or kind is ast.NotIn:
+            result = self._membership(right, right_code, left_code)
+            return f"!{result}" if kind is ast.NotIn else result
+        
+        operator = self.COMPARE_OPERATORS.get(kind, kind.__name__)
+        if (kind is ast.Is or kind is ast.IsNot) and (self._is_none(left) or self._is_none(right)):
+            # Atributos e argumentos ausentes (undefined) também são None
+            operator = '==' if kind is ast.Is else '!='
+        return f"{self._operand(left, left_code, 10)} {operator} {self._operand(right, right_code, 10, True)}"
+    
+    @staticmethod
+    def _is_none(node: ast.expr) -> bool:
+        return type(node) is ast.Constant and node.value is None
+    
+    @staticmethod
+    def _is_string(node: ast.expr) -> bool:
+        return type(node) is ast.JoinedStr or (type(node) is ast.Constant and type(node.value) is str)
+    
+    def _membership(self, container: ast.expr, right: str, item: str) -> str:
+        """
+        ``item in container`` conforme a forma da coleção (ver shapes.py);
+        formas desconhecidas usam ``$py_in`` (runtime.py)
+        """
+        shape = self._shape(container)
+        if shape == SET:
+            return f"{self._operand(container, right, 17)}.has({item})"
+        if shape == DICT:
+            return f"Object.hasOwn({right}, {item})"
+        if shape == LIST or self._is_string(container):
+            return f"{self._operand(container, right, 17)}.includes({item})"
+        return f"{helper('in')}({item}, {right})"
+    
+    def _infix(self, node: ast.BinOp) -> Optional[str]:
+        """Operador JavaScript infixo de ``node``, ou None se ele vira uma chamada"""
+        kind = type(node.op)
+        if kind is NativePow:
+            return '**'
+        if kind is ast.FloorDiv or kind is ast.Mod or kind is ast.Pow:
+            return None
+        # Coleções só entram em jogo se nenhum operando for constante
+        if (kind in self.SET_OPERATIONS or kind is ast.Add) \
+                and type(node.left) is not ast.Constant and type(node.right) is not ast.Constant:
+            shapes = (self._shape(node.left), self._shape(node.right))
+            if (kind is ast.Add and LIST in shapes) or (kind is not ast.Add and SET in shapes) \
+                    or (kind is ast.BitOr and DICT in shapes):
+                return None
+        return self.BINOP_OPERATORS.get(kind, kind.__name__)
+    
+    def _needs_parens(self, node: ast.expr, precedence: int, right: bool = False) -> bool:
+        """
+        Se o JavaScript de ``node`` precisa de parênteses como operando de um
+        operador de precedência ``precedence``; ``right`` indica o operando
+        direito (operadores de mesma precedência associam à esquerda, exceto
+        ``**``).
+        """
+        kind = type(node)
+        if kind is ast.BinOp:
+            operator = self._infix(node)
+            if operator is None:
+                return False
+            inner = self.BINOP_PRECEDENCE.get(operator, 13)
+            return inner < precedence or (inner == precedence and right != (precedence == 14))
+        if kind is ast.BoolOp or kind is ast.Compare:
+            return True
+        return kind is ast.UnaryOp and precedence >= 14
+    
+    def _operand(self, node: ast.expr, code: str, precedence: int, right: bool = False) -> str:
+        """``code``, o JavaScript de ``node``, entre parênteses se necessário (ver _needs_parens)"""
+        return f"({code})" if self._needs_parens(node, precedence, right) else code
+    
+    @staticmethod
+    def _nonzero_constant(node: ast.expr) -> bool:
+        if type(node) is ast.UnaryOp and type(node.op) is ast.USub:
+            node = node.operand
+        return type(node) is ast.Constant and type(node.value) in (int, float) and node.value != 0
+    
+    def _binop(self, node: ast.BinOp, left: str, right: str) -> str:
+        """JavaScript de uma operação binária com os operandos já convertidos"""
+        operator = self._infix(node)
+        if operator == '**':
+            return f"{self._pow_operand(node.left, left)} ** {self._pow_operand(node.right, right)}"
+        if operator is not None:
+            precedence = self.BINOP_PRECEDENCE.get(operator, 13)
+            return (f"{self._operand(node.left, left, precedence)} {operator} "
+                    f"{self._operand(node.right, right, precedence, True)}")
+        
+        kind = type(node.op)
+        if kind is ast.FloorDiv:
+            # Divisor constante diferente de zero dispensa a verificação do runtime
+            if self._nonzero_constant(node.right):
+                return f"Math.floor({self._operand(node.left, left, 13)} / {self._operand(node.right, right, 13, True)})"
+            return f"{helper('floordiv')}({left}, {right})"
+        if kind is ast.Mod:
+            return f"{helper('mod')}({left}, {right})"
+        if kind is ast.Pow:
             return f"Math.pow({left}, {right})"
+        if kind is ast.Add:
+            return f"[...{left}, ...{right}]"
+        if kind is ast.BitOr and SET not in (self._shape(node.left), self._shape(node.right)):
+            return f"{{...{left}, ...{right}}}"
+        return f"{helper(self.SET_OPERATIONS[kind])}({left}, {right})"
+    
+    def visit_BinOp(self, node: ast.BinOp) -> str:
+        """
+        Converte operações binárias, com parênteses onde a precedência do
+        JavaScript exige. ``//`` e ``%`` seguem a semântica do Python (ver
+        runtime.py), assim como ``+`` entre listas e ``|``/``&``/``-``/``^``
+        entre conjuntos.
+        """
+        if isinstance(node.left, ast.BinOp):
+            return self._visit_binop_chain(node)
+        return self._binop(node, self.visit_node(node.left), self.visit_node(node.right))
+    
+    def _pow_operand(self, node: ast.expr, code: str) -> str:
+        """Operando de ** nativo, entre parênteses quando necessário"""
+        if isinstance(node, (ast.Name, ast.Attribute, ast.Call, ast.Subscript, ast.List)):
+            return code
+        if isinstance(node, ast.Constant) and not code.startswith('-'):
+            return code
+        return f"({code})"
+    
+    def _visit_binop_chain(self, node: ast.BinOp) -> str:
+        """
+        Cadeias associativas à esquerda (a + b + c + ...) são percorridas em
+        laço, sem recursão por termo, e montadas com uma única junção.
+        """
+        chain = []
+        while isinstance(node, ast.BinOp):
+            chain.append(node)
+            node = node.left
+        
+        parts = [self.visit_node(node)]
+        for node in reversed(chain):
+            right = self.visit_node(node.right)
+            operator = self._infix(node)
+            if operator is None or operator == '**':
+                parts = [self._binop(node, ''.join(parts), right)]
+                continue
+            precedence = self.BINOP_PRECEDENCE.get(operator, 13)
+            if self._needs_parens(node.left, precedence):
+                parts = [f"({''.join(parts)})"]
+            parts.append(f" {operator} ")
+            parts.append(self._operand(node.right, right, precedence, True))
         
-        return f"{left} {operator} {right}"
+        return "".join(parts)
     
     def visit_UnaryOp(self, node: ast.UnaryOp) -> str:
         """Converte operações unárias"""
-        operand = self.visit_node(node.operand)
-        
-        op_mapping = {
-            ast.UAdd: '+',
-            ast.USub: '-',
-            ast.Not: '!',
-            ast.Invert: '~'
-        }
-        
-        operator = op_mapping.get(type(node.op), str(type(node.op).__name__))
+        # -a ** b é erro de sintaxe em JavaScript e - -a viraria --a
+        operand = self._operand(node.operand, self.visit_node(node.operand), 15)
+        operator = self.UNARYOP_OPERATORS.get(type(node.op), str(type(node.op).__name__))
         return f"{operator}{operand}"
     
     def visit_BoolOp(self, node: ast.BoolOp) -> str:
         """Converte operações booleanas"""
-        values = [self.visit_node(value) for value in node.values]
-        
-        if isinstance(node.op, ast.And):
-            return " && ".join(values)
-        elif isinstance(node.op, ast.Or):
-            return " || ".join(values)
-        
-        return " ".join(values)
+        # Python junta and/or iguais em um só nó: BoolOp aninhado é um agrupamento
+        values = [f"({self.visit_node(value)})" if type(value) is ast.BoolOp else self.visit_node(value)
+                  for value in node.values]
+        return (" && " if isinstance(node.op, ast.And) else " || ").join(values)
+    
+    def _bulk_literal(self, node: ast.AST) -> Optional[str]:
+        """Lista ou dicionário só de constantes emitido de uma vez (ver literals.py)"""
+        value = literal_value(node)
+        if value is NOT_LITERAL:
+            return None
+        return js_literal(value, compact=self.minify, json_parse_min=self.json_parse_min)
     
     def visit_List(self, node: ast.List) -> str:
         """Converte listas Python para arrays JavaScript"""
+        literal = self._bulk_literal(node)
+        if literal is not None:
+            return literal
         elements = [self.visit_node(elem) for elem in node.elts]
         return f"[{', '.join(elements)}]"
     
     def visit_Dict(self, node: ast.Dict) -> str:
         """Converte dicionários Python para objetos JavaScript"""
+        literal = self._bulk_literal(node)
+        if literal is not None:
+            return literal
         pairs = []
         for key, value in zip(node.keys, node.values):
             key_str = self.visit_node(key)
@@ -344,87 +1439,89 @@ class PythonToJSTranspiler:
             pairs.append(f"{key_str}: {value_str}")
         return f"{{{', '.join(pairs)}}}"
     
-    def visit_Expr(self, node: ast.Expr) -> str:
+    def visit_Set(self, node: ast.Set) -> str:
+        """Converte conjuntos Python para Set do JavaScript"""
+        elements = [self.visit_node(elem) for elem in node.elts]
+        return f"new Set([{', '.join(elements)}])"
+    
+    def visit_Expr(self, node: ast.Expr) -> None:
         """Converte expressões standalone"""
-        result = self.visit_node(node.value)
-        return f"{result};"
+        value = node.value
+        if type(value) is ast.Yield or type(value) is ast.YieldFrom:
+            result = self._yield_expression(value)
+        else:
+            result = self.visit_node(value)
+        self.writer.line(f"{result};")
     
-    def visit_ClassDef(self, node: ast.ClassDef) -> str:
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Converte definição de classe"""
-        class_body = []
-        self.indentation_level += 1
+        self.writer.line(f"class {node.name} {{")
         
-        for stmt in node.body:
-            if isinstance(stmt, ast.FunctionDef):
-                if stmt.name == '__init__':
-                    # Construtor
-                    args = [arg.arg for arg in stmt.args.args[1:]]  # Remove 'self'
-                    args_str = ", ".join(args)
-                    
-                    constructor_body = []
-                    self.indentation_level += 1
-                    for body_stmt in stmt.body:
-                        result = self.visit_node(body_stmt)
-                        if result.strip():
-                            constructor_body.append(self.get_indent() + result)
-                    self.indentation_level -= 1
-                    
-                    constructor = f"{self.get_indent()}constructor({args_str}) {{\n"
-                    constructor += "\n".join(constructor_body) + "\n"
-                    constructor += f"{self.get_indent()}}}"
-                    class_body.append(constructor)
-                else:
-                    # Método normal - remover 'self' dos argumentos
+        with self.writer.indented():
+            for stmt in node.body:
+                if isinstance(stmt, ast.FunctionDef):
+                    # __init__ vira o construtor; métodos perdem o 'self'
+                    name = 'constructor' if stmt.name == '__init__' else stmt.name
                     args = [arg.arg for arg in stmt.args.args[1:]]  # Remove 'self'
                     args_str = ", ".join(args)
                     
-                    method_body = []
-                    self.indentation_level += 1
-                    for body_stmt in stmt.body:
-                        result = self.visit_node(body_stmt)
-                        if result.strip():
-                            method_body.append(self.get_indent() + result)
-                    self.indentation_level -= 1
-                    
-                    method = f"{self.get_indent()}{stmt.name}({args_str}) {{\n"
-                    method += "\n".join(method_body) + "\n"
-                    method += f"{self.get_indent()}}}"
-                    class_body.append(method)
-        
-        self.indentation_level -= 1
+                    header = self.writer.reserve()
+                    star = "*" if self._function_body(stmt) else ""
+                    self.writer.fill(header, f"{star}{name}({args_str}) {{")
+                    self.writer.line("}")
         
-        body_str = "\n".join(class_body)
-        return f"class {node.name} {{\n{body_str}\n}}"
+        self.writer.line("}")
 
 
-def transpile_python_to_js(python_code: str) -> str:
-    """Função principal para transpilar código Python para JavaScript"""
-    transpiler = PythonToJSTranspiler()
-    return transpiler.transpile(python_code)
+PythonToJSTranspiler._build_dispatch()
 
 
-if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) != 3:
-        print("Uso: python transpiler.py input.py output.js")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
-    
+# Instâncias configuradas compartilhadas por transpile_python_to_js e
+# transpile_iter, uma por combinação de opções
+SHARED_MAX_INSTANCES = 64
+_shared: Dict[Tuple, PythonToJSTranspiler] = {}
+_shared_lock = threading.Lock()
+
+
+def _options_key(options: Dict[str, Any]) -> Optional[Tuple]:
+    if options.get('profiler') is not None:
+        return None
+    items = []
+    for name, value in sorted(options.items()):
+        if isinstance(value, list):
+            value = tuple(value)
+        items.append((name, value))
+    key = tuple(items)
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            python_code = f.read()
-        
-        js_code = transpile_python_to_js(python_code)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(js_code)
-        
-        print(f"Código transpilado com sucesso: {input_file} -> {output_file}")
-    
-    except FileNotFoundError:
-        print(f"Arquivo não encontrado: {input_file}")
-    except Exception as e:
-        print(f"Erro: {e}")
\ No newline at end of file
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def shared_transpiler(**options) -> PythonToJSTranspiler:
+    """
+    Instância configurada com ``options``, reaproveitada entre chamadas e
+    threads. Com ``profiler`` (ou opções não hasheáveis) cria uma nova.
+    """
+    key = _options_key(options)
+    if key is None:
+        return PythonToJSTranspiler(**options)
+    transpiler = _shared.get(key)
+    if transpiler is None:
+        transpiler = PythonToJSTranspiler(**options)
+        with _shared_lock:
+            if len(_shared) >= SHARED_MAX_INSTANCES:
+                _shared.clear()
+            transpiler = _shared.setdefault(key, transpiler)
+    return transpiler
+
+
+def transpile_python_to_js(python_code: str, **options) -> str:
+    """Função principal para transpilar código Python para JavaScript"""
+    return shared_transpiler(**options).transpile(python_code)
+
+
+def transpile_iter(python_code: str, **options) -> Iterator[str]:
+    """Versão em streaming de transpile_python_to_js: gera o JavaScript em partes"""
+    return shared_transpiler(**options).transpile_iter(python_code)